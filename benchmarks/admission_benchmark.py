@@ -0,0 +1,51 @@
+import argparse
+import random
+import time
+
+from src.enums import ProductType
+from src.resolution_system import ResolutionSystem
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Waitlisting under per-agent and per-type admission limits")
+    parser.add_argument("--agents", type=int, default=1_000)
+    parser.add_argument("--limited", type=float, default=0.5, help="share of agents with their own waitlist limit")
+    parser.add_argument("--limit", type=int, default=2, help="waitlist limit of the limited agents")
+    parser.add_argument("--issues", type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    system = ResolutionSystem()
+    agent_ids = [system.create_agent(f"agent{index}@example.com", f"Agent {index}", [ProductType.GOLD]) for index in range(args.agents)]
+    # Every agent busy, so each further issue has to be waitlisted.
+    for index in range(args.agents):
+        system.assign_issue(system.create_issue(f"B{index}", ProductType.GOLD, "Busy", "Busy", f"busy{index}@example.com"))
+    limited = set(rng.sample(agent_ids, int(args.agents * args.limited)))
+    for agent_id in limited:
+        system.set_agent_waitlist_limit(agent_id, args.limit)
+    issue_ids = [
+        system.create_issue(f"T{index}", ProductType.GOLD, "Payment failed", "Amount debited", f"user{index}@example.com")
+        for index in range(args.issues)
+    ]
+
+    started = time.perf_counter()
+    for issue_id in issue_ids:
+        system.assign_issue(issue_id)
+    seconds = time.perf_counter() - started
+    print(f"{args.issues:,} issues waitlisted across {args.agents:,} agents in {seconds:.2f}s ({args.issues / seconds:,.0f}/s)")
+    stats = system.admission_stats()
+    print(stats)
+
+    # An agent's own limit only turns that agent away: nothing is deferred while an unlimited
+    # agent can still queue, and no limited agent holds more than its limit.
+    agents = system.agent_service.list_agents()
+    if len(limited) < args.agents and stats["deferred"]:
+        raise AssertionError(f"{stats['deferred']} issues deferred although unlimited agents had room")
+    over = [agent_id for agent_id in limited if agents[agent_id].waitlist.count(ProductType.GOLD) > args.limit]
+    if over:
+        raise AssertionError(f"{len(over)} agents queued past their own limit")
+    print("limits hold")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import time
+from collections import Counter
+from typing import Tuple
+
+from src.analytics import IssueAnalytics
+from src.enums import IssueState, ProductType
+from src.resolution_system import ResolutionSystem
+
+_CHUNK = 10_000
+
+
+def build(issues: int, users: int, agents: int) -> Tuple[ResolutionSystem, IssueAnalytics]:
+    product_types = list(ProductType)
+    system = ResolutionSystem()
+    for index in range(agents):
+        system.create_agent(f"agent{index}@example.com", f"Agent {index}", product_types)
+    # Attached before the load so the columns are maintained from events, timestamps included.
+    analytics = IssueAnalytics.attach(system)
+    for offset in range(0, issues, _CHUNK):
+        rows = [
+            (f"T{index}", product_types[index % len(product_types)], "Payment failed", "", f"user{index % users}@example.com")
+            for index in range(offset, min(offset + _CHUNK, issues))
+        ]
+        issue_ids = system.create_issues_bulk(rows)
+        system.assign_issues_bulk(issue_ids[: len(issue_ids) // 2])
+        for issue_id in issue_ids[: len(issue_ids) // 4]:
+            system.resolve_issue(issue_id, "done")
+    return system, analytics
+
+
+def _timed(call) -> float:
+    started = time.perf_counter()
+    call()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report latency: Issue-object loops vs the columnar store")
+    parser.add_argument("--issues", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--agents", type=int, default=1_000)
+    args = parser.parse_args()
+
+    system, analytics = build(args.issues, args.users, args.agents)
+    reports = {
+        "state x type": (
+            lambda: Counter((issue.state, issue.issue_type) for issue in system.get_issues()),
+            lambda: analytics.group_count(("state", "type")),
+        ),
+        "state x type x agent": (
+            lambda: Counter((issue.state, issue.issue_type, issue.agent_id) for issue in system.get_issues()),
+            lambda: analytics.group_count(("state", "type", "agent")),
+        ),
+        "open per agent": (
+            lambda: Counter(
+                issue.agent_id for issue in system.get_issues() if issue.agent_id and issue.state is not IssueState.CLOSED
+            ),
+            lambda: analytics.agent_load(),
+        ),
+    }
+    print(f"{args.issues:,} issues")
+    for name, (loop, vectorized) in reports.items():
+        loop_seconds, vectorized_seconds = _timed(loop), _timed(vectorized)
+        print(f"{name:>22}: loop {loop_seconds * 1e3:9.1f} ms, columnar {vectorized_seconds * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import List
+
+from src.enums import IssueState, ProductType
+from src.resolution_system import ResolutionSystem
+
+
+def worker(system: ResolutionSystem, operations: int, seed: int, issue_ids: List[str], errors: List[BaseException]) -> None:
+    rng = random.Random(seed)
+    product_types = list(ProductType)
+    agents = list(system.agent_service.list_agents().values())
+    try:
+        for index in range(operations):
+            roll = rng.random()
+            if roll < 0.35 or not issue_ids:
+                issue_id = system.create_issue(
+                    f"T{seed}-{index}",
+                    rng.choice(product_types),
+                    "Payment failed",
+                    "Amount debited",
+                    f"user{rng.randrange(200)}@example.com",
+                )
+                issue_ids.append(issue_id)
+                system.assign_issue(issue_id)
+            elif roll < 0.5:
+                system.assign_issue(rng.choice(issue_ids))
+            elif roll < 0.55:
+                system.assign_issues_bulk(rng.sample(issue_ids, min(8, len(issue_ids))))
+            elif roll < 0.8:
+                active = list(rng.choice(agents).active_issue_ids)
+                system.resolve_issue(rng.choice(active) if active else rng.choice(issue_ids), "done")
+            elif roll < 0.85:
+                system.resolve_issue(rng.choice(issue_ids), "done")
+            elif roll < 0.95:
+                system.update_issue(rng.choice(issue_ids), rng.choice(["In Progress", "closed"]), "checked")
+            else:
+                system.get_issues({"status": rng.choice(list(IssueState))})
+    except BaseException as error:  # surfaced by the main thread
+        errors.append(error)
+
+
+def check_invariants(system: ResolutionSystem) -> List[str]:
+    violations: List[str] = []
+    agents = system.agent_service.list_agents()
+    issues = system.get_issues()
+
+    issue_numbers = Counter(issue.issue_id for issue in issues)
+    violations += [f"duplicate issue id {issue_id}" for issue_id, count in issue_numbers.items() if count > 1]
+
+    active = Counter(issue_id for agent in agents.values() for issue_id in agent.active_issue_ids)
+    violations += [f"{issue_id} active on {count} agents" for issue_id, count in active.items() if count > 1]
+
+    for agent in agents.values():
+        if len(agent.active_issue_ids) > agent.max_concurrent:
+            violations.append(f"{agent.agent_id} holds {len(agent.active_issue_ids)} issues over {agent.max_concurrent} slots")
+        for issue_type, count in agent.active_by_type.items():
+            if count > agent.slots_for(issue_type):
+                violations.append(f"{agent.agent_id} holds {count} {issue_type.value} issues over its slots")
+        for issue_id in agent.active_issue_ids:
+            issue = system.issue_service.get_issue_by_id(issue_id)
+            if issue is None or issue.agent_id != agent.agent_id or issue.state != IssueState.PENDING:
+                violations.append(f"{agent.agent_id} holds {issue_id} which is {issue!r}")
+
+    waitlisted = {issue_id for agent in agents.values() for issue_id in agent.waitlist}
+    for issue in issues:
+        if issue.state == IssueState.WAITING and issue.agent_id is None and issue.issue_id not in waitlisted:
+            violations.append(f"{issue.issue_id} is waiting but on no waitlist")
+    return violations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent façade stress test with invariant checks")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--operations", type=int, default=5_000)
+    parser.add_argument("--agents", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    sys.setswitchinterval(1e-6)
+    rng = random.Random(args.seed)
+    system = ResolutionSystem(thread_safe=True)
+    product_types = list(ProductType)
+    for index in range(args.agents):
+        agent_id = system.create_agent(f"agent{index}@example.com", f"Agent {index}", rng.sample(product_types, 2))
+        system.update_agent(
+            agent_id,
+            ratings={issue_type: rng.uniform(1, 5) for issue_type in product_types},
+            max_concurrent=rng.randint(1, 3),
+        )
+
+    issue_ids: List[str] = []
+    errors: List[BaseException] = []
+    threads = [
+        threading.Thread(target=worker, args=(system, args.operations, args.seed + index, issue_ids, errors))
+        for index in range(args.threads)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    violations = [repr(error) for error in errors] + check_invariants(system)
+    total = args.threads * args.operations
+    print(f"{total} operations on {args.threads} threads in {elapsed:.2f}s ({total / elapsed:,.0f} ops/s)")
+    print(f"issues: {len(system.get_issues())}, pending: {len(system.pending_issues)}, resolved: {len(system.resolved_issues)}")
+    for violation in violations[:20]:
+        print("VIOLATION:", violation)
+    if violations:
+        sys.exit(1)
+    print("invariants hold")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+from .histogram import LatencyHistogram
+from .workload import AgentSpec, WorkloadConfig, WorkloadGenerator
+from .runner import FacadeBenchmark, compare, run_suite
+
+__all__ = [
+    "LatencyHistogram",
+    "AgentSpec",
+    "WorkloadConfig",
+    "WorkloadGenerator",
+    "FacadeBenchmark",
+    "compare",
+    "run_suite",
+]
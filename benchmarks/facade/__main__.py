@@ -0,0 +1,66 @@
+import argparse
+import json
+import sys
+
+from benchmarks.facade.runner import compare, run_suite
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.facade", description="Façade throughput and latency suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the workload at each scale and write JSON")
+    run.add_argument("--scales", default="1000,10000,100000", help="issue counts, e.g. 1000,10000,...,10000000")
+    run.add_argument("--output", default=None, help="JSON file (stdout when omitted)")
+    run.add_argument("--seed", type=int, default=1)
+    run.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent for product-type popularity")
+    run.add_argument("--ratings", default="normal", choices=["uniform", "normal", "bimodal"])
+    run.add_argument("--strategy", default="FCFS", choices=["FCFS", "RATING"])
+    run.add_argument("--burst-length", type=int, default=200)
+    run.add_argument("--repeat", type=int, default=3, help="runs per scale; each metric is the median")
+    run.add_argument("--baseline", default=None, help="compare against this JSON after running")
+
+    check = commands.add_parser("compare", help="flag regressions of CURRENT against BASELINE")
+    check.add_argument("baseline")
+    check.add_argument("current")
+
+    for command in (run, check):
+        command.add_argument("--throughput-tolerance", type=float, default=0.15)
+        command.add_argument("--latency-tolerance", type=float, default=0.30)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        overrides = {
+            "seed": args.seed,
+            "zipf_exponent": args.zipf,
+            "rating_distribution": args.ratings,
+            "strategy": args.strategy,
+            "burst_length": args.burst_length,
+        }
+        report = run_suite([int(float(scale)) for scale in args.scales.split(",")], overrides, args.repeat)
+        text = json.dumps(report, indent=2)
+        if args.output:
+            with open(args.output, "w") as handle:
+                handle.write(text + "\n")
+        else:
+            print(text)
+        if not args.baseline:
+            return
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+    else:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        with open(args.current) as handle:
+            report = json.load(handle)
+
+    regressions = compare(baseline, report, args.throughput_tolerance, args.latency_tolerance)
+    for regression in regressions:
+        print("REGRESSION:", regression, file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+    print("no regressions", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
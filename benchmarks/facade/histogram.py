@@ -0,0 +1,43 @@
+import math
+from typing import Dict, List
+
+
+# Log-bucketed latency histogram: constant memory at any scale, ~2.5% relative error on quantiles.
+class LatencyHistogram:
+    __slots__ = ("_counts", "count", "total")
+
+    _GROWTH = 1.05
+    _LOG_GROWTH = math.log(_GROWTH)
+    _BUCKETS = 800
+
+    def __init__(self) -> None:
+        self._counts: List[int] = [0] * self._BUCKETS
+        self.count = 0
+        self.total = 0
+
+    def record(self, nanoseconds: int) -> None:
+        bucket = int(math.log(nanoseconds) / self._LOG_GROWTH) if nanoseconds > 1 else 0
+        self._counts[min(bucket, self._BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += nanoseconds
+
+    def quantile(self, fraction: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank and count:
+                return self._GROWTH ** (bucket + 0.5)
+        return self._GROWTH ** self._BUCKETS
+
+    def summary(self) -> Dict[str, float]:
+        seconds = self.total / 1e9
+        return {
+            "count": self.count,
+            "seconds": round(seconds, 6),
+            "ops_per_second": round(self.count / seconds, 1) if seconds else 0.0,
+            "p50_us": round(self.quantile(0.50) / 1e3, 3),
+            "p99_us": round(self.quantile(0.99) / 1e3, 3),
+        }
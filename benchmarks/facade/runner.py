@@ -0,0 +1,140 @@
+import gc
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.facade.histogram import LatencyHistogram
+from benchmarks.facade.workload import WorkloadConfig, WorkloadGenerator
+from src.enums import StrategyType
+from src.resolution_system import ResolutionSystem
+
+_SELECTIVE_QUERIES = 200
+_BROAD_QUERIES = 5
+_HISTORY_CALLS = 5
+# Read-only operations keep sampling until this much time was spent on them (capped at 10x the count).
+_MIN_SAMPLE_SECONDS = 0.2
+
+
+class FacadeBenchmark:
+    def __init__(self, config: WorkloadConfig, system_factory: Callable[[], ResolutionSystem] = ResolutionSystem) -> None:
+        self.config = config
+        self._system_factory = system_factory
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    def _timed(self, operation: str, call: Callable[..., Any], *args: Any) -> Any:
+        histogram = self._histograms.get(operation)
+        if histogram is None:
+            histogram = self._histograms[operation] = LatencyHistogram()
+        started = time.perf_counter_ns()
+        result = call(*args)
+        histogram.record(time.perf_counter_ns() - started)
+        return result
+
+    def _sample(self, operation: str, repeat: int, call: Callable[[], Any]) -> None:
+        deadline = time.perf_counter() + _MIN_SAMPLE_SECONDS
+        for index in range(repeat * 10):
+            if index >= repeat and time.perf_counter() >= deadline:
+                break
+            self._timed(operation, call)
+
+    def run(self) -> Dict[str, Dict[str, float]]:
+        workload = WorkloadGenerator(self.config)
+        system = self._system_factory()
+        for strategy in system.strategy_service.list_strategies().values():
+            if strategy.strategy_type == StrategyType.from_value(self.config.strategy):
+                system.set_active_strategy(strategy.strategy_id)
+
+        agent_ids: List[str] = []
+        for spec in workload.agents():
+            agent_id = system.create_agent(spec.email, spec.name, spec.issue_types)
+            system.update_agent(agent_id, ratings=spec.ratings)
+            agent_ids.append(agent_id)
+        agents = [system.agent_service.get_agent(agent_id) for agent_id in agent_ids]
+
+        emails: List[str] = []
+        started = time.perf_counter()
+        for kind, payload in workload.events():
+            if kind == "create":
+                issue_id = self._timed("create_issue", system.create_issue, *payload)
+                self._timed("assign_issue", system.assign_issue, issue_id)
+                if len(emails) < 10_000:
+                    emails.append(payload[4])
+                continue
+            for _ in range(8):
+                agent = workload.choice(agents)
+                if agent.active_issue_ids:
+                    self._timed("resolve_issue", system.resolve_issue, next(iter(agent.active_issue_ids)), "Resolved")
+                    break
+        stream_seconds = time.perf_counter() - started
+
+        product_types = sorted({issue_type for agent in agents for issue_type in agent.supported_issue_types}, key=lambda t: t.value)
+        queries = [
+            ("get_issues[email]", _SELECTIVE_QUERIES, lambda: {"email": workload.choice(emails)}),
+            ("get_issues[agent]", _SELECTIVE_QUERIES, lambda: {"agentId": workload.choice(agent_ids)}),
+            ("get_issues[email+status]", _SELECTIVE_QUERIES, lambda: {"email": workload.choice(emails), "status": "pending"}),
+            ("get_issues[status]", _BROAD_QUERIES, lambda: {"status": "waiting"}),
+            ("get_issues[type]", _BROAD_QUERIES, lambda: {"issueType": workload.choice(product_types)}),
+        ]
+        for operation, repeat, make_filters in queries:
+            self._sample(operation, repeat, lambda: system.get_issues(make_filters()))
+        # First page only: keyset pagination should not depend on how many issues match.
+        for operation, repeat, make_filters in queries:
+            self._sample(
+                operation.replace("get_issues", "page_issues"), repeat, lambda: system.page_issues(make_filters(), None, 50)
+            )
+        self._sample("view_agents_work_history", _HISTORY_CALLS, system.view_agents_work_history)
+
+        results = {operation: histogram.summary() for operation, histogram in sorted(self._histograms.items())}
+        results["stream"] = {"seconds": round(stream_seconds, 3), "issues": self.config.issues}
+        del system, agents
+        gc.collect()
+        return results
+
+
+def _median_of(runs: List[Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, float]]:
+    merged: Dict[str, Dict[str, float]] = {}
+    for operation, stats in runs[0].items():
+        merged[operation] = {
+            metric: statistics.median(run[operation][metric] for run in runs) for metric in stats
+        }
+    return merged
+
+
+def run_suite(scales: List[int], overrides: Optional[Dict[str, Any]] = None, repeat: int = 3) -> Dict[str, Any]:
+    overrides = overrides or {}
+    report: Dict[str, Any] = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "workload": overrides,
+            "repeat": repeat,
+        },
+        "results": {},
+    }
+    for scale in scales:
+        config = WorkloadConfig(issues=scale, **overrides)
+        print(f"scale {scale:,}: {config.users:,} users, {config.agents:,} agents", file=sys.stderr, flush=True)
+        # Each metric is the median over independent runs, which keeps compare mode from flagging noise.
+        report["results"][str(scale)] = _median_of([FacadeBenchmark(config).run() for _ in range(repeat)])
+    return report
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], throughput_tolerance: float, latency_tolerance: float) -> List[str]:
+    regressions: List[str] = []
+    for scale, operations in current["results"].items():
+        reference = baseline["results"].get(scale, {})
+        for operation, stats in operations.items():
+            before = reference.get(operation)
+            if not before or "p99_us" not in stats or "p99_us" not in before:
+                continue
+            if before["ops_per_second"] and stats["ops_per_second"] < before["ops_per_second"] * (1 - throughput_tolerance):
+                regressions.append(
+                    f"{scale} {operation}: throughput {before['ops_per_second']:,.0f} -> {stats['ops_per_second']:,.0f} ops/s"
+                )
+            if before["p99_us"] and stats["p99_us"] > before["p99_us"] * (1 + latency_tolerance):
+                regressions.append(f"{scale} {operation}: p99 {before['p99_us']:.1f} -> {stats['p99_us']:.1f} us")
+    return regressions
@@ -0,0 +1,112 @@
+import bisect
+import itertools
+import random
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from src.enums import ProductType
+
+_RATING_DISTRIBUTIONS = ("uniform", "normal", "bimodal")
+
+
+@dataclass
+class WorkloadConfig:
+    issues: int
+    users: int = 0
+    agents: int = 0
+    seed: int = 1
+    zipf_exponent: float = 1.1
+    types_per_agent: Dict[int, float] = field(default_factory=lambda: {1: 0.6, 2: 0.3, 3: 0.1})
+    rating_distribution: str = "normal"
+    burst_length: int = 200
+    burst_create_ratio: float = 0.9
+    quiet_create_ratio: float = 0.3
+    strategy: str = "FCFS"
+
+    def __post_init__(self) -> None:
+        if self.rating_distribution not in _RATING_DISTRIBUTIONS:
+            raise ValueError(f"Unsupported rating distribution: {self.rating_distribution}")
+        self.users = self.users or max(10, self.issues // 10)
+        self.agents = self.agents or min(10_000, max(10, self.issues // 100))
+
+
+@dataclass
+class AgentSpec:
+    email: str
+    name: str
+    issue_types: List[ProductType]
+    ratings: Dict[ProductType, float]
+
+
+# ("create", (transaction_id, issue_type, subject, description, email)) or ("resolve", None)
+Event = Tuple[str, object]
+
+
+class WorkloadGenerator:
+    def __init__(self, config: WorkloadConfig) -> None:
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._types = list(ProductType)
+        weights = [1 / (rank ** config.zipf_exponent) for rank in range(1, len(self._types) + 1)]
+        self._type_cdf = list(itertools.accumulate(weight / sum(weights) for weight in weights))
+
+    def product_type(self) -> ProductType:
+        index = bisect.bisect_left(self._type_cdf, self._rng.random())
+        return self._types[min(index, len(self._types) - 1)]
+
+    def rating(self) -> float:
+        distribution = self.config.rating_distribution
+        if distribution == "uniform":
+            value = self._rng.uniform(1, 5)
+        elif distribution == "normal":
+            value = self._rng.gauss(3.5, 0.7)
+        else:
+            value = self._rng.gauss(2.0 if self._rng.random() < 0.5 else 4.5, 0.4)
+        return round(min(5.0, max(1.0, value)), 2)
+
+    def agents(self) -> List[AgentSpec]:
+        counts, weights = zip(*sorted(self.config.types_per_agent.items()))
+        specs = []
+        for index in range(self.config.agents):
+            count = min(len(self._types), self._rng.choices(counts, weights)[0])
+            # Agents lean towards the popular types too, but still cover the long tail.
+            issue_types: List[ProductType] = []
+            while len(issue_types) < count:
+                candidate = self.product_type() if self._rng.random() < 0.7 else self._rng.choice(self._types)
+                if candidate not in issue_types:
+                    issue_types.append(candidate)
+            ratings = {issue_type: self.rating() for issue_type in issue_types}
+            specs.append(AgentSpec(f"agent{index}@bench.example", f"Agent {index}", issue_types, ratings))
+        return specs
+
+    def user_email(self) -> str:
+        # Mildly skewed: a few users file many issues.
+        index = int(self.config.users * (self._rng.random() ** 2))
+        return f"user{index}@bench.example"
+
+    def events(self) -> Iterator[Event]:
+        config = self.config
+        created = 0
+        bursting = True
+        while created < config.issues:
+            ratio = config.burst_create_ratio if bursting else config.quiet_create_ratio
+            length = max(1, int(self._rng.expovariate(1 / config.burst_length)))
+            for _ in range(length):
+                if created < config.issues and self._rng.random() < ratio:
+                    created += 1
+                    yield "create", (
+                        f"T{created}",
+                        self.product_type(),
+                        "Payment failed",
+                        "Amount debited but not received",
+                        self.user_email(),
+                    )
+                else:
+                    yield "resolve", None
+            bursting = not bursting
+
+    def choice(self, values: Sequence):
+        return self._rng.choice(values)
+
+    def random(self) -> float:
+        return self._rng.random()
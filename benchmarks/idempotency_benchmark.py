@@ -0,0 +1,60 @@
+import argparse
+import random
+import time
+
+from src.enums import ProductType
+from src.resolution_system import ResolutionSystem
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Retry storm against idempotent create_issue")
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--retries", type=int, default=5, help="extra sends per transaction")
+    parser.add_argument("--window", type=int, default=1_000, help="how far retries drift from their original")
+    parser.add_argument("--cache", type=int, default=65_536, help="LRU entries for recently created issues")
+    parser.add_argument("--agents", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    product_types = list(ProductType)
+    system = ResolutionSystem(idempotency_capacity=args.cache)
+    for index in range(args.agents):
+        system.create_agent(f"agent{index}@example.com", f"Agent {index}", product_types)
+
+    # Each transaction is sent once and retried a few times shortly after, interleaved with others.
+    sends = []
+    for index in range(args.transactions):
+        for attempt in range(args.retries + 1):
+            sends.append((index + rng.random() * args.window * attempt / max(args.retries, 1), index))
+    sends.sort()
+
+    started = time.perf_counter()
+    issue_ids = {}
+    for _, index in sends:
+        issue_id = system.create_issue(
+            f"T{index}", product_types[index % len(product_types)], "Payment failed", "Amount debited", f"user{index % 10_000}@example.com"
+        )
+        if issue_ids.setdefault(index, issue_id) != issue_id:
+            raise AssertionError(f"transaction T{index} created {issue_ids[index]} and {issue_id}")
+    seconds = time.perf_counter() - started
+    print(f"{len(sends):,} sends for {args.transactions:,} transactions in {seconds:.2f}s ({len(sends) / seconds:,.0f}/s)")
+    print(f"issues created: {len(system.issue_service.store):,}")
+
+    # Resolve half, then replay a late retry for every transaction: closed issues are only
+    # recognised while their cache entry survives, open ones always are.
+    for issue_id in list(issue_ids.values())[::2]:
+        system.assign_issue(issue_id)
+        system.resolve_issue(issue_id, "done")
+    before = len(system.issue_service.store)
+    started = time.perf_counter()
+    for index in range(args.transactions):
+        system.create_issue(
+            f"T{index}", product_types[index % len(product_types)], "Payment failed", "Amount debited", f"user{index % 10_000}@example.com"
+        )
+    seconds = time.perf_counter() - started
+    print(f"late retries: {args.transactions / seconds:,.0f}/s, new issues {len(system.issue_service.store) - before:,}")
+    print(system.idempotency_stats())
+
+
+if __name__ == "__main__":
+    main()
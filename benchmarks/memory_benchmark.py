@@ -0,0 +1,90 @@
+import argparse
+import gc
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from typing import Optional
+
+from src.enums import ProductType
+from src.resolution_system import ResolutionSystem
+
+_CHUNK = 10_000
+
+
+def _rss_bytes() -> int:
+    with open("/proc/self/statm") as handle:
+        return int(handle.read().split()[1]) * resource.getpagesize()
+
+
+def measure(issues: int, users: int, agents: int, deletes: int, archive: Optional[str], queue) -> None:
+    product_types = list(ProductType)
+    system = ResolutionSystem()
+    for index in range(agents):
+        system.create_agent(f"agent{index}@example.com", f"Agent {index}", product_types)
+    if archive:
+        # Every resolved issue is old enough, so each chunk's closed issues go straight to disk.
+        system.enable_archive(tempfile.mkdtemp(dir=archive), min_age=0.0)
+    gc.collect()
+    before = _rss_bytes()
+    started = time.perf_counter()
+    for offset in range(0, issues, _CHUNK):
+        rows = [
+            (
+                f"T{index}",
+                product_types[index % len(product_types)],
+                "Payment failed",
+                f"Amount debited for order {index}",
+                f"user{index % users}@example.com",
+            )
+            for index in range(offset, min(offset + _CHUNK, issues))
+        ]
+        open_issue_ids = system.create_issues_bulk(rows)
+        system.assign_issues_bulk(open_issue_ids)
+        while open_issue_ids:
+            open_issue_ids = [
+                issue_id for issue_id in open_issue_ids if not system.resolve_issue(issue_id, "Payment reversed")
+            ]
+        system.archive_closed()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    grown = _rss_bytes() - before
+
+    # Cascading deletes touch only each user's own issues, so the rate should not fall with size.
+    user_ids = [system.user_service.get_user_details(f"U{index + 1}") for index in range(min(deletes, users))]
+    started = time.perf_counter()
+    for user in user_ids:
+        if user:
+            system.delete_user(user.user_id)
+    delete_seconds = time.perf_counter() - started
+    queue.put((grown, elapsed, len(user_ids), delete_seconds))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resident memory per retained issue")
+    parser.add_argument("--sizes", default="1000000,10000000")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--agents", type=int, default=10_000)
+    parser.add_argument("--deletes", type=int, default=1_000, help="users deleted after the load phase")
+    parser.add_argument("--archive", default=None, help="directory for archiving resolved issues to disk")
+    args = parser.parse_args()
+    if args.archive:
+        os.makedirs(args.archive, exist_ok=True)
+
+    context = multiprocessing.get_context("fork")
+    for size in (int(value) for value in args.sizes.split(",")):
+        queue = context.Queue()
+        worker = context.Process(target=measure, args=(size, args.users, args.agents, args.deletes, args.archive, queue))
+        worker.start()
+        grown, elapsed, deleted, delete_seconds = queue.get()
+        worker.join()
+        rate = deleted / delete_seconds if delete_seconds else 0.0
+        print(
+            f"{size:>12,} issues: {grown / 2**20:10.1f} MiB ({grown / size:6.0f} B/issue) in {elapsed:.1f}s; "
+            f"{deleted:,} user deletes at {rate:,.0f}/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
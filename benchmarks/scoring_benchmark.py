@@ -0,0 +1,61 @@
+import argparse
+import random
+import time
+
+from src.data_models.issue import Issue
+from src.enums import IssueState, ProductType, StrategyType
+from src.resolution_system import ResolutionSystem
+from src.scoring import get_scorer
+
+
+def _timed(call, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - started) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Agent selection: Python scoring loops vs the feature matrix (needs numpy)")
+    parser.add_argument("--agents", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    product_types = list(ProductType)
+    system = ResolutionSystem()
+    system.enable_scoring()
+    started = time.perf_counter()
+    for index in range(args.agents):
+        agent_id = system.create_agent(f"agent{index}@example.com", f"Agent {index}", rng.sample(product_types, 2))
+        system.update_agent(agent_id, ratings={product_type: rng.uniform(1, 5) for product_type in product_types})
+    print(f"{args.agents:,} agents registered in {time.perf_counter() - started:.1f}s")
+
+    agents = list(system.agent_service.list_agents().values())
+    issue = Issue("I1", "T0", ProductType.GOLD, "", "", IssueState.CREATED, "U0", "")
+    matrix = system.scoring
+    service = system.strategy_service
+    # The pre-matrix path: RATING over an agent list scores every candidate in Python.
+    service.set_active_strategy(service.create_strategy(StrategyType.RATING))
+    python_seconds = _timed(lambda: service.assign_agent(issue, agents), args.repeat)
+    for name in ("rating", "least_loaded", "fastest"):
+        scorer = get_scorer(name)
+        argmax_seconds = _timed(lambda: matrix.best(ProductType.GOLD, scorer), args.repeat)
+        top_seconds = _timed(lambda: matrix.ranked(ProductType.GOLD, scorer, 100), args.repeat)
+        loop_text = f"python loop {python_seconds * 1e3:8.2f} ms   " if name == "rating" else " " * 29
+        print(f"{name:>13}: {loop_text}argmax {argmax_seconds * 1e3:6.2f} ms   top-100 {top_seconds * 1e3:6.2f} ms")
+
+    issue_ids = system.create_issues_bulk(
+        [(f"T{index}", rng.choice(product_types), "Payment failed", "", f"user{index}@example.com") for index in range(args.batch)]
+    )
+    service.set_active_strategy(system.create_scored_strategy("rating"))
+    started = time.perf_counter()
+    results = system.assign_issues_bulk(issue_ids)
+    seconds = time.perf_counter() - started
+    assigned = sum(1 for result in results.values() if "assigned" in result)
+    print(f"bulk: {args.batch:,} issues ({assigned:,} assigned) in {seconds:.2f}s ({args.batch / seconds:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import List
+
+from src.enums import ProductType
+from src.server import ResolutionClient
+
+
+async def intake_worker(client: ResolutionClient, requests: int, lanes: int, seed: int, latencies: List[float]) -> None:
+    rng = random.Random(seed)
+    product_types = list(ProductType)
+    open_issues: List[str] = []
+    remaining = [requests]
+
+    async def timed(method: str, *args) -> object:
+        started = time.perf_counter()
+        result = await client.call(method, *args)
+        latencies.append(time.perf_counter() - started)
+        return result
+
+    # Closed loop: each lane keeps one operation in flight, so latency is not inflated by client-side queueing.
+    async def lane() -> None:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            if open_issues and rng.random() < 0.3:
+                await timed("resolve_issue", open_issues.pop(rng.randrange(len(open_issues))), "done")
+                continue
+            issue_id = await timed(
+                "create_issue",
+                f"T{seed}-{remaining[0]}",
+                rng.choice(product_types).value,
+                "Payment failed",
+                "Amount debited",
+                f"user{rng.randrange(1000)}@example.com",
+            )
+            await timed("assign_issue", issue_id)
+            open_issues.append(issue_id)
+
+    await asyncio.gather(*(lane() for _ in range(lanes)))
+
+
+async def run(address: list, clients: int, requests: int, window: int, agents: int) -> None:
+    async def connect() -> ResolutionClient:
+        if isinstance(address, str):
+            return await ResolutionClient.connect(path=address, max_in_flight=window)
+        return await ResolutionClient.connect(address[0], address[1], max_in_flight=window)
+
+    setup = await connect()
+    rng = random.Random(3)
+    product_types = [product_type.value for product_type in ProductType]
+    await asyncio.gather(
+        *(setup.create_agent(f"agent{index}@example.com", f"Agent {index}", rng.sample(product_types, 2)) for index in range(agents))
+    )
+
+    connections = [await connect() for _ in range(clients)]
+    latencies: List[float] = []
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(intake_worker(client, requests, window, seed, latencies) for seed, client in enumerate(connections))
+    )
+    elapsed = time.perf_counter() - started
+    stats = await setup.server_stats()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{len(latencies)} requests over {clients} connections in {elapsed:.2f}s: {len(latencies) / elapsed:,.0f} req/s")
+    print(f"latency p50 {p50 * 1e3:.2f} ms, p99 {p99 * 1e3:.2f} ms")
+    print(
+        f"server: {stats['batches']:.0f} batches, {stats['coalesced_requests']:.0f} requests coalesced into "
+        f"{stats['coalesced_calls']:.0f} bulk calls, {stats['backpressure_waits']:.0f} backpressure waits"
+    )
+    for client in [setup, *connections]:
+        await client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Requests/sec and p99 latency against a local resolution server")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=5_000, help="intake operations per client")
+    parser.add_argument("--window", type=int, default=64, help="max in-flight requests per connection")
+    parser.add_argument("--agents", type=int, default=50)
+    parser.add_argument("--queue-size", type=int, default=4096)
+    parser.add_argument("--unix-socket", default=None)
+    args = parser.parse_args()
+
+    command = [sys.executable, "src/server/server.py", "--port", "0", "--queue-size", str(args.queue_size)]
+    if args.unix_socket:
+        command += ["--unix-socket", args.unix_socket]
+    environment = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [".", os.environ.get("PYTHONPATH")]))}
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, env=environment)
+    try:
+        address = json.loads(server.stdout.readline())["listening"]
+        asyncio.run(run(address, args.clients, args.requests, args.window, args.agents))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import random
+import time
+
+from src.enums import ProductType
+from src.resolution_system import ResolutionSystem
+from src.sharding import ShardedResolutionSystem
+
+
+def drive(system, issues: int, agents: int, batch: int, seed: int) -> float:
+    rng = random.Random(seed)
+    product_types = list(ProductType)
+    for index in range(agents):
+        system.create_agent(f"agent{index}@example.com", f"Agent {index}", rng.sample(product_types, rng.choice([1, 1, 2])))
+    started = time.perf_counter()
+    for offset in range(0, issues, batch):
+        rows = [
+            (f"T{index}", rng.choice(product_types), "Payment failed", "Amount debited", f"user{rng.randrange(10_000)}@example.com")
+            for index in range(offset, min(issues, offset + batch))
+        ]
+        issue_ids = system.create_issues_bulk(rows)
+        results = system.assign_issues_bulk(issue_ids)
+        for issue_id, message in results.items():
+            if "assigned to agent" in message:
+                system.resolve_issue(issue_id, "done")
+    system.get_issues({"status": "pending"})
+    system.view_agents_work_history()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Single interpreter vs. product-type shards in a process pool")
+    parser.add_argument("--issues", type=int, default=200_000)
+    parser.add_argument("--agents", type=int, default=2_000)
+    parser.add_argument("--batch", type=int, default=5_000)
+    parser.add_argument("--shards", type=int, default=None)
+    args = parser.parse_args()
+
+    single = drive(ResolutionSystem(), args.issues, args.agents, args.batch, seed=5)
+    print(f"single:  {args.issues / single:,.0f} issues/s")
+    with ShardedResolutionSystem(args.shards) as sharded:
+        elapsed = drive(sharded, args.issues, args.agents, args.batch, seed=5)
+        print(f"sharded: {args.issues / elapsed:,.0f} issues/s on {sharded.shard_count} shards ({single / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
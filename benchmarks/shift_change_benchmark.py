@@ -0,0 +1,74 @@
+import argparse
+import random
+import time
+
+from src.analytics import IssueAnalytics
+from src.enums import IssueState, ProductType
+from src.resolution_system import ResolutionSystem
+
+
+def build(args: argparse.Namespace) -> ResolutionSystem:
+    rng = random.Random(11)
+    product_types = list(ProductType)
+    system = ResolutionSystem()
+    for index in range(args.agents):
+        system.create_agent(f"agent{index}@example.com", f"Agent {index}", rng.sample(product_types, 2))
+    issue_ids = [
+        system.create_issue(f"T{index}", rng.choice(product_types), "Payment failed", "Amount debited", f"user{index}@example.com", now=float(index))
+        for index in range(args.issues)
+    ]
+    system.assign_issues_bulk(issue_ids)
+    return system
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mass shift change: take many agents offline at once (needs numpy)")
+    parser.add_argument("--agents", type=int, default=2_000)
+    parser.add_argument("--issues", type=int, default=100_000)
+    parser.add_argument("--leaving", type=int, default=500, help="agents whose shift ends")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    system = build(args)
+    print(f"{args.agents:,} agents, {args.issues:,} issues routed in {time.perf_counter() - started:.2f}s")
+
+    analytics = IssueAnalytics.attach(system)
+    agents = system.agent_service.list_agents()
+    leaving = list(agents)[: args.leaving]
+    enqueued = {
+        issue_id: agents[agent_id].waitlist.enqueued_at(issue_id) for agent_id in leaving for issue_id in agents[agent_id].waitlist
+    }
+
+    started = time.perf_counter()
+    moves = system.deactivate_agents_bulk(leaving)
+    seconds = time.perf_counter() - started
+    print(f"{len(leaving):,} agents offline, {len(moves):,} issues rerouted in {seconds * 1e3:.1f} ms ({len(moves) / seconds:,.0f}/s)")
+
+    # Nothing is left with an offline agent, and rerouted waitlist entries keep their enqueue time.
+    online = [agent for agent in agents.values() if not agent.offline]
+    if len(online) != len(agents) - len(leaving):
+        raise AssertionError("wrong number of agents offline")
+    if any(agents[agent_id].active_issue_ids or agents[agent_id].waitlist for agent_id in leaving):
+        raise AssertionError("an offline agent still holds issues")
+    for agent in online:
+        for issue_id in agent.waitlist:
+            if issue_id in enqueued and agent.waitlist.enqueued_at(issue_id) != enqueued[issue_id]:
+                raise AssertionError(f"{issue_id} lost its place in the queue")
+    # Released issues no longer count towards their old agent's load.
+    load = analytics.agent_load()
+    if any(load.get(agent_id) for agent_id in leaving):
+        raise AssertionError("analytics still charges offline agents with released issues")
+    if sum(load.values()) != sum(len(agent.active_issue_ids) for agent in online):
+        raise AssertionError("analytics agent load disagrees with the agents")
+    deferred = sum("deferred" in outcome for outcome in moves.values())
+    print(f"assigned {sum('assigned' in outcome for outcome in moves.values()):,}, deferred {deferred:,}")
+    print(f"still waiting: {len(system.get_issues({'status': IssueState.WAITING})):,}")
+
+    started = time.perf_counter()
+    for agent_id in leaving:
+        system.reactivate_agent(agent_id)
+    print(f"{len(leaving):,} agents back in {(time.perf_counter() - started) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
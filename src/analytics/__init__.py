@@ -0,0 +1,5 @@
+from .columnar import IssueAnalytics
+
+__all__ = [
+    "IssueAnalytics",
+]
@@ -0,0 +1,268 @@
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the analytics store needs it
+    np = None
+
+from src.data_models.ids import ISSUE_PREFIX, parse_id
+from src.data_models.issue import Issue
+from src.enums import IssueEventType, IssueState, ProductType
+from src.events.event import IssueEvent
+
+_STATES: List[IssueState] = list(IssueState)
+_TYPES: List[ProductType] = list(ProductType)
+_STATE_CODES = {state: code for code, state in enumerate(_STATES)}
+_TYPE_CODES = {issue_type: code for code, issue_type in enumerate(_TYPES)}
+_ABSENT = -1
+_GROUP_COLUMNS = ("state", "type", "agent", "user")
+_OPEN_STATES = tuple(state for state in _STATES if state is not IssueState.CLOSED)
+_DENSE_GROUPS = 1 << 24
+
+
+class _Codes:
+    # Dense integer codes for agent/user IDs so the columns stay fixed-width.
+    __slots__ = ("_codes", "labels")
+
+    def __init__(self) -> None:
+        self._codes: Dict[str, int] = {}
+        self.labels: List[str] = []
+
+    def encode(self, label: str) -> int:
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def lookup(self, label: str) -> int:
+        return self._codes.get(label, _ABSENT)
+
+
+class IssueAnalytics:
+    # A columnar shadow of the issue store: one row per issue number, integer-coded attributes and
+    # float timestamps, maintained from the issue event stream. Reports are vectorized over the
+    # columns instead of looping over Issue objects.
+    def __init__(self, *, id_offset: int = 0, id_stride: int = 1, capacity: int = 1024) -> None:
+        if np is None:
+            raise ImportError("IssueAnalytics requires numpy")
+        self._first = id_offset + 1
+        self._stride = id_stride
+        self._size = 0
+        self._agents = _Codes()
+        self._users = _Codes()
+        self._state = np.full(capacity, _ABSENT, dtype=np.int8)
+        self._type = np.full(capacity, _ABSENT, dtype=np.int8)
+        self._agent = np.full(capacity, _ABSENT, dtype=np.int32)
+        self._user = np.full(capacity, _ABSENT, dtype=np.int32)
+        self._created_at = np.full(capacity, np.nan)
+        self._assigned_at = np.full(capacity, np.nan)
+        self._closed_at = np.full(capacity, np.nan)
+
+    @classmethod
+    def attach(cls, system: Any) -> "IssueAnalytics":
+        # Backfills from the current store (timestamps of existing issues are unknown) and then
+        # follows the event stream. Call again after a durable restore, which drops subscribers.
+        issue_service = system.issue_service
+        id_offset, id_stride = issue_service.id_layout
+        analytics = cls(id_offset=id_offset, id_stride=id_stride)
+        analytics.backfill(issue_service.store.values())
+        issue_service.events.subscribe(analytics.apply)
+        return analytics
+
+    def detach(self, system: Any) -> None:
+        system.issue_service.events.unsubscribe(self.apply)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._state[: self._size] != _ABSENT))
+
+    # Maintenance
+    def _row(self, issue_id: str) -> int:
+        number = parse_id(ISSUE_PREFIX, issue_id)
+        return (number - self._first) // self._stride
+
+    def _ensure(self, row: int) -> None:
+        if row < len(self._state):
+            return
+        capacity = max(row + 1, 2 * len(self._state))
+        for name, fill in (
+            ("_state", _ABSENT),
+            ("_type", _ABSENT),
+            ("_agent", _ABSENT),
+            ("_user", _ABSENT),
+            ("_created_at", np.nan),
+            ("_assigned_at", np.nan),
+            ("_closed_at", np.nan),
+        ):
+            column = getattr(self, name)
+            grown = np.full(capacity, fill, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def backfill(self, issues: Iterable[Issue]) -> None:
+        for issue in issues:
+            row = self._row(issue.issue_id)
+            self._ensure(row)
+            self._size = max(self._size, row + 1)
+            self._state[row] = _STATE_CODES[issue.state]
+            self._type[row] = _TYPE_CODES[issue.issue_type]
+            self._user[row] = self._users.encode(issue.user_id)
+            self._agent[row] = self._agents.encode(issue.agent_id) if issue.agent_id else _ABSENT
+
+    def apply(self, event: IssueEvent) -> None:
+        kind = event.kind
+        row = self._row(event.issue_id)
+        if kind is IssueEventType.CREATED:
+            self._ensure(row)
+            if row >= self._size:
+                self._size = row + 1
+            self._type[row] = _TYPE_CODES[event.issue_type]
+            self._user[row] = self._users.encode(event.user_id)
+            self._agent[row] = _ABSENT
+            self._created_at[row] = event.timestamp
+        elif row >= self._size:
+            return
+        elif kind is IssueEventType.DELETED:
+            self._state[row] = _ABSENT
+            return
+        # Every event carries the current holder, so releases back to the waitlist clear it too.
+        self._agent[row] = self._agents.encode(event.agent_id) if event.agent_id else _ABSENT
+        if kind is IssueEventType.ASSIGNED:
+            if np.isnan(self._assigned_at[row]):
+                self._assigned_at[row] = event.timestamp
+        elif kind is IssueEventType.CLOSED:
+            self._closed_at[row] = event.timestamp
+        elif event.previous_state is IssueState.CLOSED and event.state is not IssueState.CLOSED:
+            self._closed_at[row] = np.nan
+        self._state[row] = _STATE_CODES[event.state]
+
+    # Queries
+    def mask(
+        self,
+        *,
+        state: Any = None,
+        issue_type: Any = None,
+        agent_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        created_after: Optional[float] = None,
+        created_before: Optional[float] = None,
+    ) -> "np.ndarray":
+        size = self._size
+        mask = self._state[:size] != _ABSENT
+        if state is not None:
+            mask &= np.isin(self._state[:size], [_STATE_CODES[IssueState.from_value(value)] for value in _many(state)])
+        if issue_type is not None:
+            mask &= np.isin(self._type[:size], [_TYPE_CODES[ProductType.from_value(value)] for value in _many(issue_type)])
+        # An unknown ID must match nothing rather than the -1 "absent" code.
+        if agent_id is not None:
+            code = self._agents.lookup(agent_id)
+            mask &= (self._agent[:size] == code) & (code != _ABSENT)
+        if user_id is not None:
+            code = self._users.lookup(user_id)
+            mask &= (self._user[:size] == code) & (code != _ABSENT)
+        if created_after is not None:
+            mask &= self._created_at[:size] >= created_after
+        if created_before is not None:
+            mask &= self._created_at[:size] < created_before
+        return mask
+
+    def count(self, **filters: Any) -> int:
+        return int(np.count_nonzero(self.mask(**filters)))
+
+    def group_count(self, by: Sequence[str] = ("state", "type"), **filters: Any) -> Dict[Tuple[Any, ...], int]:
+        # Group keys are packed into one mixed-radix integer so a single bincount does the grouping.
+        for name in by:
+            if name not in _GROUP_COLUMNS:
+                raise ValueError(f"Cannot group by {name!r}; expected one of {_GROUP_COLUMNS}")
+        mask = self.mask(**filters)
+        columns = [self._group_column(name)[mask] for name in by]
+        radices = [len(self._group_labels(name)) + 1 for name in by]
+        packed = np.zeros(int(np.count_nonzero(mask)), dtype=np.int64)
+        for column, radix in zip(columns, radices):
+            # +1 shifts "absent" (-1, e.g. unassigned) to code 0.
+            packed = packed * radix + (column.astype(np.int64) + 1)
+        if int(np.prod(radices, dtype=np.float64)) <= _DENSE_GROUPS:
+            counts = np.bincount(packed, minlength=int(np.prod(radices)))
+            keys = np.flatnonzero(counts)
+            counts = counts[keys]
+        else:
+            # Too many possible groups (e.g. agent x user) for a dense count array.
+            keys, counts = np.unique(packed, return_counts=True)
+        groups: Dict[Tuple[Any, ...], int] = {}
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            labels = []
+            for name, radix in zip(reversed(by), reversed(radices)):
+                key, code = divmod(key, radix)
+                labels.append(self._group_labels(name)[code - 1] if code else None)
+            groups[tuple(reversed(labels))] = count
+        return groups
+
+    def _group_column(self, name: str) -> "np.ndarray":
+        column = {"state": self._state, "type": self._type, "agent": self._agent, "user": self._user}[name]
+        return column[: self._size]
+
+    def _group_labels(self, name: str) -> Sequence[Any]:
+        return {"state": _STATES, "type": _TYPES, "agent": self._agents.labels, "user": self._users.labels}[name]
+
+    def durations(self, measure: str, **filters: Any) -> "np.ndarray":
+        # time_to_assign, time_to_resolve, handle_time (assignment to close) or age (open issues, now).
+        size = self._size
+        created, assigned, closed = self._created_at[:size], self._assigned_at[:size], self._closed_at[:size]
+        if measure == "time_to_assign":
+            values = assigned - created
+        elif measure == "time_to_resolve":
+            values = closed - created
+        elif measure == "handle_time":
+            values = closed - assigned
+        elif measure == "age":
+            values = np.where(np.isnan(closed), time.time() - created, np.nan)
+        else:
+            raise ValueError(f"Unknown measure {measure!r}")
+        values = values[self.mask(**filters)]
+        return values[~np.isnan(values)]
+
+    def histogram(self, measure: str, bins: Any = 20, **filters: Any) -> Tuple["np.ndarray", "np.ndarray"]:
+        return np.histogram(self.durations(measure, **filters), bins=bins)
+
+    def backlog_trend(self, start: float, end: float, step: float, **filters: Any) -> Tuple["np.ndarray", "np.ndarray"]:
+        # Open issues at each instant: created so far minus closed so far, via two sorted searches.
+        if step <= 0:
+            raise ValueError(f"step must be positive, got {step}")
+        mask = self.mask(**filters)
+        created = np.sort(self._created_at[: self._size][mask])
+        closed = self._closed_at[: self._size][mask]
+        closed = np.sort(closed[~np.isnan(closed)])
+        instants = np.arange(start, end + step / 2, step)
+        created = created[~np.isnan(created)]
+        backlog = np.searchsorted(created, instants, side="right") - np.searchsorted(closed, instants, side="right")
+        return instants, backlog
+
+    def agent_load(self, states: Iterable[Any] = _OPEN_STATES, **filters: Any) -> Dict[str, int]:
+        mask = self.mask(state=list(states), **filters)
+        agents = self._agent[: self._size][mask]
+        counts = np.bincount(agents[agents != _ABSENT], minlength=len(self._agents.labels))
+        return {self._agents.labels[code]: int(counts[code]) for code in np.flatnonzero(counts)}
+
+    def rating_weighted_load(self, ratings: Dict[str, Dict[Any, float]], default_rating: float = 1.0) -> Dict[str, float]:
+        # Sum over each agent's assigned open issues of the agent's rating for that issue's type.
+        weights = np.full((len(self._agents.labels), len(_TYPES)), default_rating)
+        for agent_id, agent_ratings in ratings.items():
+            code = self._agents.lookup(agent_id)
+            if code == _ABSENT:
+                continue
+            for issue_type, rating in agent_ratings.items():
+                weights[code, _TYPE_CODES[ProductType.from_value(issue_type)]] = rating
+        mask = self.mask(state=list(_OPEN_STATES))
+        agents = self._agent[: self._size][mask]
+        types = self._type[: self._size][mask]
+        assigned = agents != _ABSENT
+        agents, types = agents[assigned], types[assigned]
+        load = np.bincount(agents, weights=weights[agents, types], minlength=len(self._agents.labels))
+        return {self._agents.labels[code]: float(load[code]) for code in np.flatnonzero(load)}
+
+
+def _many(value: Any) -> Iterable[Any]:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return value
+    return (value,)
@@ -0,0 +1,11 @@
+from .locks import NULL_LOCK, AnyLock, LockTable, NullLock, ReentrantLock, StripedLock, make_lock
+
+__all__ = [
+    "NULL_LOCK",
+    "AnyLock",
+    "LockTable",
+    "NullLock",
+    "ReentrantLock",
+    "StripedLock",
+    "make_lock",
+]
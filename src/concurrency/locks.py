@@ -0,0 +1,89 @@
+import threading
+from typing import Any, Dict, Hashable, List, Optional, Union
+
+
+class NullLock:
+    __slots__ = ()
+
+    def __enter__(self) -> "NullLock":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        return False
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        return True
+
+    def release(self) -> None:
+        pass
+
+
+NULL_LOCK = NullLock()
+
+
+class ReentrantLock:
+    __slots__ = ("_lock",)
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+
+    def __enter__(self) -> "ReentrantLock":
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        self._lock.release()
+        return False
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        return self._lock.acquire(blocking, timeout)
+
+    def release(self) -> None:
+        self._lock.release()
+
+    def __reduce__(self) -> tuple:
+        return (ReentrantLock, ())
+
+
+AnyLock = Union[NullLock, ReentrantLock]
+
+
+def make_lock(thread_safe: bool) -> AnyLock:
+    return ReentrantLock() if thread_safe else NULL_LOCK
+
+
+class StripedLock:
+    def __init__(self, thread_safe: bool, stripes: int = 1024) -> None:
+        self._thread_safe = thread_safe
+        self._stripes: Optional[List[ReentrantLock]] = (
+            [ReentrantLock() for _ in range(stripes)] if thread_safe else None
+        )
+        self._count = stripes
+
+    def for_key(self, key: Hashable) -> AnyLock:
+        if self._stripes is None:
+            return NULL_LOCK
+        return self._stripes[hash(key) % self._count]
+
+    def __reduce__(self) -> tuple:
+        return (StripedLock, (self._thread_safe, self._count))
+
+
+class LockTable:
+    def __init__(self, thread_safe: bool) -> None:
+        self._thread_safe = thread_safe
+        self._locks: Dict[Hashable, ReentrantLock] = {}
+
+    def for_key(self, key: Hashable) -> AnyLock:
+        if not self._thread_safe:
+            return NULL_LOCK
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks.setdefault(key, ReentrantLock())
+        return lock
+
+    def discard(self, key: Hashable) -> None:
+        self._locks.pop(key, None)
+
+    def __reduce__(self) -> tuple:
+        return (LockTable, (self._thread_safe,))
@@ -3,6 +3,7 @@ from .user import User
 from .agent import Agent
 from .strategy import Strategy
 from .transaction import Transaction
+from .waitlist import PriorityWaitlist
 
 __all__ = [
     "Issue",
@@ -10,4 +11,5 @@ __all__ = [
     "Agent",
     "Strategy",
     "Transaction",
+    "PriorityWaitlist",
 ]
@@ -1,44 +1,109 @@
-from collections import deque
 from dataclasses import dataclass, field
-from typing import Deque, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from src.data_models.waitlist import PriorityWaitlist
 from src.enums import ProductType
 
 
-@dataclass
+@dataclass(slots=True)
 class Agent:
     agent_id: str
     name: str
     email: str
     supported_issue_types: Set[ProductType]
     ratings: Dict[ProductType, float] = field(default_factory=dict)
-    resolved_issue_ids: List[str] = field(default_factory=list)
-    active_issue_id: Optional[str] = None
-    is_occupied: bool = False
-    waitlist: Deque[str] = field(default_factory=deque)
+    # Concurrent slots per product type (types not listed get max_concurrent), capped overall by max_concurrent.
+    capacity: Dict[ProductType, int] = field(default_factory=dict)
+    max_concurrent: int = 1
+    active_issue_ids: Dict[str, ProductType] = field(default_factory=dict)
+    active_by_type: Dict[ProductType, int] = field(default_factory=dict)
+    # A paused agent keeps its active issues but is offered no new ones.
+    paused: bool = False
+    # An offline agent (shift over, on leave) has handed back all its work and takes none.
+    offline: bool = False
+    waitlist: PriorityWaitlist = field(default_factory=PriorityWaitlist)
+    observers: List[Any] = field(default_factory=list, repr=False, compare=False)
+
+    def slots_for(self, issue_type: ProductType) -> int:
+        return min(self.capacity.get(issue_type, self.max_concurrent), self.max_concurrent)
+
+    def spare_slots(self, issue_type: ProductType) -> int:
+        if self.paused or self.offline or issue_type not in self.supported_issue_types:
+            return 0
+        spare = min(
+            self.slots_for(issue_type) - self.active_by_type.get(issue_type, 0),
+            self.max_concurrent - len(self.active_issue_ids),
+        )
+        return spare if spare > 0 else 0
 
     def is_available_for(self, issue_type: ProductType) -> bool:
-        return not self.is_occupied and self.active_issue_id is None and issue_type in self.supported_issue_types
-
-    def record_assignment(self, issue_id: str) -> None:
-        try:
-            self.waitlist.remove(issue_id)
-        except ValueError:
-            pass
-        self.active_issue_id = issue_id
-        self.is_occupied = True
-
-    def record_resolution(self, issue_id: str) -> None:
-        if issue_id not in self.resolved_issue_ids:
-            self.resolved_issue_ids.append(issue_id)
-        self.active_issue_id = None
-        self.is_occupied = False
-
-    def enqueue_issue(self, issue_id: str) -> None:
-        if issue_id not in self.waitlist and issue_id != self.active_issue_id:
-            self.waitlist.append(issue_id)
+        return self.spare_slots(issue_type) > 0
+
+    @property
+    def has_spare_capacity(self) -> bool:
+        return any(self.spare_slots(issue_type) for issue_type in self.supported_issue_types)
+
+    @property
+    def is_occupied(self) -> bool:
+        return not self.has_spare_capacity
+
+    @property
+    def is_idle(self) -> bool:
+        return not self.active_issue_ids
+
+    def record_assignment(self, issue_id: str, issue_type: ProductType) -> None:
+        self.waitlist.discard(issue_id)
+        if issue_id not in self.active_issue_ids:
+            self.active_issue_ids[issue_id] = issue_type
+            self.active_by_type[issue_type] = self.active_by_type.get(issue_type, 0) + 1
+        self.notify_observers()
+
+    def record_resolution(self, issue_id: str) -> bool:
+        issue_type = self.active_issue_ids.pop(issue_id, None)
+        if issue_type is None:
+            return False
+        remaining = self.active_by_type[issue_type] - 1
+        if remaining:
+            self.active_by_type[issue_type] = remaining
+        else:
+            del self.active_by_type[issue_type]
+        self.notify_observers()
+        return True
+
+    def enqueue_issue(
+        self, issue_id: str, issue_type: ProductType, priority: int = 0, enqueued_at: Optional[float] = None
+    ) -> None:
+        if issue_id not in self.active_issue_ids:
+            self.waitlist.push(issue_id, issue_type, priority, enqueued_at)
+            self.notify_observers()
+
+    def deactivate(self) -> Tuple[List[Tuple[str, ProductType, float]], List[str]]:
+        # Goes offline and hands back its waitlist entries and its active issue IDs.
+        waiting = self.waitlist.drain()
+        active = list(self.active_issue_ids)
+        self.active_issue_ids.clear()
+        self.active_by_type.clear()
+        self.offline = True
+        self.notify_observers()
+        return waiting, active
+
+    def reactivate(self) -> None:
+        self.offline = False
+        self.notify_observers()
 
     def take_next_from_waitlist(self) -> Optional[str]:
-        if not self.waitlist:
-            return None
-        return self.waitlist.popleft()
+        # The most urgent waiting issue among the types that still have a free slot.
+        issue_id = self.waitlist.pop_best(self.is_available_for)
+        if issue_id is not None:
+            self.notify_observers()
+        return issue_id
+
+    def remove_from_waitlist(self, issue_id: str) -> bool:
+        if not self.waitlist.discard(issue_id):
+            return False
+        self.notify_observers()
+        return True
+
+    def notify_observers(self) -> None:
+        for observer in self.observers:
+            observer.agent_changed(self)
@@ -0,0 +1,85 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterable, Iterator, List, Optional, Union
+
+ISSUE_PREFIX = "I"
+
+
+def parse_id(prefix: str, identifier: object) -> Optional[int]:
+    if not isinstance(identifier, str) or not identifier.startswith(prefix):
+        return None
+    digits = identifier[len(prefix):]
+    if not digits or not digits.isascii() or not digits.isdigit() or digits[0] == "0":
+        return None
+    return int(digits)
+
+
+class CompactIdList:
+    __slots__ = ("_prefix", "_numbers")
+
+    def __init__(self, prefix: str, identifiers: Iterable[str] = ()) -> None:
+        self._prefix = prefix
+        self._numbers = array("q")
+        for identifier in identifiers:
+            self.append(identifier)
+
+    def _number(self, identifier: str) -> int:
+        number = parse_id(self._prefix, identifier)
+        if number is None:
+            raise ValueError(f"Unsupported identifier: {identifier}")
+        return number
+
+    def append(self, identifier: str) -> None:
+        self._numbers.append(self._number(identifier))
+
+    def append_number(self, number: int) -> None:
+        self._numbers.append(number)
+
+    def insert_number(self, number: int) -> None:
+        # Appends in the common case; a late arrival is placed so the list stays sorted.
+        numbers = self._numbers
+        if numbers and numbers[-1] > number:
+            insort(numbers, number)
+        else:
+            numbers.append(number)
+
+    def numbers(self) -> Iterator[int]:
+        return iter(self._numbers)
+
+    # Keyset reads below assume the list is kept sorted (see insert_number).
+    def numbers_after(self, number: Optional[int], limit: int) -> array:
+        start = 0 if number is None else bisect_right(self._numbers, number)
+        return self._numbers[start:start + limit]
+
+    def numbers_before(self, number: Optional[int], limit: int) -> array:
+        end = len(self._numbers) if number is None else bisect_left(self._numbers, number)
+        return self._numbers[max(0, end - limit):end][::-1]
+
+    def copy(self) -> List[str]:
+        return list(self)
+
+    def __iter__(self) -> Iterator[str]:
+        prefix = self._prefix
+        return (f"{prefix}{number}" for number in self._numbers)
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [f"{self._prefix}{number}" for number in self._numbers[index]]
+        return f"{self._prefix}{self._numbers[index]}"
+
+    def __contains__(self, identifier: object) -> bool:
+        number = parse_id(self._prefix, identifier)
+        return number is not None and number in self._numbers
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompactIdList):
+            return self._prefix == other._prefix and self._numbers == other._numbers
+        if isinstance(other, list):
+            return self.copy() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
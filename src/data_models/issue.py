@@ -1,18 +1,115 @@
-from dataclasses import dataclass
+import sys
 from typing import Optional
 
+from src.data_models.ids import ISSUE_PREFIX, parse_id
 from src.enums import IssueState, ProductType
 
+_TYPES = tuple(ProductType)
+_STATES = tuple(IssueState)
+_TYPE_CODES = {member: code for code, member in enumerate(_TYPES)}
+_STATE_CODES = {member: code for code, member in enumerate(_STATES)}
+_STATE_BITS = 4
+_STATE_MASK = (1 << _STATE_BITS) - 1
+
 
-@dataclass
 class Issue:
-    issue_id: str
-    transaction_id: str
-    issue_type: ProductType
-    subject: str
-    description: str
-    state: IssueState
-    user_id: str
-    user_email: str
-    agent_id: Optional[str] = None
-    resolution: Optional[str] = None
+    __slots__ = (
+        "_number",
+        "_codes",
+        "transaction_id",
+        "subject",
+        "description",
+        "user_id",
+        "user_email",
+        "agent_id",
+        "resolution",
+        "priority",
+        "deadline",
+    )
+
+    def __init__(
+        self,
+        issue_id: str,
+        transaction_id: str,
+        issue_type: ProductType,
+        subject: str,
+        description: str,
+        state: IssueState,
+        user_id: str,
+        user_email: str,
+        agent_id: Optional[str] = None,
+        resolution: Optional[str] = None,
+        priority: int = 0,
+        deadline: Optional[float] = None,
+    ) -> None:
+        number = parse_id(ISSUE_PREFIX, issue_id)
+        if number is None:
+            raise ValueError(f"Unsupported issue id: {issue_id}")
+        self._number = number
+        self.user_id = sys.intern(user_id)
+        self.agent_id = sys.intern(agent_id) if agent_id is not None else None
+        self._codes = (_TYPE_CODES[issue_type] << _STATE_BITS) | _STATE_CODES[state]
+        self.transaction_id = transaction_id
+        self.subject = sys.intern(subject)
+        self.description = description
+        self.user_email = sys.intern(user_email)
+        self.resolution = resolution
+        # Higher is more urgent; the deadline is the SLA resolve-by time in epoch seconds.
+        self.priority = priority
+        self.deadline = deadline
+
+    @property
+    def number(self) -> int:
+        return self._number
+
+    @property
+    def issue_id(self) -> str:
+        return f"{ISSUE_PREFIX}{self._number}"
+
+    @property
+    def issue_type(self) -> ProductType:
+        return _TYPES[self._codes >> _STATE_BITS]
+
+    @issue_type.setter
+    def issue_type(self, issue_type: ProductType) -> None:
+        self._codes = (_TYPE_CODES[issue_type] << _STATE_BITS) | (self._codes & _STATE_MASK)
+
+    @property
+    def state(self) -> IssueState:
+        return _STATES[self._codes & _STATE_MASK]
+
+    @state.setter
+    def state(self, state: IssueState) -> None:
+        self._codes = (self._codes & ~_STATE_MASK) | _STATE_CODES[state]
+
+    def _fields(self) -> tuple:
+        return (
+            self.issue_id,
+            self.transaction_id,
+            self.issue_type,
+            self.subject,
+            self.description,
+            self.state,
+            self.user_id,
+            self.user_email,
+            self.agent_id,
+            self.resolution,
+            self.priority,
+            self.deadline,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"Issue(issue_id={self.issue_id!r}, transaction_id={self.transaction_id!r}, "
+            f"issue_type={self.issue_type!r}, subject={self.subject!r}, description={self.description!r}, "
+            f"state={self.state!r}, user_id={self.user_id!r}, user_email={self.user_email!r}, "
+            f"agent_id={self.agent_id!r}, resolution={self.resolution!r}, priority={self.priority!r}, "
+            f"deadline={self.deadline!r})"
+        )
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 from src.enums import StrategyType
 
@@ -7,3 +8,5 @@ from src.enums import StrategyType
 class Strategy:
     strategy_id: str
     strategy_type: StrategyType
+    # Registered scorer name, for SCORED strategies only.
+    scorer: Optional[str] = None
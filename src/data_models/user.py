@@ -1,14 +1,15 @@
 from dataclasses import dataclass, field
-from typing import List, Set
+from typing import Set
 
+from src.data_models.ids import ISSUE_PREFIX, CompactIdList
 from src.enums import ProductType
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     user_id: str
     name: str
     email: str
     active_products: Set[ProductType] = field(default_factory=set)
     active_issue_ids: Set[str] = field(default_factory=set)
-    created_issue_ids: List[str] = field(default_factory=list)
+    created_issue_ids: CompactIdList = field(default_factory=lambda: CompactIdList(ISSUE_PREFIX))
@@ -0,0 +1,119 @@
+import heapq
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.enums import ProductType
+
+# One priority level is gained for every minute spent waiting, so low-priority issues cannot starve.
+AGING_PER_SECOND = 1 / 60
+
+_Key = Tuple[float, int]
+
+
+class PriorityWaitlist:
+    # Waiting issues ordered by effective priority = priority + aging * seconds waited. Since every
+    # entry ages at the same rate, ordering by (aging * enqueued_at - priority) is equivalent at any
+    # moment and keys never need refreshing. One lazily cleaned heap per product type lets a
+    # multi-slot agent pick the best issue among the types it still has room for.
+    __slots__ = ("aging_per_second", "_entries", "_heaps", "_counts", "_sequence")
+
+    def __init__(self, aging_per_second: float = AGING_PER_SECOND) -> None:
+        self.aging_per_second = aging_per_second
+        # issue_id -> (issue_type, key, enqueued_at)
+        self._entries: Dict[str, Tuple[ProductType, _Key, float]] = {}
+        self._heaps: Dict[ProductType, List[Tuple[_Key, str]]] = {}
+        # Live entries per product type; the heaps also hold stale ones.
+        self._counts: Dict[ProductType, int] = {}
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def __contains__(self, issue_id: object) -> bool:
+        return issue_id in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([issue_id for _, issue_id in sorted((entry[1], issue_id) for issue_id, entry in self._entries.items())])
+
+    def push(self, issue_id: str, issue_type: ProductType, priority: int = 0, now: Optional[float] = None) -> None:
+        # Re-pushing an entry (e.g. after an escalation) keeps its original enqueue time.
+        existing = self._entries.get(issue_id)
+        enqueued_at = existing[2] if existing else (time.time() if now is None else now)
+        self._sequence += 1
+        key = (self.aging_per_second * enqueued_at - priority, self._sequence)
+        self._entries[issue_id] = (issue_type, key, enqueued_at)
+        if existing is None or existing[0] is not issue_type:
+            self._counts[issue_type] = self._counts.get(issue_type, 0) + 1
+        if existing and existing[0] is not issue_type:
+            self._counts[existing[0]] -= 1
+            self._maybe_compact(existing[0])
+        heap = self._heaps.get(issue_type)
+        if heap is None:
+            heap = self._heaps[issue_type] = []
+        heapq.heappush(heap, (key, issue_id))
+        self._maybe_compact(issue_type)
+
+    def discard(self, issue_id: str) -> bool:
+        entry = self._entries.pop(issue_id, None)
+        if entry is None:
+            return False
+        self._counts[entry[0]] -= 1
+        self._maybe_compact(entry[0])
+        return True
+
+    def drain(self) -> List[Tuple[str, ProductType, float]]:
+        # Empties the waitlist, returning (issue_id, issue_type, enqueued_at) for every entry.
+        drained = [(issue_id, issue_type, enqueued_at) for issue_id, (issue_type, _, enqueued_at) in self._entries.items()]
+        self._entries.clear()
+        self._heaps.clear()
+        self._counts.clear()
+        return drained
+
+    def count(self, issue_type: ProductType) -> int:
+        return self._counts.get(issue_type, 0)
+
+    def type_of(self, issue_id: str) -> Optional[ProductType]:
+        entry = self._entries.get(issue_id)
+        return entry[0] if entry else None
+
+    def enqueued_at(self, issue_id: str) -> Optional[float]:
+        entry = self._entries.get(issue_id)
+        return entry[2] if entry else None
+
+    def best(self, eligible: Optional[Callable[[ProductType], bool]] = None) -> Optional[str]:
+        best: Optional[Tuple[_Key, str]] = None
+        for issue_type, heap in self._heaps.items():
+            if eligible is not None and not eligible(issue_type):
+                continue
+            head = self._peek(heap)
+            if head is not None and (best is None or head < best):
+                best = head
+        return best[1] if best else None
+
+    def pop_best(self, eligible: Optional[Callable[[ProductType], bool]] = None) -> Optional[str]:
+        issue_id = self.best(eligible)
+        if issue_id is not None:
+            self.discard(issue_id)
+        return issue_id
+
+    def _peek(self, heap: List[Tuple[_Key, str]]) -> Optional[Tuple[_Key, str]]:
+        entries = self._entries
+        while heap:
+            key, issue_id = heap[0]
+            entry = entries.get(issue_id)
+            if entry is not None and entry[1] == key:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def _maybe_compact(self, issue_type: ProductType) -> None:
+        heap = self._heaps.get(issue_type)
+        if heap is None or len(heap) <= 2 * len(self._entries) + 64:
+            return
+        self._heaps[issue_type] = [
+            (key, issue_id) for issue_id, (entry_type, key, _) in self._entries.items() if entry_type is issue_type
+        ]
+        heapq.heapify(self._heaps[issue_type])
@@ -1,9 +1,11 @@
 from .product_type import ProductType
 from .issue_state import IssueState
 from .strategy_type import StrategyType
+from .issue_event_type import IssueEventType
 
 __all__ = [
     "ProductType",
     "IssueState",
     "StrategyType",
+    "IssueEventType",
 ]
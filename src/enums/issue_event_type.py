@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class IssueEventType(Enum):
+    CREATED = "created"
+    WAITLISTED = "waitlisted"
+    ASSIGNED = "assigned"
+    UPDATED = "updated"
+    CLOSED = "closed"
+    SLA_AT_RISK = "sla_at_risk"
+    SLA_BREACHED = "sla_breached"
+    DELETED = "deleted"
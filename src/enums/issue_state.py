@@ -11,18 +11,20 @@ class IssueState(Enum):
     def from_value(cls, value: "IssueState | str") -> "IssueState":
         if isinstance(value, cls):
             return value
-        normalized = str(value).strip().lower()
-        mapping = {
-            "created": cls.CREATED,
-            "open": cls.CREATED,
-            "pending": cls.PENDING,
-            "in progress": cls.PENDING,
-            "waiting": cls.WAITING,
-            "waitlist": cls.WAITING,
-            "queued": cls.WAITING,
-            "closed": cls.CLOSED,
-            "resolved": cls.CLOSED,
-        }
-        if normalized in mapping:
-            return mapping[normalized]
-        raise ValueError(f"Unsupported issue state: {value}")
+        member = _LOOKUP.get(str(value).strip().lower())
+        if member is None:
+            raise ValueError(f"Unsupported issue state: {value}")
+        return member
+
+
+_LOOKUP = {
+    "created": IssueState.CREATED,
+    "open": IssueState.CREATED,
+    "pending": IssueState.PENDING,
+    "in progress": IssueState.PENDING,
+    "waiting": IssueState.WAITING,
+    "waitlist": IssueState.WAITING,
+    "queued": IssueState.WAITING,
+    "closed": IssueState.CLOSED,
+    "resolved": IssueState.CLOSED,
+}
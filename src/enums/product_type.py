@@ -11,8 +11,10 @@ class ProductType(Enum):
     def from_value(cls, value: "ProductType | str") -> "ProductType":
         if isinstance(value, cls):
             return value
-        normalized = str(value).strip().lower()
-        for member in cls:
-            if member.value == normalized or member.name.lower() == normalized:
-                return member
-        raise ValueError(f"Unsupported product type: {value}")
+        member = _LOOKUP.get(str(value).strip().lower())
+        if member is None:
+            raise ValueError(f"Unsupported product type: {value}")
+        return member
+
+
+_LOOKUP = {key: member for member in ProductType for key in (member.value, member.name.lower())}
@@ -4,13 +4,18 @@ from enum import Enum
 class StrategyType(Enum):
     FCFS = "fcfs"
     RATING = "rating"
+    CAPACITY = "capacity"
+    # Ranks agents with a registered scorer over the agent feature matrix (src/scoring).
+    SCORED = "scored"
 
     @classmethod
     def from_value(cls, value: "StrategyType | str") -> "StrategyType":
         if isinstance(value, cls):
             return value
-        normalized = str(value).strip().lower()
-        for member in cls:
-            if member.value == normalized or member.name.lower() == normalized:
-                return member
-        raise ValueError(f"Unsupported strategy type: {value}")
+        member = _LOOKUP.get(str(value).strip().lower())
+        if member is None:
+            raise ValueError(f"Unsupported strategy type: {value}")
+        return member
+
+
+_LOOKUP = {key: member for member in StrategyType for key in (member.value, member.name.lower())}
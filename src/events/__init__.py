@@ -0,0 +1,10 @@
+from .event import IssueEvent
+from .bus import EventBus
+from .views import StateCountView, WorkHistoryView
+
+__all__ = [
+    "IssueEvent",
+    "EventBus",
+    "StateCountView",
+    "WorkHistoryView",
+]
@@ -0,0 +1,79 @@
+import time
+from collections import deque
+from itertools import islice
+from typing import Callable, Deque, List, Optional, Tuple
+
+from src.concurrency.locks import make_lock
+from src.data_models.issue import Issue
+from src.enums import IssueEventType, IssueState
+from src.events.event import IssueEvent
+
+Subscriber = Callable[[IssueEvent], None]
+
+
+class EventBus:
+    def __init__(self, thread_safe: bool = False, *, retain: int = 65_536) -> None:
+        self._subscribers: List[Subscriber] = []
+        self._retained: Deque[IssueEvent] = deque(maxlen=retain)
+        self._sequence = 0
+        # Publishing is serialized so every subscriber sees events in sequence order.
+        self._lock = make_lock(thread_safe)
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        if subscriber not in self._subscribers:
+            self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+
+    def publish(
+        self,
+        kind: IssueEventType,
+        issue: Issue,
+        previous_state: Optional[IssueState] = None,
+        *,
+        timestamp: Optional[float] = None,
+    ) -> IssueEvent:
+        with self._lock:
+            self._sequence += 1
+            event = IssueEvent(
+                sequence=self._sequence,
+                kind=kind,
+                issue_id=issue.issue_id,
+                issue_type=issue.issue_type,
+                state=issue.state,
+                previous_state=previous_state,
+                user_id=issue.user_id,
+                agent_id=issue.agent_id,
+                resolution=issue.resolution,
+                timestamp=time.time() if timestamp is None else timestamp,
+            )
+            self._retained.append(event)
+            for subscriber in self._subscribers:
+                subscriber(event)
+        return event
+
+    @property
+    def last_sequence(self) -> int:
+        return self._sequence
+
+    def tail(self, cursor: Optional[int] = None, limit: int = 100) -> Tuple[List[IssueEvent], int]:
+        with self._lock:
+            if not self._retained:
+                return [], self._sequence if cursor is None else cursor
+            oldest = self._retained[0].sequence
+            if cursor is None:
+                cursor = oldest - 1
+            elif cursor < oldest - 1:
+                raise ValueError(f"Events after sequence {cursor} are no longer retained; oldest is {oldest}")
+            start = cursor - oldest + 1
+            events = list(islice(self._retained, start, start + limit))
+        return events, events[-1].sequence if events else cursor
+
+    def __getstate__(self) -> dict:
+        # Subscribers are rewired by their owner and the retained window is transient.
+        state = self.__dict__.copy()
+        state["_subscribers"] = []
+        state["_retained"] = deque(maxlen=self._retained.maxlen)
+        return state
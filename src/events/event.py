@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from src.enums import IssueEventType, IssueState, ProductType
+
+
+@dataclass(frozen=True, slots=True)
+class IssueEvent:
+    sequence: int
+    kind: IssueEventType
+    issue_id: str
+    issue_type: ProductType
+    state: IssueState
+    previous_state: Optional[IssueState]
+    user_id: str
+    agent_id: Optional[str]
+    resolution: Optional[str]
+    timestamp: float
@@ -0,0 +1,78 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from src.data_models.ids import ISSUE_PREFIX, parse_id
+from src.enums import IssueEventType, IssueState
+from src.events.event import IssueEvent
+from src.storage.history import HistoryStore
+
+
+class WorkHistoryView:
+    def __init__(self, window: int = 1000, *, thread_safe: bool = False) -> None:
+        if window < 1:
+            raise ValueError(f"window must be positive, got {window}")
+        self._window = window
+        # Reads see a bounded ring of recent resolutions; the full history is paged out to a
+        # HistoryStore and only reachable page by page.
+        self._recent: Dict[str, Deque[str]] = {}
+        self._archive = HistoryStore(thread_safe=thread_safe)
+        # Only a reopened issue can close twice. For those, remember which agents already list it
+        # instead of searching their history.
+        self._reopened: Dict[int, Set[str]] = {}
+
+    def apply(self, event: IssueEvent) -> None:
+        if event.kind is IssueEventType.CLOSED:
+            agent_id = event.agent_id
+            if agent_id is None:
+                return
+            number = parse_id(ISSUE_PREFIX, event.issue_id)
+            listed = self._reopened.get(number)
+            if listed is not None:
+                if agent_id in listed:
+                    return
+                listed.add(agent_id)
+            recent = self._recent.get(agent_id)
+            if recent is None:
+                recent = self._recent[agent_id] = deque(maxlen=self._window)
+            self._archive.append(agent_id, number)
+            recent.append(event.issue_id)
+        elif event.kind is IssueEventType.DELETED:
+            # Resolutions already recorded stay in the agent's history.
+            self._reopened.pop(parse_id(ISSUE_PREFIX, event.issue_id), None)
+        elif event.previous_state is IssueState.CLOSED and event.state is not IssueState.CLOSED:
+            listed = self._reopened.setdefault(parse_id(ISSUE_PREFIX, event.issue_id), set())
+            if event.agent_id is not None:
+                listed.add(event.agent_id)
+
+    def history(self, agent_id: str) -> List[str]:
+        return list(self._recent.get(agent_id, ()))
+
+    def page(self, agent_id: str, cursor: Optional[int] = None, limit: int = 100) -> Tuple[List[str], Optional[int]]:
+        start = cursor or 0
+        end = start + limit
+        numbers = self._archive.read(agent_id, start, end)
+        return [f"{ISSUE_PREFIX}{number}" for number in numbers], end if end < self._archive.count(agent_id) else None
+
+    def resolved_count(self, agent_id: str) -> int:
+        return self._archive.count(agent_id)
+
+
+class StateCountView:
+    def __init__(self) -> None:
+        self._counts: Dict[IssueState, int] = {state: 0 for state in IssueState}
+
+    def apply(self, event: IssueEvent) -> None:
+        if event.kind is IssueEventType.DELETED:
+            self._counts[event.state] -= 1
+            return
+        if event.previous_state is event.state:
+            return
+        if event.previous_state is not None:
+            self._counts[event.previous_state] -= 1
+        self._counts[event.state] += 1
+
+    def count(self, state: IssueState) -> int:
+        return self._counts[IssueState.from_value(state)]
+
+    def counts(self) -> Dict[IssueState, int]:
+        return dict(self._counts)
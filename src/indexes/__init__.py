@@ -0,0 +1,17 @@
+from .keyed_heap import KeyedHeap
+from .agent_availability_index import AgentAvailabilityIndex
+from .waitlist_load_index import WaitlistLoadIndex
+from .issue_registry import IssueRegistry
+from .transaction_index import TransactionIndex
+from .text_index import NearDuplicateIndex, TextIndex, tokenize
+
+__all__ = [
+    "KeyedHeap",
+    "AgentAvailabilityIndex",
+    "WaitlistLoadIndex",
+    "IssueRegistry",
+    "TransactionIndex",
+    "TextIndex",
+    "NearDuplicateIndex",
+    "tokenize",
+]
@@ -0,0 +1,96 @@
+from typing import Dict, List, Optional, Set
+
+from src.concurrency.locks import LockTable, make_lock
+from src.data_models.agent import Agent
+from src.enums import ProductType
+from src.indexes.keyed_heap import KeyedHeap
+
+
+class AgentAvailabilityIndex:
+    def __init__(self, thread_safe: bool = False) -> None:
+        self._order: Dict[str, int] = {}
+        self._indexed_types: Dict[str, Set[ProductType]] = {}
+        self._by_arrival: Dict[ProductType, KeyedHeap] = {}
+        self._by_rating: Dict[ProductType, KeyedHeap] = {}
+        self._by_capacity: Dict[ProductType, KeyedHeap] = {}
+        self._register_lock = make_lock(thread_safe)
+        self._type_locks = LockTable(thread_safe)
+
+    def register(self, agent: Agent) -> None:
+        with self._register_lock:
+            self._order.setdefault(agent.agent_id, len(self._order))
+        if self not in agent.observers:
+            agent.observers.append(self)
+        self.refresh(agent)
+
+    def agent_changed(self, agent: Agent) -> None:
+        self.refresh(agent)
+
+    @staticmethod
+    def _heap(heaps: Dict[ProductType, KeyedHeap], issue_type: ProductType) -> KeyedHeap:
+        heap = heaps.get(issue_type)
+        if heap is None:
+            heap = heaps.setdefault(issue_type, KeyedHeap())
+        return heap
+
+    def refresh(self, agent: Agent) -> None:
+        agent_id = agent.agent_id
+        order = self._order.get(agent_id)
+        if order is None:
+            return
+        spare = {issue_type: agent.spare_slots(issue_type) for issue_type in agent.supported_issue_types}
+        free_types = {issue_type for issue_type, slots in spare.items() if slots}
+        for issue_type in self._indexed_types.get(agent_id, set()) - free_types:
+            with self._type_locks.for_key(issue_type):
+                self._by_arrival[issue_type].discard(agent_id)
+                self._by_rating[issue_type].discard(agent_id)
+                self._by_capacity[issue_type].discard(agent_id)
+        for issue_type in free_types:
+            rating = -agent.ratings.get(issue_type, 0.0)
+            with self._type_locks.for_key(issue_type):
+                self._heap(self._by_arrival, issue_type).push(agent_id, order)
+                self._heap(self._by_rating, issue_type).push(agent_id, (rating, order))
+                self._heap(self._by_capacity, issue_type).push(agent_id, (-spare[issue_type], rating, order))
+        self._indexed_types[agent_id] = free_types
+
+    def first_available(self, issue_type: ProductType) -> Optional[str]:
+        heap = self._by_arrival.get(issue_type)
+        if not heap:
+            return None
+        with self._type_locks.for_key(issue_type):
+            return heap.peek()
+
+    def best_rated(self, issue_type: ProductType) -> Optional[str]:
+        heap = self._by_rating.get(issue_type)
+        if not heap:
+            return None
+        with self._type_locks.for_key(issue_type):
+            return heap.peek()
+
+    def most_spare(self, issue_type: ProductType) -> Optional[str]:
+        heap = self._by_capacity.get(issue_type)
+        if not heap:
+            return None
+        with self._type_locks.for_key(issue_type):
+            return heap.peek()
+
+    def available_agents(self, issue_type: ProductType) -> List[str]:
+        heap = self._by_arrival.get(issue_type)
+        if not heap:
+            return []
+        with self._type_locks.for_key(issue_type):
+            return heap.ordered()
+
+    def agents_by_spare_capacity(self, issue_type: ProductType) -> List[str]:
+        heap = self._by_capacity.get(issue_type)
+        if not heap:
+            return []
+        with self._type_locks.for_key(issue_type):
+            return heap.ordered()
+
+    def arrival_order(self, agent_id: str) -> int:
+        return self._order.get(agent_id, len(self._order))
+
+    def count_available(self, issue_type: ProductType) -> int:
+        heap = self._by_arrival.get(issue_type)
+        return len(heap) if heap else 0
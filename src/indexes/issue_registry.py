@@ -0,0 +1,69 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.concurrency.locks import make_lock
+from src.data_models.ids import ISSUE_PREFIX, parse_id
+
+
+class IssueRegistry:
+    def __init__(self, thread_safe: bool = False) -> None:
+        self._positions = array("q")
+        self._numbers = array("q")
+        self._slots: Dict[int, int] = {}
+        self._next_position = 0
+        self._lock = make_lock(thread_safe)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, issue_id: object) -> bool:
+        return parse_id(ISSUE_PREFIX, issue_id) in self._slots
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            numbers = list(self._slots)
+        return (f"{ISSUE_PREFIX}{number}" for number in numbers)
+
+    def add(self, issue_id: str) -> bool:
+        number = parse_id(ISSUE_PREFIX, issue_id)
+        if number is None:
+            return False
+        with self._lock:
+            if number in self._slots:
+                return False
+            position = self._next_position
+            self._next_position += 1
+            self._slots[number] = position
+            self._positions.append(position)
+            self._numbers.append(number)
+            return True
+
+    def discard(self, issue_id: str) -> bool:
+        with self._lock:
+            position = self._slots.pop(parse_id(ISSUE_PREFIX, issue_id), None)
+            if position is None:
+                return False
+            self._numbers[bisect_left(self._positions, position)] = 0
+            if len(self._numbers) > 2 * len(self._slots) + 64:
+                self._compact()
+            return True
+
+    def page(self, cursor: Optional[int] = None, limit: int = 100) -> Tuple[List[str], Optional[int]]:
+        with self._lock:
+            start = 0 if cursor is None else bisect_right(self._positions, cursor)
+            page: List[str] = []
+            last_position = cursor
+            for index in range(start, len(self._numbers)):
+                number = self._numbers[index]
+                if not number:
+                    continue
+                if len(page) == limit:
+                    return page, last_position
+                page.append(f"{ISSUE_PREFIX}{number}")
+                last_position = self._positions[index]
+            return page, None
+
+    def _compact(self) -> None:
+        self._positions = array("q", self._slots.values())
+        self._numbers = array("q", self._slots)
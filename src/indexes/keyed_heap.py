@@ -0,0 +1,58 @@
+import heapq
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class KeyedHeap:
+    def __init__(self) -> None:
+        self._heap: List[Tuple[Any, Hashable]] = []
+        self._keys: Dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, member: Hashable) -> bool:
+        return member in self._keys
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._keys)
+
+    def key_of(self, member: Hashable) -> Any:
+        return self._keys.get(member)
+
+    def push(self, member: Hashable, key: Any) -> None:
+        if self._keys.get(member, _MISSING) == key:
+            return
+        self._keys[member] = key
+        heapq.heappush(self._heap, (key, member))
+        self._maybe_compact()
+
+    def discard(self, member: Hashable) -> None:
+        if self._keys.pop(member, _MISSING) is not _MISSING:
+            self._maybe_compact()
+
+    def peek(self) -> Optional[Hashable]:
+        heap = self._heap
+        while heap:
+            key, member = heap[0]
+            if self._keys.get(member, _MISSING) == key:
+                return member
+            heapq.heappop(heap)
+        return None
+
+    def pop(self) -> Optional[Hashable]:
+        member = self.peek()
+        if member is None:
+            return None
+        heapq.heappop(self._heap)
+        del self._keys[member]
+        return member
+
+    def ordered(self) -> List[Hashable]:
+        return [member for _, member in sorted((key, member) for member, key in self._keys.items())]
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) > 2 * len(self._keys) + 64:
+            self._heap = [(key, member) for member, key in self._keys.items()]
+            heapq.heapify(self._heap)
@@ -0,0 +1,198 @@
+import hashlib
+import re
+from array import array
+from bisect import bisect_left, insort
+from itertools import islice
+from operator import eq
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOP_WORDS = frozenset(
+    {"a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "in", "is", "it", "my", "of", "on", "or", "the", "to", "was"}
+)
+_WORD = array("I")
+# Newest members of each LSH bucket compared at ingest; boilerplate text can make one bucket huge.
+_BUCKET_PROBE = 32
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if token not in _STOP_WORDS]
+
+
+class TextIndex:
+    # Keyword postings over issue subject and description. Postings are append-only arrays of
+    # issue numbers in creation order; removed issues are filtered at query time by the caller's
+    # liveness check and compacted away once they make up half of all entries.
+    def __init__(self) -> None:
+        self._postings: Dict[str, array] = {}
+        # Sorted vocabulary, so a prefix is a contiguous range found by bisection. Words new since
+        # the last prefix query wait unsorted and are merged in by the next one: ingest stays O(1)
+        # per word and the merge is one linear pass over two sorted runs.
+        self._vocabulary: List[str] = []
+        self._new_words: List[str] = []
+        self._entries = 0
+        self._removed = 0
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def add(self, number: int, tokens: Iterable[str]) -> None:
+        for token in set(tokens):
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = array("q")
+                self._new_words.append(token)
+            if posting and posting[-1] > number:
+                insort(posting, number)
+            else:
+                posting.append(number)
+            self._entries += 1
+
+    def removed(self, entries: int, alive: Callable[[int], bool]) -> None:
+        self._removed += entries
+        if 2 * self._removed <= self._entries:
+            return
+        for token in list(self._postings):
+            posting = array("q", (number for number in self._postings[token] if alive(number)))
+            if posting:
+                self._postings[token] = posting
+            else:
+                del self._postings[token]
+        self._vocabulary = sorted(self._postings)
+        self._new_words = []
+        self._entries = sum(len(posting) for posting in self._postings.values())
+        self._removed = 0
+
+    def terms(self, prefix: str) -> List[str]:
+        if self._new_words:
+            self._new_words.sort()
+            self._vocabulary += self._new_words
+            self._vocabulary.sort()
+            self._new_words = []
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, prefix)
+        end = start
+        while end < len(vocabulary) and vocabulary[end].startswith(prefix):
+            end += 1
+        return vocabulary[start:end]
+
+    def match(self, query: str, *, prefix: bool = True) -> Set[int]:
+        # Every query term must match; with prefix=True a term matches any word it starts.
+        candidates: List[Set[int]] = []
+        for term in set(tokenize(query)):
+            if prefix:
+                numbers: Set[int] = set()
+                for word in self.terms(term):
+                    numbers.update(self._postings[word])
+            else:
+                numbers = set(self._postings.get(term, ()))
+            if not numbers:
+                return set()
+            candidates.append(numbers)
+        if not candidates:
+            return set()
+        candidates.sort(key=len)
+        return candidates[0].intersection(*candidates[1:])
+
+
+class NearDuplicateIndex:
+    # MinHash signatures over word and word-pair shingles, bucketed by LSH bands. Only open issues
+    # are tracked, so the index follows the hot set rather than the whole history.
+    def __init__(self, permutations: int = 64, bands: int = 16, threshold: float = 0.6, seed: int = 1) -> None:
+        if permutations % bands:
+            raise ValueError(f"bands ({bands}) must divide permutations ({permutations})")
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self._permutations = permutations
+        self._salt = seed.to_bytes(8, "little")
+        self._bands = bands
+        self._rows = permutations // bands
+        self.threshold = threshold
+        self._signatures: Dict[int, Tuple[int, ...]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Dict[int, None]] = {}
+        # duplicate number -> primary number, and primary -> its duplicates
+        self._primary: Dict[int, int] = {}
+        self._members: Dict[int, List[int]] = {}
+
+    def signature(self, tokens: List[str]) -> Optional[Tuple[int, ...]]:
+        shingles = set(tokens)
+        shingles.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+        if not shingles:
+            return None
+        # One extendable-output hash per shingle yields all the permutation values at once, so the
+        # per-permutation minimum runs in C instead of a Python loop over permutations x shingles.
+        width = self._permutations * _WORD.itemsize
+        columns = []
+        for shingle in shingles:
+            values = array("I")
+            values.frombytes(hashlib.shake_128(self._salt + shingle.encode()).digest(width))
+            columns.append(values)
+        return tuple(map(min, zip(*columns)))
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        rows = self._rows
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(self._bands)]
+
+    def similarity(self, first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        return sum(map(eq, first, second)) / len(first)
+
+    def track(self, number: int, tokens: List[str]) -> Optional[int]:
+        # Starts tracking an open issue and returns the primary it duplicates, if any.
+        signature = self.signature(tokens)
+        if signature is None:
+            return None
+        primary = self._primary.get(number)
+        if primary is None:
+            primary = self._best_match(number, signature)
+            if primary is not None:
+                self._primary[number] = primary
+                self._members.setdefault(primary, []).append(number)
+        self._signatures[number] = signature
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, {})[number] = None
+        return primary
+
+    def _best_match(self, number: int, signature: Tuple[int, ...]) -> Optional[int]:
+        candidates: Set[int] = set()
+        for key in self._band_keys(signature):
+            candidates.update(islice(reversed(self._buckets.get(key, {})), _BUCKET_PROBE))
+        candidates.discard(number)
+        best: Optional[Tuple[float, int]] = None
+        for candidate in candidates:
+            score = self.similarity(signature, self._signatures[candidate])
+            if score < self.threshold:
+                continue
+            # Clusters stay flat: a duplicate of a duplicate joins the original primary.
+            primary = self._primary.get(candidate, candidate)
+            if best is None or (score, -primary) > (best[0], -best[1]):
+                best = (score, primary)
+        return best[1] if best else None
+
+    def untrack(self, number: int) -> None:
+        signature = self._signatures.pop(number, None)
+        if signature is None:
+            return
+        for key in self._band_keys(signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.pop(number, None)
+                if not bucket:
+                    del self._buckets[key]
+
+    def forget(self, number: int) -> None:
+        self.untrack(number)
+        primary = self._primary.pop(number, None)
+        if primary is not None:
+            members = self._members.get(primary)
+            if members and number in members:
+                members.remove(number)
+                if not members:
+                    del self._members[primary]
+        for member in self._members.pop(number, ()):
+            self._primary.pop(member, None)
+
+    def primary_of(self, number: int) -> Optional[int]:
+        return self._primary.get(number)
+
+    def duplicates_of(self, number: int) -> List[int]:
+        return list(self._members.get(number, ()))
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from src.concurrency.locks import make_lock
+from src.enums import ProductType
+
+TransactionKey = Tuple[str, ProductType]
+
+
+class TransactionIndex:
+    # Maps (transaction_id, issue_type) to the issue number it created. Every open issue is indexed;
+    # closed ones stay reachable through a bounded LRU of recent creations until their TTL runs out,
+    # so a late retry of a just-resolved ticket does not reopen the work as a new issue.
+    def __init__(self, thread_safe: bool = False, *, capacity: int = 65_536, ttl: float = 3_600.0) -> None:
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        if ttl <= 0:
+            raise ValueError(f"ttl must be positive, got {ttl}")
+        self._open: Dict[TransactionKey, int] = {}
+        # key -> (number, expires at), least recently used first
+        self._recent: "OrderedDict[TransactionKey, Tuple[int, float]]" = OrderedDict()
+        self.capacity = capacity
+        self.ttl = ttl
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        self._lock = make_lock(thread_safe)
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+    def lookup(self, key: TransactionKey, now: float) -> Optional[int]:
+        with self._lock:
+            cached = self._recent.get(key)
+            if cached is not None:
+                number, expires_at = cached
+                if expires_at > now:
+                    self._recent.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return number
+                del self._recent[key]
+                self._stats["expirations"] += 1
+            number = self._open.get(key)
+            if number is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            self._cache(key, number, now)
+            return number
+
+    def remember(self, key: TransactionKey, number: int, now: float) -> None:
+        with self._lock:
+            self._open[key] = number
+            self._cache(key, number, now)
+
+    def _cache(self, key: TransactionKey, number: int, now: float) -> None:
+        self._recent[key] = (number, now + self.ttl)
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.capacity:
+            self._recent.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def closed(self, key: TransactionKey, number: int) -> None:
+        with self._lock:
+            if self._open.get(key) == number:
+                del self._open[key]
+
+    def reopened(self, key: TransactionKey, number: int) -> None:
+        # A newer issue for the same transaction keeps the key.
+        with self._lock:
+            self._open.setdefault(key, number)
+
+    def forget(self, key: TransactionKey, number: int) -> None:
+        with self._lock:
+            if self._open.get(key) == number:
+                del self._open[key]
+            cached = self._recent.get(key)
+            if cached is not None and cached[0] == number:
+                del self._recent[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "open": len(self._open), "cached": len(self._recent)}
@@ -0,0 +1,81 @@
+from typing import Dict, Optional, Set
+
+from src.concurrency.locks import LockTable
+from src.data_models.agent import Agent
+from src.enums import ProductType
+from src.indexes.keyed_heap import KeyedHeap
+
+
+class WaitlistLoadIndex:
+    def __init__(self, thread_safe: bool = False) -> None:
+        self._indexed_types: Dict[str, Set[ProductType]] = {}
+        # Per-agent waitlist limits. An agent at its limit for a type sorts after every agent with
+        # room, so the least loaded agent is one that can take the issue whenever any can.
+        self._limits: Dict[str, int] = {}
+        self._by_load: Dict[ProductType, KeyedHeap] = {}
+        self._by_backlog: Dict[ProductType, KeyedHeap] = {}
+        self._type_locks = LockTable(thread_safe)
+
+    def register(self, agent: Agent) -> None:
+        if self not in agent.observers:
+            agent.observers.append(self)
+        self.refresh(agent)
+
+    def agent_changed(self, agent: Agent) -> None:
+        self.refresh(agent)
+
+    def set_limit(self, agent: Agent, limit: Optional[int]) -> None:
+        if limit is None:
+            self._limits.pop(agent.agent_id, None)
+        else:
+            self._limits[agent.agent_id] = limit
+        self.refresh(agent)
+
+    @staticmethod
+    def _heap(heaps: Dict[ProductType, KeyedHeap], issue_type: ProductType) -> KeyedHeap:
+        heap = heaps.get(issue_type)
+        if heap is None:
+            heap = heaps.setdefault(issue_type, KeyedHeap())
+        return heap
+
+    def refresh(self, agent: Agent) -> None:
+        agent_id = agent.agent_id
+        # Offline agents leave the index, so nothing is waitlisted on them.
+        supported = set() if agent.offline else set(agent.supported_issue_types)
+        for issue_type in self._indexed_types.get(agent_id, set()) - supported:
+            with self._type_locks.for_key(issue_type):
+                self._by_load[issue_type].discard(agent_id)
+                self._by_backlog[issue_type].discard(agent_id)
+        load = len(agent.waitlist)
+        limit = self._limits.get(agent_id)
+        for issue_type in supported:
+            full = limit is not None and agent.waitlist.count(issue_type) >= limit
+            with self._type_locks.for_key(issue_type):
+                self._heap(self._by_load, issue_type).push(agent_id, (full, load, agent_id))
+                backlog = self._heap(self._by_backlog, issue_type)
+                if load:
+                    backlog.push(agent_id, (-load, agent_id))
+                else:
+                    backlog.discard(agent_id)
+        self._indexed_types[agent_id] = supported
+
+    def least_loaded(self, issue_type: ProductType) -> Optional[str]:
+        heap = self._by_load.get(issue_type)
+        if not heap:
+            return None
+        with self._type_locks.for_key(issue_type):
+            return heap.peek()
+
+    def most_backlogged(self, issue_type: ProductType) -> Optional[str]:
+        heap = self._by_backlog.get(issue_type)
+        if not heap:
+            return None
+        with self._type_locks.for_key(issue_type):
+            return heap.peek()
+
+    def backlog_of(self, agent_id: str) -> int:
+        for issue_type in self._indexed_types.get(agent_id, ()):
+            key = self._by_load[issue_type].key_of(agent_id)
+            if key is not None:
+                return key[1]
+        return 0
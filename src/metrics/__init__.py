@@ -0,0 +1,13 @@
+from .registry import DURATION_BUCKETS, LATENCY_BUCKETS, Counter, Gauge, Histogram, MetricsRegistry
+from .instrumentation import Instrumentation, instrument
+
+__all__ = [
+    "DURATION_BUCKETS",
+    "LATENCY_BUCKETS",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "Instrumentation",
+    "instrument",
+]
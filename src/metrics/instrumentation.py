@@ -0,0 +1,290 @@
+import time
+from types import MethodType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.data_models.agent import Agent
+from src.data_models.ids import ISSUE_PREFIX, parse_id
+from src.data_models.issue import Issue
+from src.enums import IssueEventType, IssueState, ProductType
+from src.events.event import IssueEvent
+from src.metrics.registry import DURATION_BUCKETS, MetricsRegistry
+
+_FACADE_METHODS = (
+    "create_user",
+    "delete_user",
+    "create_agent",
+    "update_agent",
+    "deactivate_agents_bulk",
+    "reactivate_agent",
+    "set_active_strategy",
+    "create_issue",
+    "create_issues_bulk",
+    "assign_issue",
+    "assign_issues_bulk",
+    "update_issue",
+    "resolve_issue",
+    "get_issues",
+    "page_issues",
+    "search_issues",
+    "view_agents_work_history",
+    "agent_work_history",
+    "agent_statistics",
+    "product_statistics",
+    "count_issues_by_state",
+    "list_pending_issues",
+    "list_resolved_issues",
+    "set_sla_policy",
+    "set_admission_policy",
+    "tick",
+)
+_SERVICE_METHODS = {
+    "user_service": ("create_user", "delete_user"),
+    "issue_service": ("ingest_issue", "ingest_issues_bulk", "update_issue", "get_issue", "page_issues", "assign_agent", "resolve_issue", "mark_waitlisted", "remove_issues"),
+    "agent_service": ("add_agent", "update_agent"),
+    "strategy_service": ("assign_from_pool", "assign_batch"),
+}
+
+
+def _bind(function: Callable[..., Any], owner: Any) -> MethodType:
+    return MethodType(function, owner)
+
+
+class _Hook:
+    # Hooks live in the instance __dict__ of the object they wrap. When that object is pickled
+    # (snapshots), a hook pickles as the plain class method so restored objects are uninstrumented.
+    __slots__ = ("_owner", "_name", "_call")
+
+    def __init__(self, owner: Any, name: str) -> None:
+        self._owner = owner
+        self._name = name
+        self._call = getattr(owner, name)
+
+    def __reduce__(self) -> tuple:
+        return (_bind, (getattr(type(self._owner), self._name), self._owner))
+
+
+class _TimedCall(_Hook):
+    __slots__ = ("_calls", "_errors", "_latency")
+
+    def __init__(self, owner: Any, name: str, calls, errors, latency) -> None:
+        super().__init__(owner, name)
+        self._calls = calls
+        self._errors = errors
+        self._latency = latency
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return self._call(*args, **kwargs)
+        except Exception:
+            self._errors.inc()
+            raise
+        finally:
+            self._latency.observe(time.perf_counter() - started)
+            self._calls.inc()
+
+
+class _InsertHook(_Hook):
+    __slots__ = ("_entered",)
+
+    def __init__(self, owner: Any, entered: Dict[int, float]) -> None:
+        super().__init__(owner, "_insert")
+        self._entered = entered
+
+    def __call__(self, issue: Issue) -> None:
+        self._call(issue)
+        self._entered[issue.number] = time.monotonic()
+
+
+class _StateHook(_Hook):
+    __slots__ = ("_entered", "_dwell", "_transitions")
+
+    def __init__(self, owner: Any, entered: Dict[int, float], dwell, transitions) -> None:
+        super().__init__(owner, "_set_state")
+        self._entered = entered
+        self._dwell = dwell
+        self._transitions = transitions
+
+    def __call__(self, issue: Issue, state: IssueState) -> None:
+        previous = issue.state
+        self._call(issue, state)
+        if issue.state is previous:
+            return
+        now = time.monotonic()
+        entered = self._entered.pop(issue.number, None)
+        if entered is not None:
+            self._dwell.labels(previous.value).observe(now - entered)
+        if state is not IssueState.CLOSED:
+            self._entered[issue.number] = now
+        self._transitions.labels(previous.value, state.value).inc()
+
+
+class _DetachedObserver:
+    def agent_changed(self, agent: Agent) -> None:
+        pass
+
+
+class _OccupancyTracker:
+    def __init__(self, transitions) -> None:
+        self._transitions = transitions
+        # agent_id -> [tracking since, busy seconds so far, busy since or None]
+        self._agents: Dict[str, List[Any]] = {}
+
+    def track(self, agent: Agent) -> None:
+        if self in agent.observers:
+            return
+        now = time.monotonic()
+        self._agents[agent.agent_id] = [now, 0.0, now if agent.is_occupied else None]
+        agent.observers.append(self)
+
+    def untrack(self, agent: Agent) -> None:
+        if self in agent.observers:
+            agent.observers.remove(self)
+        self._agents.pop(agent.agent_id, None)
+
+    def agent_changed(self, agent: Agent) -> None:
+        record = self._agents.get(agent.agent_id)
+        if record is None or (record[2] is not None) == agent.is_occupied:
+            return
+        now = time.monotonic()
+        if agent.is_occupied:
+            record[2] = now
+        else:
+            record[1] += now - record[2]
+            record[2] = None
+        self._transitions.labels("occupied" if agent.is_occupied else "free").inc()
+
+    def ratios(self) -> Dict[str, float]:
+        now = time.monotonic()
+        ratios = {}
+        for agent_id, (since, busy, busy_since) in self._agents.items():
+            elapsed = now - since
+            if busy_since is not None:
+                busy += now - busy_since
+            ratios[agent_id] = busy / elapsed if elapsed > 0 else 0.0
+        return ratios
+
+    def __reduce__(self) -> tuple:
+        return (_DetachedObserver, ())
+
+
+class _TrackingAddAgent(_Hook):
+    __slots__ = ("_tracker",)
+
+    def __init__(self, owner: Any, tracker: _OccupancyTracker) -> None:
+        super().__init__(owner, "add_agent")
+        self._tracker = tracker
+
+    def __call__(self, *args: Any, **kwargs: Any) -> str:
+        agent_id = self._call(*args, **kwargs)
+        agent = self._owner.get_agent(agent_id)
+        if agent:
+            self._tracker.track(agent)
+        return agent_id
+
+
+class Instrumentation:
+    def __init__(self, system: Any, registry: Optional[MetricsRegistry] = None, *, per_agent: bool = True) -> None:
+        self.system = system
+        self.registry = registry or MetricsRegistry()
+        self._per_agent = per_agent
+        self._hooks: List[Tuple[Any, str]] = []
+        self._entered: Dict[int, float] = {}
+        self._attached = False
+
+        registry = self.registry
+        self._calls = registry.counter("resolution_calls", "Calls per façade or service method.", ("layer", "operation"))
+        self._errors = registry.counter("resolution_call_errors", "Calls that raised.", ("layer", "operation"))
+        self._latency = registry.histogram("resolution_call_seconds", "Call latency in seconds.", ("layer", "operation"))
+        self._dwell = registry.histogram(
+            "resolution_issue_state_seconds", "Time an issue spent in a state before leaving it.", ("state",), DURATION_BUCKETS
+        )
+        self._transitions = registry.counter("resolution_issue_transitions", "Issue state transitions.", ("from", "to"))
+        self._issues = registry.gauge("resolution_issues", "Issues currently in each state.", ("state",))
+        self._waiting = registry.gauge("resolution_waiting_issues", "Waitlisted issues per product type.", ("issue_type",))
+        self._occupied = registry.gauge("resolution_agents_occupied", "Agents currently occupied.")
+        self._agents = registry.gauge("resolution_agents", "Registered agents.")
+        self._occupancy = registry.gauge(
+            "resolution_agent_occupancy_ratio", "Share of tracked time each agent was occupied.", ("agent_id",)
+        )
+        self._occupancy_mean = registry.gauge("resolution_agent_occupancy_mean", "Mean occupancy ratio across agents.")
+        occupancy_transitions = registry.counter(
+            "resolution_agent_occupancy_transitions", "Agent is_occupied transitions.", ("to",)
+        )
+        self._tracker = _OccupancyTracker(occupancy_transitions)
+
+    def attach(self) -> MetricsRegistry:
+        if self._attached:
+            return self.registry
+        system = self.system
+        for name in _FACADE_METHODS:
+            self._wrap(system, "facade", name)
+        for service_name, methods in _SERVICE_METHODS.items():
+            service = getattr(system, service_name)
+            for name in methods:
+                self._wrap(service, service_name, name)
+
+        issue_service = system.issue_service
+        self._install(issue_service, "_insert", _InsertHook(issue_service, self._entered))
+        self._install(issue_service, "_set_state", _StateHook(issue_service, self._entered, self._dwell, self._transitions))
+        issue_service.events.subscribe(self._forget_deleted)
+        for agent in system.agent_service.list_agents().values():
+            self._tracker.track(agent)
+        self._install(system.agent_service, "add_agent", _TrackingAddAgent(system.agent_service, self._tracker))
+        self.registry.add_collector(self.collect)
+        self._attached = True
+        return self.registry
+
+    def detach(self) -> None:
+        if not self._attached:
+            return
+        for owner, name in reversed(self._hooks):
+            owner.__dict__.pop(name, None)
+        self._hooks.clear()
+        self.system.issue_service.events.unsubscribe(self._forget_deleted)
+        for agent in self.system.agent_service.list_agents().values():
+            self._tracker.untrack(agent)
+        self.registry.remove_collector(self.collect)
+        self._entered.clear()
+        self._attached = False
+
+    def _forget_deleted(self, event: IssueEvent) -> None:
+        # Deleted issues never reach CLOSED, so the state hook would keep their entry forever.
+        if event.kind is IssueEventType.DELETED:
+            self._entered.pop(parse_id(ISSUE_PREFIX, event.issue_id), None)
+
+    def _wrap(self, owner: Any, layer: str, name: str) -> None:
+        if not hasattr(owner, name):
+            return
+        hook = _TimedCall(
+            owner, name, self._calls.labels(layer, name), self._errors.labels(layer, name), self._latency.labels(layer, name)
+        )
+        self._install(owner, name, hook)
+
+    def _install(self, owner: Any, name: str, hook: Callable[..., Any]) -> None:
+        setattr(owner, name, hook)
+        self._hooks.append((owner, name))
+
+    def collect(self) -> None:
+        for state, count in self.system.count_issues_by_state().items():
+            self._issues.labels(state.value).set(count)
+        waiting: Dict[ProductType, int] = {issue_type: 0 for issue_type in ProductType}
+        for issue in self.system.issue_service.get_issue({"status": IssueState.WAITING}):
+            waiting[issue.issue_type] += 1
+        for issue_type, count in waiting.items():
+            self._waiting.labels(issue_type.value).set(count)
+
+        agents = self.system.agent_service.list_agents()
+        self._agents.labels().set(len(agents))
+        self._occupied.labels().set(sum(1 for agent in agents.values() if agent.is_occupied))
+        ratios = self._tracker.ratios()
+        if self._per_agent:
+            for agent_id, ratio in ratios.items():
+                self._occupancy.labels(agent_id).set(round(ratio, 6))
+        self._occupancy_mean.labels().set(round(sum(ratios.values()) / len(ratios), 6) if ratios else 0.0)
+
+
+def instrument(system: Any, registry: Optional[MetricsRegistry] = None, *, per_agent: bool = True) -> Instrumentation:
+    instrumentation = Instrumentation(system, registry, per_agent=per_agent)
+    instrumentation.attach()
+    return instrumentation
@@ -0,0 +1,10 @@
+from .operation_log import OperationLog
+from .snapshot_store import SnapshotStore
+from .durable_system import DurableResolutionSystem, RecoveryStats
+
+__all__ = [
+    "OperationLog",
+    "SnapshotStore",
+    "DurableResolutionSystem",
+    "RecoveryStats",
+]
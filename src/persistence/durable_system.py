@@ -0,0 +1,322 @@
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.data_models.issue import Issue
+from src.events import IssueEvent
+from src.persistence.operation_log import OperationLog
+from src.persistence.snapshot_store import SnapshotStore
+from src.resolution_system import ResolutionSystem
+from src.scheduling import AdmissionPolicy, SlaPolicy
+
+_STATE_FIELDS = (
+    "user_service",
+    "agent_service",
+    "issue_service",
+    "strategy_service",
+    "_pending_issues",
+    "_resolved_issues",
+    "work_history",
+    "state_counts",
+    "lifecycle_stats",
+    "sla",
+    "admission",
+    "_waitlisted_on",
+    "archive",
+    "_archive_queue",
+    "scoring",
+)
+
+
+@dataclass
+class RecoveryStats:
+    snapshot_lsn: int
+    replayed_operations: int
+    seconds: float
+
+
+class DurableResolutionSystem(ResolutionSystem):
+    def __init__(
+        self,
+        directory: str,
+        *,
+        snapshot_every: int = 50_000,
+        group_size: int = 256,
+        group_interval: float = 0.05,
+        detect_duplicates: bool = False,
+    ) -> None:
+        super().__init__(detect_duplicates=detect_duplicates)
+        self._snapshots = SnapshotStore(directory)
+        self._log = OperationLog(os.path.join(directory, "operations.log"), group_size, group_interval)
+        self._snapshot_every = snapshot_every
+        self._operations_since_snapshot = 0
+        self._replaying = False
+        self._depth = 0
+        self._snapshot_stats: Dict[str, float] = {"snapshots": 0, "snapshot_bytes": 0, "snapshot_seconds": 0.0}
+        self.recovery_stats = self._recover()
+
+    def _recover(self) -> RecoveryStats:
+        started = time.perf_counter()
+        snapshot_lsn = 0
+        snapshot = self._snapshots.load_latest()
+        if snapshot:
+            snapshot_lsn, state = snapshot
+            for name in _STATE_FIELDS:
+                setattr(self, name, state[name])
+            self._wire_events()
+        replayed = 0
+        self._replaying = True
+        try:
+            for _, operation, args, kwargs in self._log.replay(after_lsn=snapshot_lsn):
+                try:
+                    getattr(self, operation)(*args, **kwargs)
+                except Exception:  # it raised live too, after the same partial changes
+                    pass
+                replayed += 1
+        finally:
+            self._replaying = False
+        self._log.last_lsn = max(self._log.last_lsn, snapshot_lsn)
+        self._operations_since_snapshot = replayed
+        return RecoveryStats(snapshot_lsn, replayed, time.perf_counter() - started)
+
+    @contextmanager
+    def _logged(self, operation: str, *args: Any, **kwargs: Any) -> Iterator[None]:
+        # The call is logged before it mutates anything, so one that changes state and then
+        # raises is replayed too (and raises the same way). Façade calls made from inside a
+        # logged call are not logged again: replaying the outer call repeats them.
+        outermost = not self._depth and not self._replaying
+        if outermost:
+            self._log.append(operation, args, kwargs)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if outermost:
+                self._operations_since_snapshot += 1
+        if outermost and self._snapshot_every and self._operations_since_snapshot >= self._snapshot_every:
+            self.checkpoint()
+
+    def checkpoint(self) -> int:
+        started = time.perf_counter()
+        self._log.commit()
+        lsn = self._log.last_lsn
+        size = self._snapshots.save({name: getattr(self, name) for name in _STATE_FIELDS}, lsn)
+        self._log.truncate()
+        self._operations_since_snapshot = 0
+        self._snapshot_stats["snapshots"] += 1
+        self._snapshot_stats["snapshot_bytes"] = size
+        self._snapshot_stats["snapshot_seconds"] += time.perf_counter() - started
+        return lsn
+
+    def sync(self) -> None:
+        self._log.commit()
+
+    def close(self) -> None:
+        self._log.close()
+
+    def log_stats(self) -> Dict[str, float]:
+        return {**self._log.stats(), **self._snapshot_stats}
+
+    def create_user(self, name: str, email: str, active_products: Iterable[Any]) -> str:
+        active_products = list(active_products)
+        with self._logged("create_user", name, email, active_products):
+            return super().create_user(name, email, active_products)
+
+    def delete_user(self, user_id: str) -> bool:
+        with self._logged("delete_user", user_id):
+            return super().delete_user(user_id)
+
+    def create_agent(self, agent_email: str, agent_name: str, issue_types: Iterable[Any]) -> str:
+        issue_types = list(issue_types)
+        with self._logged("create_agent", agent_email, agent_name, issue_types):
+            return super().create_agent(agent_email, agent_name, issue_types)
+
+    def update_agent(
+        self,
+        agent_id: str,
+        *,
+        issue_types: Optional[Iterable[Any]] = None,
+        ratings: Optional[Dict[Any, float]] = None,
+        capacity: Optional[Dict[Any, int]] = None,
+        max_concurrent: Optional[int] = None,
+    ) -> bool:
+        issue_types = list(issue_types) if issue_types is not None else None
+        with self._logged(
+            "update_agent", agent_id, issue_types=issue_types, ratings=ratings, capacity=capacity, max_concurrent=max_concurrent
+        ):
+            return super().update_agent(
+                agent_id, issue_types=issue_types, ratings=ratings, capacity=capacity, max_concurrent=max_concurrent
+            )
+
+    def deactivate_agent(self, agent_id: str, *, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        with self._logged("deactivate_agent", agent_id, now=now):
+            return super().deactivate_agent(agent_id, now=now)
+
+    def deactivate_agents_bulk(self, agent_ids: Iterable[str], *, now: Optional[float] = None) -> Dict[str, str]:
+        agent_ids = list(agent_ids)
+        now = time.time() if now is None else now
+        with self._logged("deactivate_agents_bulk", agent_ids, now=now):
+            return super().deactivate_agents_bulk(agent_ids, now=now)
+
+    def reactivate_agent(self, agent_id: str) -> bool:
+        with self._logged("reactivate_agent", agent_id):
+            return super().reactivate_agent(agent_id)
+
+    def set_active_strategy(self, strategy_id: str) -> bool:
+        with self._logged("set_active_strategy", strategy_id):
+            return super().set_active_strategy(strategy_id)
+
+    def enable_scoring(self) -> None:
+        with self._logged("enable_scoring"):
+            super().enable_scoring()
+
+    def create_scored_strategy(self, scorer: str) -> str:
+        with self._logged("create_scored_strategy", scorer):
+            return super().create_scored_strategy(scorer)
+
+    def set_sla_policy(
+        self,
+        issue_type: Any,
+        *,
+        priority: int = 0,
+        resolve_within: Optional[float] = None,
+        at_risk_fraction: float = 0.8,
+        escalation: int = 10,
+    ) -> SlaPolicy:
+        with self._logged(
+            "set_sla_policy",
+            issue_type,
+            priority=priority,
+            resolve_within=resolve_within,
+            at_risk_fraction=at_risk_fraction,
+            escalation=escalation,
+        ):
+            return super().set_sla_policy(
+                issue_type,
+                priority=priority,
+                resolve_within=resolve_within,
+                at_risk_fraction=at_risk_fraction,
+                escalation=escalation,
+            )
+
+    def tick(self, now: Optional[float] = None) -> List[IssueEvent]:
+        # The clock reading is logged so replay fires exactly the same timers and readmits the
+        # same deferred issues. Ticks are also the log's flush deadline: a tail shorter than a
+        # group is committed once it has waited group_interval, even if no append follows.
+        now = time.time() if now is None else now
+        with self._logged("tick", now):
+            result = super().tick(now)
+        self._log.commit_due()
+        return result
+
+    def set_admission_policy(
+        self,
+        issue_type: Any,
+        *,
+        max_waiting: Optional[int] = None,
+        max_per_agent: Optional[int] = None,
+        overflow: str = "defer",
+        retry_after: float = 30.0,
+        fallback_agents: Iterable[str] = (),
+    ) -> AdmissionPolicy:
+        fallback_agents = list(fallback_agents)
+        with self._logged(
+            "set_admission_policy",
+            issue_type,
+            max_waiting=max_waiting,
+            max_per_agent=max_per_agent,
+            overflow=overflow,
+            retry_after=retry_after,
+            fallback_agents=fallback_agents,
+        ):
+            return super().set_admission_policy(
+                issue_type,
+                max_waiting=max_waiting,
+                max_per_agent=max_per_agent,
+                overflow=overflow,
+                retry_after=retry_after,
+                fallback_agents=fallback_agents,
+            )
+
+    def set_agent_waitlist_limit(self, agent_id: str, limit: Optional[int]) -> bool:
+        with self._logged("set_agent_waitlist_limit", agent_id, limit):
+            return super().set_agent_waitlist_limit(agent_id, limit)
+
+    def set_rate_limit(self, rate: Optional[float], burst: int = 10) -> None:
+        with self._logged("set_rate_limit", rate, burst):
+            super().set_rate_limit(rate, burst)
+
+    def enable_archive(
+        self,
+        directory: str,
+        *,
+        min_age: float = 86_400.0,
+        cache_size: int = 4_096,
+        segment_bytes: int = 64 << 20,
+        now: Optional[float] = None,
+    ) -> None:
+        now = time.time() if now is None else now
+        with self._logged(
+            "enable_archive", directory, min_age=min_age, cache_size=cache_size, segment_bytes=segment_bytes, now=now
+        ):
+            super().enable_archive(directory, min_age=min_age, cache_size=cache_size, segment_bytes=segment_bytes, now=now)
+
+    def archive_closed(self, now: Optional[float] = None, *, batch_size: int = 10_000) -> int:
+        now = time.time() if now is None else now
+        with self._logged("archive_closed", now, batch_size=batch_size):
+            return super().archive_closed(now, batch_size=batch_size)
+
+    def _archive_batch(self, batch: List[Issue]) -> int:
+        # The archive on disk already holds what the replayed passes wrote, or newer copies, so
+        # replay only drops the hot copies instead of appending them again.
+        return self.issue_service.archive_issues(batch, rewrite=not self._replaying)
+
+    def create_issue(
+        self,
+        transaction_id: str,
+        issue_type: Any,
+        subject: str,
+        description: str,
+        email: str,
+        *,
+        priority: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> str:
+        now = time.time() if now is None else now
+        with self._logged("create_issue", transaction_id, issue_type, subject, description, email, priority=priority, now=now):
+            return super().create_issue(transaction_id, issue_type, subject, description, email, priority=priority, now=now)
+
+    def create_issues_bulk(
+        self, issues: Iterable[Tuple[str, Any, str, str, str]], *, now: Optional[float] = None
+    ) -> List[str]:
+        issues = list(issues)
+        now = time.time() if now is None else now
+        with self._logged("create_issues_bulk", issues, now=now):
+            return super().create_issues_bulk(issues, now=now)
+
+    def update_issue(
+        self, issue_id: str, status: Any, resolution: Optional[str] = None, *, now: Optional[float] = None
+    ) -> bool:
+        now = time.time() if now is None else now
+        with self._logged("update_issue", issue_id, status, resolution, now=now):
+            return super().update_issue(issue_id, status, resolution, now=now)
+
+    def resolve_issue(self, issue_id: str, resolution: str, *, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        with self._logged("resolve_issue", issue_id, resolution, now=now):
+            return super().resolve_issue(issue_id, resolution, now=now)
+
+    def assign_issue(self, issue_id: str, *, now: Optional[float] = None) -> str:
+        now = time.time() if now is None else now
+        with self._logged("assign_issue", issue_id, now=now):
+            return super().assign_issue(issue_id, now=now)
+
+    def assign_issues_bulk(self, issue_ids: Iterable[str], *, now: Optional[float] = None) -> Dict[str, str]:
+        issue_ids = list(issue_ids)
+        now = time.time() if now is None else now
+        with self._logged("assign_issues_bulk", issue_ids, now=now):
+            return super().assign_issues_bulk(issue_ids, now=now)
@@ -0,0 +1,41 @@
+import os
+import pickle
+import zlib
+from typing import Any, Optional, Tuple
+
+_PREFIX = "snapshot-"
+_SUFFIX = ".bin"
+
+
+class SnapshotStore:
+    def __init__(self, directory: str, keep: int = 2) -> None:
+        self._directory = directory
+        self._keep = keep
+        os.makedirs(directory, exist_ok=True)
+
+    def _snapshots(self) -> list:
+        names = [name for name in os.listdir(self._directory) if name.startswith(_PREFIX) and name.endswith(_SUFFIX)]
+        return sorted(names, key=lambda name: int(name[len(_PREFIX):-len(_SUFFIX)]))
+
+    def save(self, state: Any, lsn: int) -> int:
+        data = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        path = os.path.join(self._directory, f"{_PREFIX}{lsn:020d}{_SUFFIX}")
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+        for name in self._snapshots()[:-self._keep]:
+            os.remove(os.path.join(self._directory, name))
+        return len(data)
+
+    def load_latest(self) -> Optional[Tuple[int, Any]]:
+        for name in reversed(self._snapshots()):
+            try:
+                with open(os.path.join(self._directory, name), "rb") as handle:
+                    state = pickle.loads(zlib.decompress(handle.read()))
+            except (OSError, zlib.error, pickle.UnpicklingError, EOFError):
+                continue
+            return int(name[len(_PREFIX):-len(_SUFFIX)]), state
+        return None
@@ -1,27 +1,87 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
+from src.concurrency.locks import StripedLock
 from src.data_models.agent import Agent
-from src.enums import IssueState, ProductType, StrategyType
+from src.data_models.ids import ISSUE_PREFIX
+from src.enums import IssueEventType, IssueState, ProductType, StrategyType
 from src.data_models.issue import Issue
+from src.events import EventBus, IssueEvent, StateCountView, WorkHistoryView
+from src.indexes.issue_registry import IssueRegistry
+from src.scheduling.admission import AdmissionController, AdmissionPolicy
+from src.scheduling.sla import SlaMonitor, SlaPolicy
+from src.scoring import AgentFeatureMatrix
+from src.stats.lifecycle import LifecycleStatsView
 from src.services import AgentService, IssueService, RoutingStrategyService, UserService
+from src.storage import ArchiveQueue, IssueArchive
 
 
 class ResolutionSystem:
-    def __init__(self) -> None:
-        self.user_service = UserService()
-        self.agent_service = AgentService()
-        self.issue_service = IssueService()
+    def __init__(
+        self,
+        thread_safe: bool = False,
+        *,
+        history_window: int = 1000,
+        detect_duplicates: bool = False,
+        idempotency_capacity: int = 65_536,
+        idempotency_ttl: float = 3_600.0,
+    ) -> None:
+        # One issue store; UserService reads the same dict that IssueService indexes.
+        self._thread_safe = thread_safe
+        self.issue_service = IssueService(
+            thread_safe,
+            detect_duplicates=detect_duplicates,
+            idempotency_capacity=idempotency_capacity,
+            idempotency_ttl=idempotency_ttl,
+        )
+        self.user_service = UserService(thread_safe, store=self.issue_service.store)
+        self.agent_service = AgentService(thread_safe)
         self.strategy_service = RoutingStrategyService()
 
         # Initial strategies setup
         default_strategy_id = self.strategy_service.create_strategy(StrategyType.FCFS)
         self.strategy_service.create_strategy(StrategyType.RATING)
+        self.strategy_service.create_strategy(StrategyType.CAPACITY)
         self.strategy_service.set_active_strategy(default_strategy_id)
 
-        self._pending_issues: List[str] = []
-        self._resolved_issues: List[str] = []
+        self._pending_issues = IssueRegistry(thread_safe)
+        self._resolved_issues = IssueRegistry(thread_safe)
+        # Lock order is agent -> issue, and at most one issue lock is held at a time.
+        self._issue_locks = StripedLock(thread_safe)
+        self.sla = SlaMonitor()
+        self.admission = AdmissionController(thread_safe)
+        # issue number -> agent whose waitlist holds it, so an escalation can pull it back out.
+        self._waitlisted_on: Dict[int, str] = {}
+
+        self.work_history = WorkHistoryView(history_window, thread_safe=thread_safe)
+        self.state_counts = StateCountView()
+        self.lifecycle_stats = LifecycleStatsView()
+        # Cold tier for old closed issues, off until enable_archive.
+        self.archive: Optional[IssueArchive] = None
+        self._archive_queue: Optional[ArchiveQueue] = None
+        # Agent feature matrix for scored strategies, off until enable_scoring.
+        self.scoring: Optional[AgentFeatureMatrix] = None
+        self._wire_events()
+
+    def _wire_events(self) -> None:
+        # Materialized views follow the issue event stream instead of being recomputed on read.
+        events = self.issue_service.events
+        events.subscribe(self.user_service.apply_event)
+        events.subscribe(self.work_history.apply)
+        events.subscribe(self.state_counts.apply)
+        events.subscribe(self.lifecycle_stats.apply)
+        events.subscribe(self.admission.apply)
+        if self._archive_queue is not None:
+            events.subscribe(self._archive_queue.apply)
+        if self.scoring is not None:
+            events.subscribe(self.scoring.apply)
+
+    @property
+    def events(self) -> EventBus:
+        return self.issue_service.events
 
     # User functions
     def create_user(self, name: str, email: str, active_products: Iterable[Any]) -> str:
@@ -29,7 +89,48 @@ class ResolutionSystem:
         return user_id
 
     def delete_user(self, user_id: str) -> bool:
-        return self.user_service.delete_user(user_id)
+        # Cascades over the user's k issues only: waitlists, agent slots, registries, SLA timers
+        # and issue indexes are cleaned before the user record goes.
+        if not self.user_service.get_user_details(user_id):
+            return False
+        issues = list(self.issue_service.iter_issues_for_user(user_id))
+        released: Dict[str, Agent] = {}
+        for issue in issues:
+            agent = self._detach_issue(issue)
+            if agent:
+                released[agent.agent_id] = agent
+        self.issue_service.remove_issues(issues)
+        deleted = self.user_service.delete_user(user_id)
+        for agent in released.values():
+            with self.agent_service.lock_for(agent.agent_id):
+                self._assign_next_from_waitlist(agent)
+        return deleted
+
+    def _detach_issue(self, issue: Issue) -> Optional[Agent]:
+        holder_id = self._waitlisted_on.get(issue.number)
+        holder = self.agent_service.get_agent(holder_id) if holder_id else None
+        if holder:
+            with self.agent_service.lock_for(holder.agent_id):
+                with self._issue_locks.for_key(issue.number):
+                    holder.remove_from_waitlist(issue.issue_id)
+                    self._waitlisted_on.pop(issue.number, None)
+        released: Optional[Agent] = None
+        while issue.agent_id:
+            agent_id = issue.agent_id
+            agent = self.agent_service.get_agent(agent_id)
+            if not agent:
+                break
+            with self.agent_service.lock_for(agent_id):
+                with self._issue_locks.for_key(issue.number):
+                    if issue.agent_id != agent_id:
+                        continue
+                    if agent.record_resolution(issue.issue_id):
+                        released = agent
+                    break
+        self._pending_issues.discard(issue.issue_id)
+        self._resolved_issues.discard(issue.issue_id)
+        self.sla.unwatch(issue.number)
+        return released
 
     def get_user_details(self, user_id: str):
         return self.user_service.get_user_details(user_id)
@@ -39,86 +140,611 @@ class ResolutionSystem:
         agent_id = self.agent_service.add_agent(agent_email, agent_name, issue_types)
         return agent_id
 
-    def update_agent(self, agent_id: str, *, issue_types: Optional[Iterable[Any]] = None, ratings: Optional[Dict[Any, float]] = None) -> bool:
-        return self.agent_service.update_agent(agent_id, issue_types=issue_types, ratings=ratings)
+    def update_agent(
+        self,
+        agent_id: str,
+        *,
+        issue_types: Optional[Iterable[Any]] = None,
+        ratings: Optional[Dict[Any, float]] = None,
+        capacity: Optional[Dict[Any, int]] = None,
+        max_concurrent: Optional[int] = None,
+    ) -> bool:
+        updated = self.agent_service.update_agent(
+            agent_id, issue_types=issue_types, ratings=ratings, capacity=capacity, max_concurrent=max_concurrent
+        )
+        agent = self.agent_service.get_agent(agent_id)
+        if updated and agent:
+            # New slots (or types) can take waitlisted work right away.
+            with self.agent_service.lock_for(agent_id):
+                self._assign_next_from_waitlist(agent)
+        return updated
+
+    def deactivate_agent(self, agent_id: str, *, now: Optional[float] = None) -> bool:
+        agent = self.agent_service.get_agent(agent_id)
+        if not agent or agent.offline:
+            return False
+        self.deactivate_agents_bulk([agent_id], now=now)
+        return True
+
+    def deactivate_agents_bulk(self, agent_ids: Iterable[str], *, now: Optional[float] = None) -> Dict[str, str]:
+        # Takes the agents offline and reroutes everything they held in one pass over the k
+        # stranded issues, oldest issue first: a free agent from the pool if there is one, else the
+        # least loaded waitlist, each an O(log n) index step. Waitlisted issues keep their original
+        # enqueue time, so their order against each other and against other waiting work holds;
+        # in-flight issues count as enqueued at the head of their agent's waitlist. Issues no online
+        # agent can take join the deferred queue until one comes back.
+        now = time.time() if now is None else now
+        stranded: List[Tuple[Issue, float]] = []
+        for agent_id in dict.fromkeys(agent_ids):
+            agent = self.agent_service.get_agent(agent_id)
+            if not agent:
+                continue
+            with self.agent_service.lock_for(agent_id):
+                if agent.offline:
+                    continue
+                waiting, active = agent.deactivate()
+                head = min((enqueued_at for _, _, enqueued_at in waiting), default=now)
+                for issue_id, _, enqueued_at in waiting:
+                    issue = self.issue_service.get_issue_by_id(issue_id)
+                    if issue is None:
+                        continue
+                    with self._issue_locks.for_key(issue.number):
+                        if self._waitlisted_on.get(issue.number) == agent_id:
+                            del self._waitlisted_on[issue.number]
+                        if not issue.agent_id and issue.state is not IssueState.CLOSED:
+                            stranded.append((issue, enqueued_at))
+                for issue_id in active:
+                    issue = self.issue_service.get_issue_by_id(issue_id)
+                    if issue is None:
+                        continue
+                    with self._issue_locks.for_key(issue.number):
+                        if issue.agent_id == agent_id and self.issue_service.release_agent(issue_id):
+                            stranded.append((issue, head))
+        stranded.sort(key=lambda entry: entry[0].number)
+        return {issue.issue_id: self._reroute(issue, enqueued_at) for issue, enqueued_at in stranded}
+
+    def _reroute(self, issue: Issue, enqueued_at: float) -> str:
+        # Already admitted once, so neither admission limits nor duplicate clustering apply.
+        while True:
+            agent_id = self.strategy_service.assign_from_pool(issue, self.agent_service.availability)
+            if not agent_id:
+                break
+            result = self._claim(issue, agent_id)
+            if result:
+                return result
+        while True:
+            agent_id = self.agent_service.waitlist_load.least_loaded(issue.issue_type)
+            agent = self.agent_service.get_agent(agent_id) if agent_id else None
+            if not agent:
+                self.admission.defer(issue.number, issue.issue_type)
+                return f"Issue {issue.issue_id} deferred: no online agent handles {issue.issue_type.value}"
+            with self.agent_service.lock_for(agent.agent_id):
+                if agent.offline or issue.issue_type not in agent.supported_issue_types:
+                    continue
+                with self._issue_locks.for_key(issue.number):
+                    if issue.agent_id:
+                        return f"Issue {issue.issue_id} is already assigned to agent {issue.agent_id}"
+                    agent.enqueue_issue(issue.issue_id, issue.issue_type, issue.priority, enqueued_at)
+                    self._waitlisted_on[issue.number] = agent.agent_id
+                    self.issue_service.mark_waitlisted(issue.issue_id)
+            return f"Issue {issue.issue_id} added to waitlist of Agent {agent.agent_id}"
+
+    def reactivate_agent(self, agent_id: str) -> bool:
+        agent = self.agent_service.get_agent(agent_id)
+        if not agent or not agent.offline:
+            return False
+        with self.agent_service.lock_for(agent_id):
+            agent.reactivate()
+            # Back online with free slots: take over the most backlogged work right away.
+            self._assign_next_from_waitlist(agent)
+        return True
+
+    # Strategy functions
+    def set_active_strategy(self, strategy_id: str) -> bool:
+        return self.strategy_service.set_active_strategy(strategy_id)
+
+    def enable_scoring(self) -> None:
+        # Needs numpy. Keeps an agent x feature matrix current so scored strategies pick agents
+        # with one vectorized pass; agents created later are added as they arrive.
+        if self.scoring is not None:
+            raise ValueError("Scoring is already enabled")
+        self.scoring = AgentFeatureMatrix(self._thread_safe)
+        self.agent_service.add_index(self.scoring)
+        self.strategy_service.attach_scoring(self.scoring)
+        self.events.subscribe(self.scoring.apply)
+
+    def create_scored_strategy(self, scorer: str) -> str:
+        return self.strategy_service.create_strategy(StrategyType.SCORED, scorer=scorer)
+
+    # SLA functions
+    def set_sla_policy(
+        self,
+        issue_type: Any,
+        *,
+        priority: int = 0,
+        resolve_within: Optional[float] = None,
+        at_risk_fraction: float = 0.8,
+        escalation: int = 10,
+    ) -> SlaPolicy:
+        policy = SlaPolicy(priority, resolve_within, at_risk_fraction, escalation)
+        self.sla.set_policy(issue_type, policy)
+        return policy
+
+    def tick(self, now: Optional[float] = None) -> List[IssueEvent]:
+        # Fires due SLA timers: an at-risk issue that is still waiting is escalated and rerouted,
+        # a breach is only reported. Closed issues never fire because closing cancels their timers.
+        now = time.time() if now is None else now
+        fired: List[IssueEvent] = []
+        for kind, number in self.sla.advance(now):
+            issue = self.issue_service.get_issue_by_id(f"{ISSUE_PREFIX}{number}")
+            if issue is None or issue.state == IssueState.CLOSED:
+                continue
+            if kind is IssueEventType.SLA_AT_RISK and not issue.agent_id:
+                self._escalate(issue, now)
+            event = self.issue_service.record_sla_event(issue.issue_id, kind)
+            if event:
+                fired.append(event)
+        self._readmit_deferred(now)
+        return fired
+
+    # Admission functions
+    def set_admission_policy(
+        self,
+        issue_type: Any,
+        *,
+        max_waiting: Optional[int] = None,
+        max_per_agent: Optional[int] = None,
+        overflow: str = "defer",
+        retry_after: float = 30.0,
+        fallback_agents: Iterable[str] = (),
+    ) -> AdmissionPolicy:
+        policy = AdmissionPolicy(max_waiting, max_per_agent, overflow, retry_after, tuple(fallback_agents))
+        self.admission.set_policy(issue_type, policy)
+        return policy
+
+    def set_agent_waitlist_limit(self, agent_id: str, limit: Optional[int]) -> bool:
+        if not self.agent_service.get_agent(agent_id):
+            return False
+        self.admission.set_agent_limit(agent_id, limit)
+        with self.agent_service.lock_for(agent_id):
+            self.agent_service.waitlist_load.set_limit(self.agent_service.get_agent(agent_id), limit)
+        return True
+
+    def set_rate_limit(self, rate: Optional[float], burst: int = 10) -> None:
+        # Issues per second each user email may open, with bursts of up to `burst`; None lifts it.
+        self.admission.set_rate_limit(rate, burst)
+
+    def admission_stats(self) -> Dict[str, int]:
+        return self.admission.stats()
+
+    def _readmit_deferred(self, now: Optional[float] = None) -> int:
+        # Deferred issues go back through assign_issue, oldest first, while their type has room.
+        readmitted = 0
+        for issue_type in self.admission.deferred_types():
+            while True:
+                agent_id = self.agent_service.waitlist_load.least_loaded(issue_type)
+                agent = self.agent_service.get_agent(agent_id) if agent_id else None
+                if not agent or not self.admission.has_room(issue_type, agent.agent_id, agent.waitlist.count(issue_type)):
+                    break
+                number = self.admission.next_deferred(lambda candidate: candidate is issue_type)
+                if number is None:
+                    break
+                issue = self.issue_service.get_issue_by_id(f"{ISSUE_PREFIX}{number}")
+                if issue is None or issue.agent_id or issue.state is IssueState.CLOSED:
+                    continue
+                self.assign_issue(issue.issue_id, now=now)
+                readmitted += 1
+        return readmitted
+
+    # Archive functions
+    def enable_archive(
+        self,
+        directory: str,
+        *,
+        min_age: float = 86_400.0,
+        cache_size: int = 4_096,
+        segment_bytes: int = 64 << 20,
+        now: Optional[float] = None,
+    ) -> None:
+        # Issues closed at least min_age seconds ago move to disk on each archive_closed() pass.
+        # Issues already closed count as closed now.
+        if self.archive is not None:
+            raise ValueError("The archive is already enabled")
+        now = time.time() if now is None else now
+        self.archive = IssueArchive(
+            directory, segment_bytes=segment_bytes, cache_size=cache_size, thread_safe=self._thread_safe
+        )
+        self._archive_queue = ArchiveQueue(min_age)
+        for issue in self.issue_service.get_issue({"status": IssueState.CLOSED}):
+            self._archive_queue.push(issue.number, now)
+        self.issue_service.attach_archive(self.archive)
+        self.user_service.attach_archive(self.archive)
+        self.events.subscribe(self._archive_queue.apply)
+
+    def archive_closed(self, now: Optional[float] = None, *, batch_size: int = 10_000) -> int:
+        if self.archive is None:
+            return 0
+        now = time.time() if now is None else now
+        store = self.issue_service.store
+        archived = 0
+        batch: List[Issue] = []
+        for number in self._archive_queue.due(now):
+            issue = store.get(number)
+            if issue is not None:
+                batch.append(issue)
+            if len(batch) == batch_size:
+                archived += self._archive_batch(batch)
+                batch = []
+        if batch:
+            archived += self._archive_batch(batch)
+        return archived
+
+    def _archive_batch(self, batch: List[Issue]) -> int:
+        return self.issue_service.archive_issues(batch)
+
+    def archive_stats(self) -> Dict[str, int]:
+        if self.archive is None:
+            return {}
+        return {**self.archive.stats(), "archived": len(self.archive), "queued": len(self._archive_queue)}
+
+    def _escalate(self, issue: Issue, now: Optional[float] = None) -> None:
+        self.issue_service.set_priority(issue.issue_id, issue.priority + self.sla.policy(issue.issue_type).escalation)
+        holder_id = self._waitlisted_on.get(issue.number)
+        holder = self.agent_service.get_agent(holder_id) if holder_id else None
+        if not holder:
+            # Not routed yet: the raised priority applies once it is.
+            return
+        with self.agent_service.lock_for(holder.agent_id):
+            with self._issue_locks.for_key(issue.number):
+                if issue.agent_id or self._waitlisted_on.get(issue.number) != holder.agent_id:
+                    return
+                holder.remove_from_waitlist(issue.issue_id)
+                del self._waitlisted_on[issue.number]
+        # Rerouting prefers any agent free right now, else re-queues at the new priority.
+        self.assign_issue(issue.issue_id, now=now)
 
     # Issue functions
-    def create_issue(self, transaction_id: str, issue_type: Any, subject: str, description: str, email: str) -> str:
+    def create_issue(
+        self,
+        transaction_id: str,
+        issue_type: Any,
+        subject: str,
+        description: str,
+        email: str,
+        *,
+        priority: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> str:
+        now = time.time() if now is None else now
+        self.admission.throttle({email: 1}, now)
         user = self.user_service.get_user_details(email)
         if user is None:
             user_id = self.user_service.create_user(name=email, email=email, active_products=[issue_type])
         else:
             user_id = user.user_id
 
-        issue_id = self.issue_service.create_issue(transaction_id, issue_type, subject, description, user_id, email)
+        default_priority, deadline = self.sla.terms(issue_type, now)
+        issue_id, created = self.issue_service.ingest_issue(
+            transaction_id,
+            issue_type,
+            subject,
+            description,
+            user_id,
+            email,
+            default_priority if priority is None else priority,
+            deadline,
+            now,
+        )
+        # A retried transaction gets its existing issue back, already watched and registered.
+        if not created:
+            return issue_id
         issue = self.issue_service.get_issue_by_id(issue_id)
         if issue:
-            self.user_service.add_issue(issue)
-        self._pending_issues.append(issue_id)
+            self.sla.watch(issue, now)
+        self._pending_issues.add(issue_id)
         return issue_id
 
-    def update_issue(self, issue_id: str, status: Any, resolution: Optional[str] = None) -> bool:
+    def update_issue(
+        self, issue_id: str, status: Any, resolution: Optional[str] = None, *, now: Optional[float] = None
+    ) -> bool:
         issue = self.issue_service.get_issue_by_id(issue_id)
         if not issue:
             return False
         target_state = IssueState.from_value(status)
-        if target_state == IssueState.CLOSED and not issue.agent_id:
-            return False
-        updated = self.issue_service.update_issue(issue_id, status, resolution)
-        if not updated:
-            return False
-        issue = self.issue_service.get_issue_by_id(issue_id)
-        if issue and issue.state == IssueState.CLOSED:
-            self._mark_issue_closed(issue)
-        return True
-
-    def resolve_issue(self, issue_id: str, resolution: str) -> bool:
+        if target_state != IssueState.CLOSED:
+            with self._issue_locks.for_key(issue.number):
+                return self.issue_service.update_issue(issue_id, status, resolution, now=now)
+        return self._close_issue(
+            issue, lambda: self.issue_service.update_issue(issue_id, status, resolution, now=now), now
+        )
+
+    def resolve_issue(self, issue_id: str, resolution: str, *, now: Optional[float] = None) -> bool:
+        # `now` stamps the close, which is what the archive ages issues by.
         issue = self.issue_service.get_issue_by_id(issue_id)
-        if not issue or not issue.agent_id:
-            return False
-        resolved = self.issue_service.resolve_issue(issue_id, resolution)
-        if not resolved:
+        if not issue:
             return False
-        issue = self.issue_service.get_issue_by_id(issue_id)
-        if issue:
-            self._mark_issue_closed(issue)
-        return True
-
-    def assign_issue(self, issue_id: str) -> str:
+        return self._close_issue(issue, lambda: self.issue_service.resolve_issue(issue_id, resolution, now=now), now)
+
+    def _close_issue(self, issue: Issue, close: Callable[[], bool], now: Optional[float] = None) -> bool:
+        while True:
+            agent_id = issue.agent_id
+            if not agent_id:
+                return False
+            with self.agent_service.lock_for(agent_id):
+                with self._issue_locks.for_key(issue.number):
+                    if issue.agent_id != agent_id:
+                        continue
+                    if not close():
+                        return False
+                    released_agent = self._mark_issue_closed(issue)
+                if released_agent:
+                    self._assign_next_from_waitlist(released_agent, now)
+                return True
+
+    def create_issues_bulk(
+        self, issues: Iterable[Tuple[str, Any, str, str, str]], *, now: Optional[float] = None
+    ) -> List[str]:
+        now = time.time() if now is None else now
+        product_types: Dict[Any, ProductType] = {}
+        user_ids: Dict[str, str] = {}
+        rows = []
+        for transaction_id, issue_type, subject, description, email in issues:
+            product_type = product_types.get(issue_type)
+            if product_type is None:
+                product_type = product_types[issue_type] = ProductType.from_value(issue_type)
+            rows.append((transaction_id, product_type, subject, description, email))
+        self.admission.throttle(Counter(email for *_, email in rows), now)
+        for _, product_type, _, _, email in rows:
+            if email not in user_ids:
+                user_ids[email] = self.user_service.create_user(name=email, email=email, active_products=[product_type])
+
+        terms = {product_type: self.sla.terms(product_type, now) for product_type in product_types.values()}
+        results = self.issue_service.ingest_issues_bulk(
+            (
+                (transaction_id, product_type, subject, description, user_ids[email], email, *terms[product_type])
+                for transaction_id, product_type, subject, description, email in rows
+            ),
+            now=now,
+        )
+        for issue_id, created in results:
+            if not created:
+                continue
+            issue = self.issue_service.get_issue_by_id(issue_id)
+            if issue:
+                self.sla.watch(issue, now)
+            self._pending_issues.add(issue_id)
+        return [issue_id for issue_id, _ in results]
+
+    def assign_issue(self, issue_id: str, *, now: Optional[float] = None) -> str:
         issue = self.issue_service.get_issue_by_id(issue_id)
         if not issue:
             return f"Issue {issue_id} not found"
-        if issue.agent_id:
-            return f"Issue {issue_id} is already assigned to agent {issue.agent_id}"
-
-        agent_map = self.agent_service.list_agents()
-        agent_id = self.strategy_service.assign_agent(issue, agent_map.values())
-        if agent_id:
-            agent = agent_map.get(agent_id)
-            if agent:
-                agent.record_assignment(issue_id)
-            self.issue_service.assign_agent(issue_id, agent_id)
-            if issue_id not in self._pending_issues:
-                self._pending_issues.append(issue_id)
-            return f"Issue {issue_id} assigned to agent {agent_id}"
-
-        supporting_agents = [
-            agent for agent in agent_map.values() if issue.issue_type in agent.supported_issue_types
-        ]
-        if not supporting_agents:
-            return f"No agent available to handle issue type {issue.issue_type.value}"
-
-        supporting_agents.sort(key=lambda agent: (len(agent.waitlist), agent.agent_id))
-        chosen_agent = supporting_agents[0]
-        chosen_agent.enqueue_issue(issue_id)
-        self.issue_service.mark_waitlisted(issue_id)
-        return f"Issue {issue_id} added to waitlist of Agent {chosen_agent.agent_id}"
+        preferred = self._primary_agent(issue)
+        if preferred:
+            # A near-duplicate goes to whoever already handles its primary, now or next.
+            return self._claim(issue, preferred.agent_id) or self._waitlist_issue(issue, preferred, now=now)
+        while True:
+            if issue.agent_id:
+                return f"Issue {issue_id} is already assigned to agent {issue.agent_id}"
+            agent_id = self.strategy_service.assign_from_pool(issue, self.agent_service.availability)
+            if not agent_id:
+                return self._waitlist_issue(issue, now=now)
+            result = self._claim(issue, agent_id)
+            if result:
+                return result
+
+    def assign_issues_bulk(self, issue_ids: Iterable[str], *, now: Optional[float] = None) -> Dict[str, str]:
+        results: Dict[str, str] = {}
+        batch: List[Issue] = []
+        for issue_id in issue_ids:
+            if issue_id in results:
+                continue
+            issue = self.issue_service.get_issue_by_id(issue_id)
+            if not issue:
+                results[issue_id] = f"Issue {issue_id} not found"
+            elif issue.agent_id:
+                results[issue_id] = f"Issue {issue_id} is already assigned to agent {issue.agent_id}"
+            elif self._primary_agent(issue):
+                results[issue_id] = self.assign_issue(issue_id, now=now)
+            else:
+                results[issue_id] = ""
+                batch.append(issue)
+
+        assignments = self.strategy_service.assign_batch(
+            batch, self.agent_service.availability, self.agent_service.get_agent
+        )
+        for issue in batch:
+            agent_id = assignments.get(issue.issue_id)
+            if agent_id:
+                results[issue.issue_id] = self._claim(issue, agent_id) or self.assign_issue(issue.issue_id, now=now)
+            else:
+                results[issue.issue_id] = self._waitlist_issue(issue, now=now)
+        return results
+
+    def _claim(self, issue: Issue, agent_id: str) -> Optional[str]:
+        agent = self.agent_service.get_agent(agent_id)
+        if not agent:
+            return None
+        with self.agent_service.lock_for(agent_id):
+            if not agent.is_available_for(issue.issue_type):
+                return None
+            with self._issue_locks.for_key(issue.number):
+                if issue.agent_id:
+                    return f"Issue {issue.issue_id} is already assigned to agent {issue.agent_id}"
+                return self._assign_to_agent(issue, agent)
+
+    def _assign_to_agent(self, issue: Issue, agent: Agent) -> str:
+        self._waitlisted_on.pop(issue.number, None)
+        agent.record_assignment(issue.issue_id, issue.issue_type)
+        self.issue_service.assign_agent(issue.issue_id, agent.agent_id)
+        self._pending_issues.add(issue.issue_id)
+        return f"Issue {issue.issue_id} assigned to agent {agent.agent_id}"
+
+    def _primary_agent(self, issue: Issue) -> Optional[Agent]:
+        primary = self.issue_service.primary_of(issue.issue_id)
+        if not primary or primary.state is IssueState.CLOSED or not primary.agent_id:
+            return None
+        agent = self.agent_service.get_agent(primary.agent_id)
+        if not agent or agent.paused or agent.offline or issue.issue_type not in agent.supported_issue_types:
+            return None
+        return agent
+
+    def _waitlist_issue(self, issue: Issue, preferred: Optional[Agent] = None, *, now: Optional[float] = None) -> str:
+        # Agents turned away by their own waitlist limit. The load index ranks agents at their limit
+        # last, so the next least loaded agent has room unless every agent is at its limit.
+        full: Set[str] = set()
+        while True:
+            clustered = preferred is not None
+            if preferred:
+                chosen_agent, preferred = preferred, None
+            else:
+                chosen_agent_id = self.agent_service.waitlist_load.least_loaded(issue.issue_type)
+                chosen_agent = self.agent_service.get_agent(chosen_agent_id) if chosen_agent_id else None
+            if not chosen_agent:
+                return f"No agent available to handle issue type {issue.issue_type.value}"
+            with self.agent_service.lock_for(chosen_agent.agent_id):
+                if issue.issue_type not in chosen_agent.supported_issue_types:
+                    continue
+                # An issue already waiting (rerouted after an escalation) was admitted before.
+                blocked = None
+                if issue.state is not IssueState.WAITING:
+                    blocked = self.admission.blocked_by(
+                        issue.issue_type, chosen_agent.agent_id, chosen_agent.waitlist.count(issue.issue_type)
+                    )
+                    if blocked is None:
+                        self.admission.record("admitted")
+                if blocked is None:
+                    result = self._enqueue(issue, chosen_agent, now)
+                    if result:
+                        return result
+            if blocked is None:
+                break
+            if blocked == "agent" and chosen_agent.agent_id not in full:
+                full.add(chosen_agent.agent_id)
+            elif not clustered:
+                # A type limit binds the least loaded agent as much as any other, and an agent
+                # offered twice means all of them are at their own limit.
+                return self._overflow(issue, now)
+            # A duplicate whose primary's agent is full falls back to the whole pool.
+
+        # An agent freed between the pool lookup and the enqueue would otherwise idle. A clustered
+        # duplicate is only rescued by its primary's agent rather than handed to whoever is free.
+        if clustered:
+            idle_agent = chosen_agent if chosen_agent.is_available_for(issue.issue_type) else None
+        else:
+            idle_agent_id = self.agent_service.availability.first_available(issue.issue_type)
+            idle_agent = self.agent_service.get_agent(idle_agent_id) if idle_agent_id else None
+        if idle_agent:
+            with self.agent_service.lock_for(idle_agent.agent_id):
+                self._assign_next_from_waitlist(idle_agent, now)
+        return f"Issue {issue.issue_id} added to waitlist of Agent {chosen_agent.agent_id}"
+
+    def _enqueue(self, issue: Issue, agent: Agent, now: Optional[float] = None) -> Optional[str]:
+        # Caller holds the agent lock.
+        with self._issue_locks.for_key(issue.number):
+            if issue.agent_id:
+                return f"Issue {issue.issue_id} is already assigned to agent {issue.agent_id}"
+            agent.enqueue_issue(issue.issue_id, issue.issue_type, issue.priority, now)
+            self._waitlisted_on[issue.number] = agent.agent_id
+            self.issue_service.mark_waitlisted(issue.issue_id)
+        return None
+
+    def _overflow(self, issue: Issue, now: Optional[float] = None) -> str:
+        policy = self.admission.policy(issue.issue_type)
+        if policy.overflow == "fallback":
+            result = self._divert(issue, policy.fallback_agents, now)
+            if result:
+                self.admission.record("diverted")
+                return result
+        elif policy.overflow == "reject":
+            self.admission.record("shed")
+            return (
+                f"Issue {issue.issue_id} not queued: waitlists for {issue.issue_type.value} are full, "
+                f"retry after {policy.retry_after:g}s"
+            )
+        self.admission.defer(issue.number, issue.issue_type)
+        return f"Issue {issue.issue_id} deferred until a waitlist for {issue.issue_type.value} has room"
+
+    def _divert(self, issue: Issue, agent_ids: Tuple[str, ...], now: Optional[float] = None) -> Optional[str]:
+        # Fallback agents take the issue now if free, else on the shortest of their waitlists.
+        for agent_id in agent_ids:
+            result = self._claim(issue, agent_id)
+            if result:
+                return result
+        agents = [agent for agent in map(self.agent_service.get_agent, agent_ids) if agent]
+        for agent in sorted(agents, key=lambda agent: len(agent.waitlist)):
+            with self.agent_service.lock_for(agent.agent_id):
+                if agent.offline or issue.issue_type not in agent.supported_issue_types or not self.admission.has_room(
+                    issue.issue_type, agent.agent_id, agent.waitlist.count(issue.issue_type), fallback=True
+                ):
+                    continue
+                return self._enqueue(issue, agent, now) or f"Issue {issue.issue_id} added to waitlist of Agent {agent.agent_id}"
+        return None
+
+    def idempotency_stats(self) -> Dict[str, int]:
+        return self.issue_service.idempotency_stats()
 
     def get_issues(self, filters: Optional[Dict[str, Any]] = None) -> List[Issue]:
         return self.issue_service.get_issue(filters)
 
+    def search_issues(
+        self, query: str, *, prefix: bool = True, open_only: bool = False, limit: int = 100
+    ) -> List[Issue]:
+        return self.issue_service.search_issues(query, prefix=prefix, open_only=open_only, limit=limit)
+
+    def find_duplicates(self, issue_id: str) -> List[Issue]:
+        # The whole near-duplicate cluster the issue belongs to, primary first, excluding the issue itself.
+        primary = self.issue_service.primary_of(issue_id) or self.issue_service.get_issue_by_id(issue_id)
+        if not primary:
+            return []
+        cluster = [primary, *self.issue_service.duplicates_of(primary.issue_id)]
+        return [issue for issue in cluster if issue.issue_id != issue_id]
+
+    def iter_issues(
+        self, filters: Optional[Dict[str, Any]] = None, *, cursor: Optional[int] = None, descending: bool = False
+    ) -> Iterator[Issue]:
+        return self.issue_service.iter_issues(filters, cursor=cursor, descending=descending)
+
+    def page_issues(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[int] = None,
+        limit: int = 100,
+        *,
+        descending: bool = False,
+    ) -> Tuple[List[Issue], Optional[int]]:
+        return self.issue_service.page_issues(filters, cursor, limit, descending=descending)
+
     def view_agents_work_history(self) -> Dict[str, List[str]]:
-        return self.agent_service.view_agents_work_history()
+        return {agent_id: self.work_history.history(agent_id) for agent_id in self.agent_service.list_agents()}
+
+    def agent_work_history(
+        self, agent_id: str, cursor: Optional[int] = None, limit: int = 100
+    ) -> Tuple[List[str], Optional[int]]:
+        return self.work_history.page(agent_id, cursor, limit)
+
+    def agent_statistics(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        agent = self.agent_service.get_agent(agent_id)
+        if not agent:
+            return None
+        statistics = (self.lifecycle_stats.agent(agent_id) or self.lifecycle_stats.empty()).to_dict()
+        statistics["backlog"] = self.agent_service.waitlist_load.backlog_of(agent_id)
+        statistics["active"] = len(agent.active_issue_ids)
+        statistics["max_concurrent"] = agent.max_concurrent
+        statistics["occupied"] = agent.is_occupied
+        return statistics
+
+    def product_statistics(self, issue_type: Any) -> Dict[str, Any]:
+        product_type = ProductType.from_value(issue_type)
+        statistics = (self.lifecycle_stats.product(product_type) or self.lifecycle_stats.empty()).to_dict()
+        statistics["waiting"] = len(self.issue_service.get_issue({"status": IssueState.WAITING, "type": product_type}))
+        return statistics
+
+    def count_issues_by_state(self) -> Dict[IssueState, int]:
+        return self.state_counts.counts()
+
+    def tail_events(self, cursor: Optional[int] = None, limit: int = 100) -> Tuple[List[IssueEvent], int]:
+        return self.events.tail(cursor, limit)
 
     @property
     def pending_issues(self) -> List[str]:
@@ -128,29 +754,96 @@ class ResolutionSystem:
     def resolved_issues(self) -> List[str]:
         return list(self._resolved_issues)
 
-    def _mark_issue_closed(self, issue: Issue) -> None:
+    def list_pending_issues(self, cursor: Optional[int] = None, limit: int = 100) -> Tuple[List[str], Optional[int]]:
+        return self._pending_issues.page(cursor, limit)
+
+    def list_resolved_issues(self, cursor: Optional[int] = None, limit: int = 100) -> Tuple[List[str], Optional[int]]:
+        return self._resolved_issues.page(cursor, limit)
+
+    def _mark_issue_closed(self, issue: Issue) -> Optional[Agent]:
         issue_id = issue.issue_id
-        self._pending_issues = [iid for iid in self._pending_issues if iid != issue_id]
-        if issue_id not in self._resolved_issues:
-            self._resolved_issues.append(issue_id)
-        self.user_service.close_issue(issue_id)
+        self._pending_issues.discard(issue_id)
+        self._resolved_issues.add(issue_id)
+        self.sla.unwatch(issue.number)
         if issue.agent_id:
             agent = self.agent_service.get_agent(issue.agent_id)
-            if agent:
-                agent.record_resolution(issue_id)
-                self._assign_next_from_waitlist(agent)
-
-    def _assign_next_from_waitlist(self, agent: Agent) -> None:
-        next_issue_id = agent.take_next_from_waitlist()
-        if not next_issue_id:
-            return
-        next_issue = self.issue_service.get_issue_by_id(next_issue_id)
-        if not next_issue:
-            return
-        agent.record_assignment(next_issue_id)
-        self.issue_service.assign_agent(next_issue_id, agent.agent_id)
-        if next_issue_id not in self._pending_issues:
-            self._pending_issues.append(next_issue_id)
+            if agent and agent.record_resolution(issue_id):
+                return agent
+        return None
+
+    def _assign_next_from_waitlist(self, agent: Agent, now: Optional[float] = None) -> None:
+        while agent.has_spare_capacity:
+            next_issue = self._take_from_waitlist(agent)
+            own = next_issue is not None
+            if not own:
+                next_issue = self._steal_waitlisted_issue(agent) or self._take_deferred(agent)
+            if not next_issue:
+                return
+            with self._issue_locks.for_key(next_issue.number):
+                # Entries go stale when the issue was assigned or closed through another path.
+                if next_issue.agent_id or next_issue.state == IssueState.CLOSED:
+                    self._waitlisted_on.pop(next_issue.number, None)
+                    continue
+                self._assign_to_agent(next_issue, agent)
+            if own:
+                self._backfill_deferred(agent, next_issue.issue_type, now)
+
+    def _take_from_waitlist(self, agent: Agent) -> Optional[Issue]:
+        # The most urgent entry (priority plus aging) among the types that still have a free slot.
+        while True:
+            issue_id = agent.take_next_from_waitlist()
+            if issue_id is None:
+                return None
+            issue = self.issue_service.get_issue_by_id(issue_id)
+            if issue is not None:
+                return issue
+
+    def _backfill_deferred(self, agent: Agent, issue_type: ProductType, now: Optional[float] = None) -> None:
+        # Caller holds the agent lock. The issue just taken off the waitlist left room, so the oldest
+        # deferred issue of the type moves in rather than waiting for the next tick.
+        while self.admission.has_room(issue_type, agent.agent_id, agent.waitlist.count(issue_type)):
+            number = self.admission.next_deferred(lambda candidate: candidate is issue_type)
+            if number is None:
+                return
+            issue = self.issue_service.get_issue_by_id(f"{ISSUE_PREFIX}{number}")
+            if issue is None or issue.agent_id or issue.state is IssueState.CLOSED:
+                continue
+            if self._enqueue(issue, agent, now) is None:
+                return
+
+    def _take_deferred(self, agent: Agent) -> Optional[Issue]:
+        # Only reached once no waitlist has anything for the agent.
+        while True:
+            number = self.admission.next_deferred(agent.is_available_for)
+            if number is None:
+                return None
+            issue = self.issue_service.get_issue_by_id(f"{ISSUE_PREFIX}{number}")
+            if issue is not None:
+                return issue
+
+    def _steal_waitlisted_issue(self, agent: Agent) -> Optional[Issue]:
+        load_index = self.agent_service.waitlist_load
+        victims = {load_index.most_backlogged(issue_type) for issue_type in agent.supported_issue_types}
+        victims.discard(None)
+        victims.discard(agent.agent_id)
+        for victim_id in sorted(victims, key=lambda agent_id: (-load_index.backlog_of(agent_id), agent_id)):
+            victim = self.agent_service.get_agent(victim_id)
+            if not victim:
+                continue
+            # The caller already holds its own agent lock; never block on a second one.
+            victim_lock = self.agent_service.lock_for(victim_id)
+            if not victim_lock.acquire(blocking=False):
+                continue
+            try:
+                issue_id = victim.waitlist.best(agent.is_available_for)
+                if issue_id is not None:
+                    victim.remove_from_waitlist(issue_id)
+                    issue = self.issue_service.get_issue_by_id(issue_id)
+                    if issue:
+                        return issue
+            finally:
+                victim_lock.release()
+        return None
 
     @staticmethod
     def main() -> None:
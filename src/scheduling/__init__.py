@@ -0,0 +1,13 @@
+from .timing_wheel import TimingWheel
+from .sla import SlaMonitor, SlaPolicy
+from .admission import AdmissionController, AdmissionPolicy, RateLimited, TokenBuckets
+
+__all__ = [
+    "TimingWheel",
+    "SlaMonitor",
+    "SlaPolicy",
+    "AdmissionController",
+    "AdmissionPolicy",
+    "RateLimited",
+    "TokenBuckets",
+]
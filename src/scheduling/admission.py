@@ -0,0 +1,220 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from src.concurrency.locks import make_lock
+from src.data_models.ids import ISSUE_PREFIX, parse_id
+from src.enums import IssueEventType, IssueState, ProductType
+from src.events.event import IssueEvent
+
+OVERFLOW_ACTIONS = ("defer", "reject", "fallback")
+
+
+class RateLimited(RuntimeError):
+    def __init__(self, key: str, retry_after: float) -> None:
+        super().__init__(f"Too many issues from {key}, retry after {retry_after:.3g}s")
+        self.key = key
+        self.retry_after = retry_after
+
+
+@dataclass(slots=True)
+class AdmissionPolicy:
+    # Issues of the type allowed to wait at once across all agents; None leaves it unbounded.
+    max_waiting: Optional[int] = None
+    # Waitlist length at which an agent stops taking more issues of the type.
+    max_per_agent: Optional[int] = None
+    # What happens to an issue over the limit: queue it until room frees up, refuse it with a
+    # retry-after hint, or hand it to the fallback agents (deferring if they are full too).
+    overflow: str = "defer"
+    retry_after: float = 30.0
+    fallback_agents: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        for name in ("max_waiting", "max_per_agent"):
+            value = getattr(self, name)
+            if value is not None and value < 0:
+                raise ValueError(f"{name} must not be negative, got {value}")
+        if self.overflow not in OVERFLOW_ACTIONS:
+            raise ValueError(f"overflow must be one of {', '.join(OVERFLOW_ACTIONS)}, got {self.overflow!r}")
+        if self.retry_after <= 0:
+            raise ValueError(f"retry_after must be positive, got {self.retry_after}")
+        self.fallback_agents = tuple(self.fallback_agents)
+        if self.overflow == "fallback" and not self.fallback_agents:
+            raise ValueError("overflow='fallback' needs at least one fallback agent")
+
+
+_DEFAULT_POLICY = AdmissionPolicy()
+# A deferred issue leaves the queue once something else routes, closes or deletes it.
+_LEAVES_QUEUE = frozenset(
+    {IssueEventType.ASSIGNED, IssueEventType.WAITLISTED, IssueEventType.CLOSED, IssueEventType.DELETED}
+)
+
+
+class TokenBuckets:
+    # One bucket per key, refilled at `rate` tokens a second up to `burst`. A bucket that has
+    # refilled is indistinguishable from a missing one, so full buckets are dropped whenever the
+    # table doubles and memory follows the number of recently active keys.
+    def __init__(self, rate: float, burst: int) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst}")
+        self.rate = rate
+        self.burst = burst
+        # key -> (tokens, refreshed at)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._prune_at = 1024
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _level(self, key: str, now: float) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return self.burst
+        tokens, refreshed_at = bucket
+        return min(self.burst, tokens + (now - refreshed_at) * self.rate)
+
+    def acquire(self, demand: Dict[str, int], now: float) -> Optional[Tuple[str, float]]:
+        # All or nothing: either every key pays for its issues, or nothing is taken and the first
+        # key short of tokens comes back with its wait. A batch larger than the burst passes on a
+        # full bucket and leaves it in debt, so bulk imports are slowed down rather than refused.
+        levels = {key: self._level(key, now) for key in demand}
+        for key, tokens in demand.items():
+            needed = min(tokens, self.burst)
+            if levels[key] < needed:
+                return key, (needed - levels[key]) / self.rate
+        for key, tokens in demand.items():
+            self._buckets[key] = (levels[key] - tokens, now)
+        if len(self._buckets) >= self._prune_at:
+            self._prune(now)
+        return None
+
+    def _prune(self, now: float) -> None:
+        for key in [key for key in self._buckets if self._level(key, now) >= self.burst]:
+            del self._buckets[key]
+        self._prune_at = max(1024, 2 * len(self._buckets))
+
+
+class AdmissionController:
+    # Sits in front of the waitlists. Waiting counts per type follow the issue event stream, so a
+    # limit check is O(1); issues turned away are kept as bare numbers in one FIFO per type until
+    # an agent runs dry or a tick finds room for them again.
+    def __init__(self, thread_safe: bool = False) -> None:
+        self._policies: Dict[ProductType, AdmissionPolicy] = {}
+        self._agent_limits: Dict[str, int] = {}
+        self._waiting: Dict[ProductType, int] = {}
+        self._deferred: Dict[ProductType, Deque[int]] = {}
+        # Numbers still deferred; queue entries missing from it went stale and are skipped.
+        self._deferred_numbers: Set[int] = set()
+        self._buckets: Optional[TokenBuckets] = None
+        self._stats = {"admitted": 0, "deferred": 0, "shed": 0, "diverted": 0, "readmitted": 0, "rate_limited": 0}
+        self._lock = make_lock(thread_safe)
+
+    def set_policy(self, issue_type: ProductType, policy: AdmissionPolicy) -> None:
+        self._policies[ProductType.from_value(issue_type)] = policy
+
+    def policy(self, issue_type: ProductType) -> AdmissionPolicy:
+        return self._policies.get(issue_type, _DEFAULT_POLICY)
+
+    def set_agent_limit(self, agent_id: str, limit: Optional[int]) -> None:
+        if limit is None:
+            self._agent_limits.pop(agent_id, None)
+            return
+        if limit < 0:
+            raise ValueError(f"limit must not be negative, got {limit}")
+        self._agent_limits[agent_id] = limit
+
+    def set_rate_limit(self, rate: Optional[float], burst: int = 10) -> None:
+        with self._lock:
+            self._buckets = None if rate is None else TokenBuckets(rate, burst)
+
+    def throttle(self, demand: Dict[str, int], now: float) -> None:
+        if self._buckets is None:
+            return
+        with self._lock:
+            refused = self._buckets.acquire(demand, now)
+            if refused is not None:
+                self._stats["rate_limited"] += sum(demand.values())
+        if refused is not None:
+            raise RateLimited(*refused)
+
+    def apply(self, event: IssueEvent) -> None:
+        waiting = self._waiting
+        if event.kind is IssueEventType.DELETED:
+            if event.state is IssueState.WAITING:
+                waiting[event.issue_type] -= 1
+        elif event.previous_state is not event.state:
+            if event.previous_state is IssueState.WAITING:
+                waiting[event.issue_type] -= 1
+            elif event.state is IssueState.WAITING:
+                waiting[event.issue_type] = waiting.get(event.issue_type, 0) + 1
+        if self._deferred_numbers and event.kind in _LEAVES_QUEUE:
+            with self._lock:
+                self._deferred_numbers.discard(parse_id(ISSUE_PREFIX, event.issue_id))
+
+    def waiting(self, issue_type: ProductType) -> int:
+        return self._waiting.get(issue_type, 0)
+
+    def blocked_by(self, issue_type: ProductType, agent_id: str, backlog: int) -> Optional[str]:
+        # Which limit keeps the agent from queueing another issue of the type, given its `backlog`
+        # of waiting issues of that type: "type" for the type's policy, which binds every agent
+        # alike, "agent" for the agent's own limit, or None when there is room.
+        policy = self.policy(issue_type)
+        if policy.max_waiting is not None and self.waiting(issue_type) >= policy.max_waiting:
+            return "type"
+        if policy.max_per_agent is not None and backlog >= policy.max_per_agent:
+            return "type"
+        limit = self._agent_limits.get(agent_id)
+        if limit is not None and backlog >= limit:
+            return "agent"
+        return None
+
+    def has_room(self, issue_type: ProductType, agent_id: str, backlog: int, *, fallback: bool = False) -> bool:
+        # Fallback agents are extra capacity beyond the type's limits; only their own limit applies.
+        if fallback:
+            limit = self._agent_limits.get(agent_id)
+            return limit is None or backlog < limit
+        return self.blocked_by(issue_type, agent_id, backlog) is None
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def defer(self, number: int, issue_type: ProductType) -> None:
+        with self._lock:
+            self._stats["deferred"] += 1
+            if number in self._deferred_numbers:
+                return
+            self._deferred_numbers.add(number)
+            queue = self._deferred.get(issue_type)
+            if queue is None:
+                queue = self._deferred[issue_type] = deque()
+            queue.append(number)
+
+    def deferred_types(self) -> List[ProductType]:
+        with self._lock:
+            return [issue_type for issue_type, queue in self._deferred.items() if queue]
+
+    def next_deferred(self, accepts: Callable[[ProductType], bool]) -> Optional[int]:
+        # Oldest deferred issue among the types `accepts` allows, in deferral order per type.
+        if not self._deferred_numbers:
+            return None
+        with self._lock:
+            for issue_type, queue in self._deferred.items():
+                if not queue or not accepts(issue_type):
+                    continue
+                while queue:
+                    number = queue.popleft()
+                    if number in self._deferred_numbers:
+                        self._deferred_numbers.discard(number)
+                        self._stats["readmitted"] += 1
+                        return number
+        return None
+
+    def __len__(self) -> int:
+        return len(self._deferred_numbers)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "queued": len(self._deferred_numbers), "rate_buckets": len(self._buckets or ())}
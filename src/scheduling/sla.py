@@ -0,0 +1,81 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.data_models.issue import Issue
+from src.enums import IssueEventType, ProductType
+from src.scheduling.timing_wheel import TimingWheel
+
+
+@dataclass(slots=True)
+class SlaPolicy:
+    priority: int = 0
+    # Seconds from creation to the resolve-by deadline; None disables SLA timers for the type.
+    resolve_within: Optional[float] = None
+    # Share of the allowed time after which a still-waiting issue is escalated.
+    at_risk_fraction: float = 0.8
+    escalation: int = 10
+
+    def __post_init__(self) -> None:
+        if self.resolve_within is not None and self.resolve_within <= 0:
+            raise ValueError(f"resolve_within must be positive, got {self.resolve_within}")
+        if not 0 < self.at_risk_fraction <= 1:
+            raise ValueError(f"at_risk_fraction must be in (0, 1], got {self.at_risk_fraction}")
+
+
+_DEFAULT_POLICY = SlaPolicy()
+
+
+class SlaMonitor:
+    # Every SLA-bound issue owns at most two timers, (AT_RISK, number) and (BREACHED, number), so
+    # closing an issue cancels them in O(1) and a tick only visits timers that actually fire.
+    # Without a `start`, the wheel starts at the first time it is given rather than at
+    # construction, so a replay driven by logged clock values fires the same timers again.
+    def __init__(self, tick: float = 1.0, start: Optional[float] = None) -> None:
+        self._policies: Dict[ProductType, SlaPolicy] = {}
+        self._tick = tick
+        self._wheel: Optional[TimingWheel] = None if start is None else TimingWheel(tick=tick, start=start)
+
+    def _wheel_at(self, now: float) -> TimingWheel:
+        if self._wheel is None:
+            self._wheel = TimingWheel(tick=self._tick, start=now)
+        return self._wheel
+
+    def set_policy(self, issue_type: Any, policy: SlaPolicy) -> None:
+        self._policies[ProductType.from_value(issue_type)] = policy
+
+    def policy(self, issue_type: Any) -> SlaPolicy:
+        return self._policies.get(ProductType.from_value(issue_type), _DEFAULT_POLICY)
+
+    def policies(self) -> Dict[ProductType, SlaPolicy]:
+        return dict(self._policies)
+
+    def terms(self, issue_type: Any, created_at: float) -> Tuple[int, Optional[float]]:
+        policy = self.policy(issue_type)
+        if policy.resolve_within is None:
+            return policy.priority, None
+        return policy.priority, created_at + policy.resolve_within
+
+    def watch(self, issue: Issue, created_at: float) -> None:
+        if issue.deadline is None:
+            return
+        policy = self.policy(issue.issue_type)
+        number = issue.number
+        at_risk = created_at + (issue.deadline - created_at) * policy.at_risk_fraction
+        wheel = self._wheel_at(created_at)
+        if at_risk < issue.deadline:
+            wheel.schedule((IssueEventType.SLA_AT_RISK, number), at_risk)
+        wheel.schedule((IssueEventType.SLA_BREACHED, number), issue.deadline)
+
+    def unwatch(self, number: int) -> None:
+        if self._wheel is None:
+            return
+        self._wheel.cancel((IssueEventType.SLA_AT_RISK, number))
+        self._wheel.cancel((IssueEventType.SLA_BREACHED, number))
+
+    def advance(self, now: Optional[float] = None) -> List[Tuple[IssueEventType, int]]:
+        now = time.time() if now is None else now
+        return self._wheel_at(now).advance(now)
+
+    def __len__(self) -> int:
+        return 0 if self._wheel is None else len(self._wheel)
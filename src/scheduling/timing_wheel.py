@@ -0,0 +1,106 @@
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class TimingWheel:
+    # Hierarchical timing wheel: level L holds timers due within slots ** (L + 1) ticks, one slot per
+    # slots ** L ticks. Scheduling and cancelling are O(1); advancing one tick touches one level-0
+    # slot, and higher-level slots are cascaded down only when the lower wheel wraps.
+    def __init__(self, tick: float = 1.0, slots: int = 64, levels: int = 4, start: float = 0.0) -> None:
+        if tick <= 0 or slots < 2 or levels < 1:
+            raise ValueError("TimingWheel needs tick > 0, slots >= 2 and levels >= 1")
+        self.tick = tick
+        self._slots = slots
+        self._levels = levels
+        self._current = int(start // tick)
+        self._wheels: List[List[Dict[Hashable, int]]] = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._overflow: Dict[Hashable, int] = {}
+        # key -> (level, slot), level -1 meaning overflow
+        self._where: Dict[Hashable, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def schedule(self, key: Hashable, when: float) -> None:
+        self.cancel(key)
+        self._place(key, max(int(-(-when // self.tick)), self._current + 1))
+
+    def cancel(self, key: Hashable) -> bool:
+        location = self._where.pop(key, None)
+        if location is None:
+            return False
+        level, slot = location
+        if level < 0:
+            del self._overflow[key]
+        else:
+            del self._wheels[level][slot][key]
+        return True
+
+    def _place(self, key: Hashable, due: int) -> None:
+        delta = due - self._current
+        span = self._slots
+        for level in range(self._levels):
+            if delta < span:
+                slot = (due // (span // self._slots)) % self._slots
+                self._wheels[level][slot][key] = due
+                self._where[key] = (level, slot)
+                return
+            span *= self._slots
+        self._overflow[key] = due
+        self._where[key] = (-1, 0)
+
+    def advance(self, now: float) -> List[Hashable]:
+        target = int(now // self.tick)
+        expired: List[Hashable] = []
+        while self._current < target:
+            if not self._where:
+                self._current = target
+                break
+            self._current += 1
+            self._cascade()
+            bucket = self._wheels[0][self._current % self._slots]
+            if bucket:
+                for key in bucket:
+                    del self._where[key]
+                expired.extend(bucket)
+                bucket.clear()
+        return expired
+
+    def _cascade(self) -> None:
+        # Re-place from the highest level that wrapped downwards so entries falling through several
+        # levels in one tick still land in a slot that has not been drained yet.
+        current = self._current
+        top = 0
+        span = 1
+        while top < self._levels and current % (span * self._slots) == 0:
+            span *= self._slots
+            top += 1
+        if top == 0:
+            return
+        if top == self._levels and self._overflow:
+            moved = list(self._overflow.items())
+            self._overflow.clear()
+            for key, due in moved:
+                self._place(key, due)
+        for level in range(min(top, self._levels - 1), 0, -1):
+            granularity = self._slots ** level
+            bucket = self._wheels[level][(current // granularity) % self._slots]
+            if bucket:
+                moved = list(bucket.items())
+                bucket.clear()
+                for key, due in moved:
+                    self._place(key, due)
+
+    def next_due(self) -> Optional[float]:
+        if not self._where:
+            return None
+        due = min(
+            min(bucket.values()) if bucket else float("inf")
+            for wheel in self._wheels
+            for bucket in wheel
+        )
+        if self._overflow:
+            due = min(due, min(self._overflow.values()))
+        return due * self.tick
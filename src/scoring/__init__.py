@@ -0,0 +1,11 @@
+from .features import AgentFeatureMatrix, AgentFeatures, Scorer
+from .scorers import get_scorer, register_scorer, scorer_names
+
+__all__ = [
+    "AgentFeatureMatrix",
+    "AgentFeatures",
+    "Scorer",
+    "get_scorer",
+    "register_scorer",
+    "scorer_names",
+]
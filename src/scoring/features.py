@@ -0,0 +1,155 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the scoring engine needs it
+    np = None
+
+from src.concurrency.locks import make_lock
+from src.data_models.agent import Agent
+from src.data_models.ids import ISSUE_PREFIX, parse_id
+from src.enums import IssueEventType, ProductType
+from src.events.event import IssueEvent
+
+_TYPES: List[ProductType] = list(ProductType)
+_TYPE_CODES = {issue_type: code for code, issue_type in enumerate(_TYPES)}
+
+
+@dataclass(frozen=True, slots=True)
+class AgentFeatures:
+    # Column views for one product type, one entry per registered agent in registration order.
+    rating: Any
+    spare: Any
+    load: Any
+    waitlist: Any
+    handle_time: Any
+
+
+Scorer = Callable[[AgentFeatures], Any]
+
+
+class AgentFeatureMatrix:
+    # Agent x feature arrays kept current from agent change notifications (ratings, free slots,
+    # load, waitlist length) and from the event stream (an EWMA of handle time). A scorer maps the
+    # columns to one score per agent, so picking an agent is a single argmax instead of a loop.
+    def __init__(self, thread_safe: bool = False, *, alpha: float = 0.1, capacity: int = 1024) -> None:
+        if np is None:
+            raise ImportError("AgentFeatureMatrix requires numpy")
+        if not 0 < alpha <= 1:
+            raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+        self._alpha = alpha
+        self._rows: Dict[str, int] = {}
+        self.agent_ids: List[str] = []
+        self._rating = np.zeros((capacity, len(_TYPES)))
+        self._spare = np.zeros((capacity, len(_TYPES)), dtype=np.int32)
+        self._load = np.zeros(capacity)
+        self._waitlist = np.zeros(capacity, dtype=np.int32)
+        self._handle_time = np.full(capacity, np.nan)
+        # issue number -> (agent, assigned at) while the issue is being handled
+        self._assigned_at: Dict[int, Tuple[str, float]] = {}
+        self._lock = make_lock(thread_safe)
+
+    def __len__(self) -> int:
+        return len(self.agent_ids)
+
+    # Maintenance
+    def register(self, agent: Agent) -> None:
+        with self._lock:
+            if agent.agent_id not in self._rows:
+                if len(self.agent_ids) == len(self._load):
+                    self._grow()
+                self._rows[agent.agent_id] = len(self.agent_ids)
+                self.agent_ids.append(agent.agent_id)
+        if self not in agent.observers:
+            agent.observers.append(self)
+        self.refresh(agent)
+
+    def agent_changed(self, agent: Agent) -> None:
+        self.refresh(agent)
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self._load)
+        for name, fill in (("_rating", 0), ("_spare", 0), ("_load", 0), ("_waitlist", 0), ("_handle_time", np.nan)):
+            column = getattr(self, name)
+            grown = np.full((capacity, *column.shape[1:]), fill, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def refresh(self, agent: Agent) -> None:
+        with self._lock:
+            row = self._rows.get(agent.agent_id)
+            if row is None:
+                return
+            self._rating[row] = [agent.ratings.get(issue_type, 0.0) for issue_type in _TYPES]
+            self._spare[row] = [agent.spare_slots(issue_type) for issue_type in _TYPES]
+            self._load[row] = len(agent.active_issue_ids) / agent.max_concurrent
+            self._waitlist[row] = len(agent.waitlist)
+
+    def apply(self, event: IssueEvent) -> None:
+        kind = event.kind
+        if kind is IssueEventType.ASSIGNED:
+            if event.agent_id:
+                self._assigned_at[parse_id(ISSUE_PREFIX, event.issue_id)] = (event.agent_id, event.timestamp)
+        elif kind is IssueEventType.CLOSED:
+            handled = self._assigned_at.pop(parse_id(ISSUE_PREFIX, event.issue_id), None)
+            if handled is None:
+                return
+            agent_id, assigned_at = handled
+            row = self._rows.get(agent_id)
+            if row is None:
+                return
+            sample = event.timestamp - assigned_at
+            with self._lock:
+                current = self._handle_time[row]
+                self._handle_time[row] = sample if np.isnan(current) else current + self._alpha * (sample - current)
+        elif kind is IssueEventType.DELETED or kind is IssueEventType.WAITLISTED:
+            # Deleted, or taken back from an agent that went offline.
+            self._assigned_at.pop(parse_id(ISSUE_PREFIX, event.issue_id), None)
+
+    # Scoring
+    def features(self, issue_type: ProductType) -> AgentFeatures:
+        code = _TYPE_CODES[issue_type]
+        size = len(self.agent_ids)
+        return AgentFeatures(
+            rating=self._rating[:size, code],
+            spare=self._spare[:size, code],
+            load=self._load[:size],
+            waitlist=self._waitlist[:size],
+            handle_time=self._handle_time[:size],
+        )
+
+    def scores(self, issue_type: ProductType, scorer: Scorer) -> Any:
+        # Agents without a free slot for the type (or with no usable score) score -inf.
+        with self._lock:
+            features = self.features(issue_type)
+            scores = np.asarray(scorer(features), dtype=float)
+            if scores.shape != (len(self.agent_ids),):
+                raise ValueError(f"Scorer must return one score per agent, got shape {scores.shape}")
+            return np.where((features.spare > 0) & ~np.isnan(scores), scores, -np.inf)
+
+    def best(self, issue_type: ProductType, scorer: Scorer, among: Optional[Iterable[str]] = None) -> Optional[str]:
+        if not self.agent_ids:
+            return None
+        scores = self.scores(issue_type, scorer)
+        if among is not None:
+            rows = [self._rows[agent_id] for agent_id in among if agent_id in self._rows]
+            restricted = np.full(len(scores), -np.inf)
+            restricted[rows] = scores[rows]
+            scores = restricted
+        # argmax keeps the first maximum, so ties go to the earliest registered agent.
+        row = int(np.argmax(scores))
+        return self.agent_ids[row] if scores[row] > -np.inf else None
+
+    def ranked(self, issue_type: ProductType, scorer: Scorer, limit: Optional[int] = None) -> List[str]:
+        # Eligible agents from best to worst; with a limit only the top `limit` are partitioned
+        # out and sorted, so the cost is O(n + limit log limit).
+        if not self.agent_ids:
+            return []
+        scores = self.scores(issue_type, scorer)
+        rows = np.flatnonzero(scores > -np.inf)
+        if limit is not None and limit < len(rows):
+            rows = rows[np.argpartition(-scores[rows], limit - 1)[:limit]]
+        rows = rows[np.lexsort((rows, -scores[rows]))]
+        agent_ids = self.agent_ids
+        return [agent_ids[row] for row in rows.tolist()]
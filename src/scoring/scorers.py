@@ -0,0 +1,65 @@
+from typing import Callable, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the scoring engine needs it
+    np = None
+
+from src.scoring.features import AgentFeatures, Scorer
+
+_SCORERS: Dict[str, Scorer] = {}
+
+
+def register_scorer(name: str, scorer: Optional[Scorer] = None) -> Callable[..., Scorer]:
+    # register_scorer("name", function), or @register_scorer("name") on a function taking
+    # AgentFeatures and returning one score per agent (higher is better).
+    def register(function: Scorer) -> Scorer:
+        if not name:
+            raise ValueError("A scorer needs a name")
+        _SCORERS[name] = function
+        return function
+
+    return register if scorer is None else register(scorer)
+
+
+def get_scorer(name: str) -> Scorer:
+    scorer = _SCORERS.get(name)
+    if scorer is None:
+        raise ValueError(f"Unknown scorer: {name}")
+    return scorer
+
+
+def scorer_names() -> List[str]:
+    return sorted(_SCORERS)
+
+
+@register_scorer("fcfs")
+def first_come(features: AgentFeatures):
+    return np.zeros(len(features.load))
+
+
+@register_scorer("rating")
+def best_rated(features: AgentFeatures):
+    return features.rating
+
+
+@register_scorer("capacity")
+def most_spare(features: AgentFeatures):
+    # Free slots first, rating as the tie-breaker: the rating term stays within (-0.5, 0.5).
+    if not len(features.rating):
+        return features.rating
+    return features.spare + features.rating / (2 * (np.abs(features.rating).max() + 1))
+
+
+@register_scorer("least_loaded")
+def least_loaded(features: AgentFeatures):
+    return -(features.load + features.waitlist)
+
+
+@register_scorer("fastest")
+def fastest(features: AgentFeatures):
+    # Agents with no resolution yet are scored at the average handle time.
+    handle_time = features.handle_time
+    known = ~np.isnan(handle_time)
+    fill = handle_time[known].mean() if known.any() else 0.0
+    return -np.where(known, handle_time, fill)
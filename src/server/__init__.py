@@ -0,0 +1,9 @@
+from .server import ResolutionServer, serve
+from .client import ResolutionClient, ServerError
+
+__all__ = [
+    "ResolutionServer",
+    "serve",
+    "ResolutionClient",
+    "ServerError",
+]
@@ -0,0 +1,272 @@
+import asyncio
+import itertools
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from src.server.protocol import LINE_LIMIT, decode, encode_request
+
+
+class ServerError(RuntimeError):
+    pass
+
+
+class ResolutionClient:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, max_in_flight: int = 256) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        # Bounds pipelining per connection; together with drain() this is the client side of backpressure.
+        self._window = asyncio.Semaphore(max_in_flight)
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(
+        cls,
+        host: str = "127.0.0.1",
+        port: int = 7070,
+        *,
+        path: Optional[str] = None,
+        max_in_flight: int = 256,
+    ) -> "ResolutionClient":
+        if path:
+            reader, writer = await asyncio.open_unix_connection(path, limit=LINE_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        return cls(reader, writer, max_in_flight)
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._receiver.cancel()
+        try:
+            await self._receiver
+        except asyncio.CancelledError:
+            pass
+
+    async def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        async with self._window:
+            request_id = next(self._ids)
+            future = asyncio.get_running_loop().create_future()
+            self._pending[request_id] = future
+            self._writer.write(encode_request(request_id, method, args, kwargs))
+            await self._writer.drain()
+            return await future
+
+    async def _receive(self) -> None:
+        error: BaseException = ConnectionError("Connection closed by server")
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                message = decode(line)
+                future = self._pending.pop(message.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(ServerError(message["error"]))
+                else:
+                    future.set_result(message.get("result"))
+        except (ConnectionError, ValueError) as failure:
+            error = failure
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    async def create_user(self, name: str, email: str, active_products: Iterable[Any]) -> str:
+        return await self.call("create_user", name, email, list(active_products))
+
+    async def create_agent(self, agent_email: str, agent_name: str, issue_types: Iterable[Any]) -> str:
+        return await self.call("create_agent", agent_email, agent_name, list(issue_types))
+
+    async def update_agent(
+        self,
+        agent_id: str,
+        *,
+        issue_types: Optional[Iterable[Any]] = None,
+        ratings: Optional[Dict[Any, float]] = None,
+        capacity: Optional[Dict[Any, int]] = None,
+        max_concurrent: Optional[int] = None,
+    ) -> bool:
+        issue_types = list(issue_types) if issue_types is not None else None
+        return await self.call(
+            "update_agent", agent_id, issue_types=issue_types, ratings=ratings, capacity=capacity, max_concurrent=max_concurrent
+        )
+
+    async def deactivate_agent(self, agent_id: str) -> bool:
+        return await self.call("deactivate_agent", agent_id)
+
+    async def deactivate_agents_bulk(self, agent_ids: Iterable[str]) -> Dict[str, str]:
+        return await self.call("deactivate_agents_bulk", list(agent_ids))
+
+    async def reactivate_agent(self, agent_id: str) -> bool:
+        return await self.call("reactivate_agent", agent_id)
+
+    async def set_active_strategy(self, strategy_id: str) -> bool:
+        return await self.call("set_active_strategy", strategy_id)
+
+    async def enable_scoring(self) -> None:
+        await self.call("enable_scoring")
+
+    async def create_scored_strategy(self, scorer: str) -> str:
+        return await self.call("create_scored_strategy", scorer)
+
+    async def create_issue(
+        self,
+        transaction_id: str,
+        issue_type: Any,
+        subject: str,
+        description: str,
+        email: str,
+        *,
+        priority: Optional[int] = None,
+    ) -> str:
+        # Plain creations carry no kwargs so the server can still coalesce them.
+        if priority is None:
+            return await self.call("create_issue", transaction_id, issue_type, subject, description, email)
+        return await self.call("create_issue", transaction_id, issue_type, subject, description, email, priority=priority)
+
+    async def create_issues_bulk(self, issues: Iterable[Tuple[str, Any, str, str, str]]) -> List[str]:
+        return await self.call("create_issues_bulk", list(issues))
+
+    async def set_sla_policy(
+        self,
+        issue_type: Any,
+        *,
+        priority: int = 0,
+        resolve_within: Optional[float] = None,
+        at_risk_fraction: float = 0.8,
+        escalation: int = 10,
+    ) -> Dict[str, Any]:
+        return await self.call(
+            "set_sla_policy",
+            issue_type,
+            priority=priority,
+            resolve_within=resolve_within,
+            at_risk_fraction=at_risk_fraction,
+            escalation=escalation,
+        )
+
+    async def set_admission_policy(
+        self,
+        issue_type: Any,
+        *,
+        max_waiting: Optional[int] = None,
+        max_per_agent: Optional[int] = None,
+        overflow: str = "defer",
+        retry_after: float = 30.0,
+        fallback_agents: Iterable[str] = (),
+    ) -> Dict[str, Any]:
+        return await self.call(
+            "set_admission_policy",
+            issue_type,
+            max_waiting=max_waiting,
+            max_per_agent=max_per_agent,
+            overflow=overflow,
+            retry_after=retry_after,
+            fallback_agents=list(fallback_agents),
+        )
+
+    async def set_agent_waitlist_limit(self, agent_id: str, limit: Optional[int]) -> bool:
+        return await self.call("set_agent_waitlist_limit", agent_id, limit)
+
+    async def set_rate_limit(self, rate: Optional[float], burst: int = 10) -> None:
+        await self.call("set_rate_limit", rate, burst)
+
+    async def admission_stats(self) -> Dict[str, int]:
+        return await self.call("admission_stats")
+
+    async def tick(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        return await self.call("tick", now)
+
+    async def assign_issue(self, issue_id: str) -> str:
+        return await self.call("assign_issue", issue_id)
+
+    async def assign_issues_bulk(self, issue_ids: Iterable[str]) -> Dict[str, str]:
+        return await self.call("assign_issues_bulk", list(issue_ids))
+
+    async def update_issue(self, issue_id: str, status: Any, resolution: Optional[str] = None) -> bool:
+        return await self.call("update_issue", issue_id, status, resolution)
+
+    async def resolve_issue(self, issue_id: str, resolution: str) -> bool:
+        return await self.call("resolve_issue", issue_id, resolution)
+
+    async def get_issues(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        return await self.call("get_issues", filters)
+
+    async def page_issues(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[int] = None,
+        limit: int = 100,
+        *,
+        descending: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        page, next_cursor = await self.call("page_issues", filters, cursor, limit, descending=descending)
+        return page, next_cursor
+
+    async def search_issues(
+        self, query: str, *, prefix: bool = True, open_only: bool = False, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        return await self.call("search_issues", query, prefix=prefix, open_only=open_only, limit=limit)
+
+    async def find_duplicates(self, issue_id: str) -> List[Dict[str, Any]]:
+        return await self.call("find_duplicates", issue_id)
+
+    async def iter_issues(
+        self, filters: Optional[Dict[str, Any]] = None, *, limit: int = 100, descending: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        cursor: Optional[int] = None
+        while True:
+            page, cursor = await self.page_issues(filters, cursor, limit, descending=descending)
+            for issue in page:
+                yield issue
+            if cursor is None:
+                return
+
+    async def view_agents_work_history(self) -> Dict[str, List[str]]:
+        return await self.call("view_agents_work_history")
+
+    async def agent_work_history(
+        self, agent_id: str, cursor: Optional[int] = None, limit: int = 100
+    ) -> Tuple[List[str], Optional[int]]:
+        page, next_cursor = await self.call("agent_work_history", agent_id, cursor, limit)
+        return page, next_cursor
+
+    async def agent_statistics(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        return await self.call("agent_statistics", agent_id)
+
+    async def product_statistics(self, issue_type: Any) -> Dict[str, Any]:
+        return await self.call("product_statistics", issue_type)
+
+    async def count_issues_by_state(self) -> Dict[str, int]:
+        return await self.call("count_issues_by_state")
+
+    async def idempotency_stats(self) -> Dict[str, int]:
+        return await self.call("idempotency_stats")
+
+    async def archive_closed(self, now: Optional[float] = None) -> int:
+        return await self.call("archive_closed", now)
+
+    async def archive_stats(self) -> Dict[str, int]:
+        return await self.call("archive_stats")
+
+    async def tail_events(self, cursor: Optional[int] = None, limit: int = 100) -> Tuple[List[Dict[str, Any]], int]:
+        events, next_cursor = await self.call("tail_events", cursor, limit)
+        return events, next_cursor
+
+    async def list_pending_issues(self, cursor: Optional[int] = None, limit: int = 100) -> Tuple[List[str], Optional[int]]:
+        page, next_cursor = await self.call("list_pending_issues", cursor, limit)
+        return page, next_cursor
+
+    async def list_resolved_issues(self, cursor: Optional[int] = None, limit: int = 100) -> Tuple[List[str], Optional[int]]:
+        page, next_cursor = await self.call("list_resolved_issues", cursor, limit)
+        return page, next_cursor
+
+    async def server_stats(self) -> Dict[str, float]:
+        return await self.call("server_stats")
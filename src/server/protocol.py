@@ -0,0 +1,66 @@
+import json
+from collections import deque
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from typing import Any, Dict, Tuple
+
+from src.data_models.ids import CompactIdList
+from src.data_models.issue import Issue
+from src.data_models.waitlist import PriorityWaitlist
+
+# One JSON object per line in both directions.
+# request:  {"id": 7, "method": "assign_issue", "args": ["I3"], "kwargs": {}}
+# response: {"id": 7, "result": "Issue I3 assigned to agent A1"} or {"id": 7, "error": "..."}
+LINE_LIMIT = 1 << 24
+
+
+def to_wire(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Issue):
+        return {
+            "issue_id": value.issue_id,
+            "transaction_id": value.transaction_id,
+            "issue_type": value.issue_type.value,
+            "subject": value.subject,
+            "description": value.description,
+            "state": value.state.value,
+            "user_id": value.user_id,
+            "user_email": value.user_email,
+            "agent_id": value.agent_id,
+            "resolution": value.resolution,
+            "priority": value.priority,
+            "deadline": value.deadline,
+        }
+    if is_dataclass(value):
+        return {field.name: to_wire(getattr(value, field.name)) for field in fields(value) if field.repr}
+    if isinstance(value, dict):
+        return {str(to_wire(key)): to_wire(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset, deque, CompactIdList, PriorityWaitlist)):
+        return [to_wire(item) for item in value]
+    return str(value)
+
+
+def encode_request(request_id: int, method: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> bytes:
+    return _encode({"id": request_id, "method": method, "args": to_wire(args), "kwargs": to_wire(kwargs)})
+
+
+def encode_result(request_id: Any, result: Any) -> bytes:
+    return _encode({"id": request_id, "result": to_wire(result)})
+
+
+def encode_error(request_id: Any, message: str) -> bytes:
+    return _encode({"id": request_id, "error": message})
+
+
+def decode(line: bytes) -> Dict[str, Any]:
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("Message must be a JSON object")
+    return message
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
@@ -0,0 +1,273 @@
+import argparse
+import asyncio
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.resolution_system import ResolutionSystem
+from src.server.protocol import LINE_LIMIT, decode, encode_error, encode_result
+
+_METHODS = {
+    "create_user",
+    "delete_user",
+    "get_user_details",
+    "create_agent",
+    "update_agent",
+    "deactivate_agent",
+    "deactivate_agents_bulk",
+    "reactivate_agent",
+    "set_active_strategy",
+    "enable_scoring",
+    "create_scored_strategy",
+    "create_issue",
+    "create_issues_bulk",
+    "update_issue",
+    "resolve_issue",
+    "assign_issue",
+    "assign_issues_bulk",
+    "get_issues",
+    "page_issues",
+    "search_issues",
+    "find_duplicates",
+    "view_agents_work_history",
+    "agent_work_history",
+    "agent_statistics",
+    "product_statistics",
+    "count_issues_by_state",
+    "idempotency_stats",
+    "archive_closed",
+    "archive_stats",
+    "tail_events",
+    "list_pending_issues",
+    "list_resolved_issues",
+    "set_sla_policy",
+    "set_admission_policy",
+    "set_agent_waitlist_limit",
+    "set_rate_limit",
+    "admission_stats",
+    "tick",
+}
+_PROPERTIES = {"pending_issues", "resolved_issues"}
+
+# A connection whose unsent replies pass this many bytes stops being read until they drain.
+_WRITE_HIGH_WATER = 256 * 1024
+
+# (connection writer, request id, method, args, kwargs); clock ticks have no writer.
+_Request = Tuple[Optional[asyncio.StreamWriter], Any, str, list, dict]
+
+
+class ResolutionServer:
+    def __init__(
+        self,
+        system: Optional[ResolutionSystem] = None,
+        *,
+        queue_size: int = 4096,
+        batch_size: int = 512,
+        tick_interval: Optional[float] = None,
+    ) -> None:
+        self.system = system or ResolutionSystem()
+        self._queue_size = queue_size
+        self._batch_size = batch_size
+        self._tick_interval = tick_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._clock_task: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stats: Dict[str, float] = {
+            "requests": 0,
+            "batches": 0,
+            "coalesced_calls": 0,
+            "coalesced_requests": 0,
+            "backpressure_waits": 0,
+            "write_waits": 0,
+            "errors": 0,
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None) -> asyncio.AbstractServer:
+        self._queue = asyncio.Queue(self._queue_size)
+        self._writer_task = asyncio.create_task(self._run_writer())
+        if self._tick_interval:
+            self._clock_task = asyncio.create_task(self._run_clock())
+        if path:
+            self._server = await asyncio.start_unix_server(self._serve_connection, path, limit=LINE_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self._serve_connection, host, port, limit=LINE_LIMIT)
+        return self._server
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in (self._clock_task, self._writer_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+    def stats(self) -> Dict[str, float]:
+        return {**self._stats, "queue_depth": self._queue.qsize() if self._queue else 0}
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.transport.set_write_buffer_limits(high=_WRITE_HIGH_WATER)
+        try:
+            while True:
+                # The shared writer never waits on a socket, so a client that sends faster than it
+                # reads its replies is paused here instead, until its buffer is below low water.
+                if writer.transport.get_write_buffer_size() > _WRITE_HIGH_WATER:
+                    self._stats["write_waits"] += 1
+                    await writer.drain()
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Past LINE_LIMIT the stream cannot be split into requests again, so it ends here.
+                    self._stats["errors"] += 1
+                    writer.write(encode_error(None, f"Request line exceeds {LINE_LIMIT} bytes"))
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                try:
+                    message = decode(line)
+                except ValueError as error:
+                    self._stats["errors"] += 1
+                    writer.write(encode_error(None, str(error)))
+                    continue
+                request_id = message.get("id")
+                method = message.get("method")
+                if method == "server_stats":
+                    writer.write(encode_result(request_id, self.stats()))
+                    continue
+                if method not in _METHODS and method not in _PROPERTIES:
+                    self._stats["errors"] += 1
+                    writer.write(encode_error(request_id, f"Unknown method {method}"))
+                    continue
+                request = (writer, request_id, method, message.get("args") or [], message.get("kwargs") or {})
+                # A full queue stops this reader, so the client's socket buffer fills up and its
+                # writes stall: backpressure reaches the client without any extra signalling.
+                if self._queue.full():
+                    self._stats["backpressure_waits"] += 1
+                await self._queue.put(request)
+                self._stats["requests"] += 1
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _run_writer(self) -> None:
+        queue = self._queue
+        while True:
+            batch: List[_Request] = [await queue.get()]
+            while len(batch) < self._batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            self._stats["batches"] += 1
+            start = 0
+            while start < len(batch):
+                end = self._run_end(batch, start)
+                if end - start > 1:
+                    self._execute_coalesced(batch[start:end])
+                else:
+                    self._execute(batch[start])
+                start = end
+            # Let readers refill the queue before the next batch is taken.
+            await asyncio.sleep(0)
+
+    async def _run_clock(self) -> None:
+        # SLA timers advance through the same queue as requests, so ticks never race the writer.
+        while True:
+            await asyncio.sleep(self._tick_interval)
+            await self._queue.put((None, None, "tick", [], {}))
+
+    @staticmethod
+    def _run_end(batch: List[_Request], start: int) -> int:
+        method = batch[start][2]
+        if method not in ("create_issue", "assign_issue"):
+            return start + 1
+        seen = set()
+        end = start
+        while end < len(batch):
+            _, _, other, args, kwargs = batch[end]
+            if other != method or kwargs:
+                break
+            if method == "assign_issue":
+                if len(args) != 1 or args[0] in seen:
+                    break
+                seen.add(args[0])
+            elif len(args) != 5:
+                break
+            end += 1
+        return max(end, start + 1)
+
+    def _execute(self, request: _Request) -> None:
+        writer, request_id, method, args, kwargs = request
+        try:
+            if method in _PROPERTIES:
+                result = getattr(self.system, method)
+            else:
+                result = getattr(self.system, method)(*args, **kwargs)
+        except Exception as error:  # reported to the caller, the writer keeps going
+            self._stats["errors"] += 1
+            self._reply(writer, encode_error(request_id, f"{type(error).__name__}: {error}"))
+            return
+        self._reply(writer, encode_result(request_id, result))
+
+    def _execute_coalesced(self, run: List[_Request]) -> None:
+        method = run[0][2]
+        call: Callable[[], List[Any]]
+        if method == "create_issue":
+            call = lambda: self.system.create_issues_bulk([tuple(args) for _, _, _, args, _ in run])
+        else:
+            call = lambda: self._assign_many([args[0] for _, _, _, args, _ in run])
+        try:
+            results = call()
+        except Exception:
+            # One bad request must not fail its neighbours; fall back to one call each.
+            for request in run:
+                self._execute(request)
+            return
+        self._stats["coalesced_calls"] += 1
+        self._stats["coalesced_requests"] += len(run)
+        for (writer, request_id, *_), result in zip(run, results):
+            self._reply(writer, encode_result(request_id, result))
+
+    def _assign_many(self, issue_ids: List[str]) -> List[str]:
+        results = self.system.assign_issues_bulk(issue_ids)
+        return [results[issue_id] for issue_id in issue_ids]
+
+    @staticmethod
+    def _reply(writer: Optional[asyncio.StreamWriter], payload: bytes) -> None:
+        # Buffered without drain(); _serve_connection stops reading from connections that fall behind.
+        if writer is not None and not writer.is_closing():
+            writer.write(payload)
+
+
+async def serve(
+    host: str, port: int, path: Optional[str], queue_size: int, batch_size: int, tick_interval: Optional[float] = None
+) -> None:
+    server = ResolutionServer(queue_size=queue_size, batch_size=batch_size, tick_interval=tick_interval)
+    listener = await server.start(host, port, path)
+    address = path or list(listener.sockets[0].getsockname()[:2])
+    print(json.dumps({"listening": address}), flush=True)
+    try:
+        await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the ResolutionSystem façade over newline-delimited JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7070)
+    parser.add_argument("--unix-socket", default=None)
+    parser.add_argument("--queue-size", type=int, default=4096)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--tick-interval", type=float, default=1.0, help="seconds between SLA timer ticks (0 disables)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix_socket, args.queue_size, args.batch_size, args.tick_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
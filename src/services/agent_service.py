@@ -1,28 +1,54 @@
-from typing import Any, Dict, Iterable, Optional
+import sys
+from typing import Any, Dict, Iterable, List, Optional
 
+from src.concurrency.locks import AnyLock, LockTable, StripedLock, make_lock
 from src.data_models.agent import Agent
 from src.enums import ProductType
+from src.indexes.agent_availability_index import AgentAvailabilityIndex
+from src.indexes.waitlist_load_index import WaitlistLoadIndex
 
 
 class AgentService:
-    def __init__(self) -> None:
+    def __init__(self, thread_safe: bool = False) -> None:
         self._agents: Dict[str, Agent] = {}
         self._agents_by_email: Dict[str, str] = {}
         self._sequence = 0
+        self._availability = AgentAvailabilityIndex(thread_safe)
+        self._waitlist_load = WaitlistLoadIndex(thread_safe)
+        # Optional per-agent indexes attached later, e.g. the scoring feature matrix.
+        self._indexes: List[Any] = []
+        self._sequence_lock = make_lock(thread_safe)
+        self._email_locks = StripedLock(thread_safe)
+        self._agent_locks = LockTable(thread_safe)
 
     def _next_id(self) -> str:
-        self._sequence += 1
-        return f"A{self._sequence}"
+        with self._sequence_lock:
+            self._sequence += 1
+            return f"A{self._sequence}"
 
     def add_agent(self, agent_email: str, agent_name: str, issue_types: Iterable[Any]) -> str:
-        if agent_email in self._agents_by_email:
-            return self._agents_by_email[agent_email]
-        agent_id = self._next_id()
-        supported = {ProductType.from_value(issue_type) for issue_type in issue_types}
-        agent = Agent(agent_id=agent_id, name=agent_name, email=agent_email, supported_issue_types=supported)
-        self._agents[agent_id] = agent
-        self._agents_by_email[agent_email] = agent_id
-        return agent_id
+        with self._email_locks.for_key(agent_email):
+            if agent_email in self._agents_by_email:
+                return self._agents_by_email[agent_email]
+            agent_id = sys.intern(self._next_id())
+            agent_email = sys.intern(agent_email)
+            supported = {ProductType.from_value(issue_type) for issue_type in issue_types}
+            agent = Agent(agent_id=agent_id, name=agent_name, email=agent_email, supported_issue_types=supported)
+            with self.lock_for(agent_id):
+                self._agents[agent_id] = agent
+                self._agents_by_email[agent_email] = agent_id
+                self._availability.register(agent)
+                self._waitlist_load.register(agent)
+                for index in self._indexes:
+                    index.register(agent)
+            return agent_id
+
+    def add_index(self, index: Any) -> None:
+        # The index registers every existing agent now and every new one as it is added.
+        self._indexes.append(index)
+        for agent_id, agent in list(self._agents.items()):
+            with self.lock_for(agent_id):
+                index.register(agent)
 
     def update_agent(
         self,
@@ -30,22 +56,43 @@ class AgentService:
         *,
         issue_types: Optional[Iterable[Any]] = None,
         ratings: Optional[Dict[Any, float]] = None,
+        capacity: Optional[Dict[Any, int]] = None,
+        max_concurrent: Optional[int] = None,
     ) -> bool:
         agent = self._agents.get(agent_id)
         if not agent:
             return False
-        if issue_types is not None:
-            agent.supported_issue_types = {ProductType.from_value(issue_type) for issue_type in issue_types}
-        if ratings:
-            for issue_type, score in ratings.items():
-                agent.ratings[ProductType.from_value(issue_type)] = float(score)
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError(f"max_concurrent must be at least 1, got {max_concurrent}")
+        if capacity and any(int(slots) < 0 for slots in capacity.values()):
+            raise ValueError(f"Capacity must not be negative: {capacity}")
+        with self.lock_for(agent_id):
+            if issue_types is not None:
+                agent.supported_issue_types = {ProductType.from_value(issue_type) for issue_type in issue_types}
+            if ratings:
+                for issue_type, score in ratings.items():
+                    agent.ratings[ProductType.from_value(issue_type)] = float(score)
+            if capacity:
+                for issue_type, slots in capacity.items():
+                    agent.capacity[ProductType.from_value(issue_type)] = int(slots)
+            if max_concurrent is not None:
+                agent.max_concurrent = max_concurrent
+            agent.notify_observers()
         return True
 
     def get_agent(self, agent_id: str) -> Optional[Agent]:
         return self._agents.get(agent_id)
 
+    def lock_for(self, agent_id: str) -> AnyLock:
+        return self._agent_locks.for_key(agent_id)
+
+    @property
+    def availability(self) -> AgentAvailabilityIndex:
+        return self._availability
+
+    @property
+    def waitlist_load(self) -> WaitlistLoadIndex:
+        return self._waitlist_load
+
     def list_agents(self) -> Dict[str, Agent]:
         return self._agents.copy()
-
-    def view_agents_work_history(self) -> Dict[str, list[str]]:
-        return {agent_id: agent.resolved_issue_ids.copy() for agent_id, agent in self._agents.items()}
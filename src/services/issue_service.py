@@ -1,19 +1,88 @@
-from typing import Any, Dict, Iterable, List, Optional
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from src.concurrency.locks import StripedLock, make_lock
+from src.data_models.ids import ISSUE_PREFIX, parse_id
 from src.data_models.issue import Issue
-from src.enums import IssueState, ProductType
+from src.enums import IssueEventType, IssueState, ProductType
+from src.events.bus import EventBus
+from src.events.event import IssueEvent
+from src.indexes.text_index import NearDuplicateIndex, TextIndex, tokenize
+from src.indexes.transaction_index import TransactionIndex
+
+_USER_KEYS = {"userId", "user_id"}
+_EMAIL_KEYS = {"email", "userEmail", "user_email"}
+_TYPE_KEYS = {"issueType", "type"}
+_STATE_KEYS = {"status", "state"}
+_AGENT_KEYS = {"agentId", "agent_id"}
+
+# (posting, posting key, residual predicate, index the posting lives in)
+_PlanStep = Tuple[array, Any, Callable[[Issue], bool], Dict[Any, array]]
+
+# Streaming reads copy postings this many numbers at a time, so a lock is never held for a whole scan.
+_CHUNK = 256
 
 
 class IssueService:
-    def __init__(self) -> None:
-        self._issues: Dict[str, Issue] = {}
-        self._issues_by_user: Dict[str, List[str]] = {}
-        self._issues_by_email: Dict[str, List[str]] = {}
+    def __init__(
+        self,
+        thread_safe: bool = False,
+        *,
+        id_offset: int = 0,
+        id_stride: int = 1,
+        store: Optional[Dict[int, Issue]] = None,
+        detect_duplicates: bool = False,
+        idempotency_capacity: int = 65_536,
+        idempotency_ttl: float = 3_600.0,
+    ) -> None:
+        # The authoritative issue store, keyed by issue number; other services hold the same dict.
+        self._issues: Dict[int, Issue] = {} if store is None else store
+        self._issues_by_user: Dict[str, array] = {}
+        self._issues_by_email: Dict[str, array] = {}
+        self._issues_by_type: Dict[ProductType, array] = {}
+        self._issues_by_state: Dict[IssueState, array] = {}
+        self._issues_by_agent: Dict[str, array] = {}
+        # Type postings are shared by many users, so removals leave holes that are compacted lazily.
+        self._removed_by_type: Dict[ProductType, int] = {}
         self._sequence = 0
+        # Shards interleave issue numbers (offset + 1, offset + 1 + stride, ...) so IDs stay globally unique.
+        self._id_offset = id_offset
+        self._id_stride = id_stride
+        self._sequence_lock = make_lock(thread_safe)
+        self._posting_locks = StripedLock(thread_safe, stripes=256)
+        # Keyword search is always maintained; MinHash dedupe costs a signature per ingest, so it is opt-in.
+        self._text_index = TextIndex()
+        self._duplicates = NearDuplicateIndex() if detect_duplicates else None
+        self._text_lock = make_lock(thread_safe)
+        # Client retries resend the same transaction; creation is idempotent per (transaction, type).
+        self._transactions = TransactionIndex(thread_safe, capacity=idempotency_capacity, ttl=idempotency_ttl)
+        self._transaction_locks = StripedLock(thread_safe)
+        # Optional cold tier (src.storage.IssueArchive) that old closed issues move to.
+        self._archive: Any = None
+        self.events = EventBus(thread_safe)
+
+    @property
+    def store(self) -> Dict[int, Issue]:
+        return self._issues
+
+    @property
+    def archive(self) -> Any:
+        return self._archive
+
+    def attach_archive(self, archive: Any) -> None:
+        self._archive = archive
+
+    @property
+    def id_layout(self) -> Tuple[int, int]:
+        return self._id_offset, self._id_stride
 
     def _next_id(self) -> str:
-        self._sequence += 1
-        return f"I{self._sequence}"
+        with self._sequence_lock:
+            self._sequence += 1
+            return f"I{(self._sequence - 1) * self._id_stride + self._id_offset + 1}"
 
     def create_issue(
         self,
@@ -23,80 +92,546 @@ class IssueService:
         description: str,
         user_id: str,
         user_email: str,
+        priority: int = 0,
+        deadline: Optional[float] = None,
+        now: Optional[float] = None,
     ) -> str:
-        issue_id = self._next_id()
-        issue = Issue(
-            issue_id=issue_id,
-            transaction_id=transaction_id,
-            issue_type=ProductType.from_value(issue_type),
-            subject=subject,
-            description=description,
-            state=IssueState.CREATED,
-            user_id=user_id,
-            user_email=user_email,
+        issue_id, _ = self.ingest_issue(
+            transaction_id, issue_type, subject, description, user_id, user_email, priority, deadline, now
         )
-        self._issues[issue_id] = issue
-        self._issues_by_user.setdefault(user_id, []).append(issue_id)
-        self._issues_by_email.setdefault(user_email, []).append(issue_id)
         return issue_id
 
-    def update_issue(self, issue_id: str, status: Any, resolution: Optional[str] = None) -> bool:
-        issue = self._issues.get(issue_id)
+    def ingest_issue(
+        self,
+        transaction_id: str,
+        issue_type: Any,
+        subject: str,
+        description: str,
+        user_id: str,
+        user_email: str,
+        priority: int = 0,
+        deadline: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> Tuple[str, bool]:
+        # Returns (issue_id, created); a retry of a known transaction gets the existing issue back.
+        now = time.time() if now is None else now
+        issue_id, issue = self._register(
+            transaction_id, issue_type, subject, description, user_id, user_email, priority, deadline, now=now, index=True
+        )
+        return issue_id, issue is not None
+
+    def _register(
+        self,
+        transaction_id: str,
+        issue_type: Any,
+        subject: str,
+        description: str,
+        user_id: str,
+        user_email: str,
+        priority: int = 0,
+        deadline: Optional[float] = None,
+        *,
+        now: float,
+        index: bool = False,
+    ) -> Tuple[str, Optional[Issue]]:
+        # Stores a new issue under its transaction, or returns the known one with no Issue. Unless
+        # index is set, the caller adds the new issue to the postings and text index itself.
+        key = (transaction_id, ProductType.from_value(issue_type))
+        with self._transaction_locks.for_key(key):
+            number = self._transactions.lookup(key, now)
+            if number is not None and self._exists(number):
+                return f"{ISSUE_PREFIX}{number}", None
+            issue_id = self._next_id()
+            issue = Issue(
+                issue_id=issue_id,
+                transaction_id=transaction_id,
+                issue_type=key[1],
+                subject=subject,
+                description=description,
+                state=IssueState.CREATED,
+                user_id=user_id,
+                user_email=user_email,
+                priority=priority,
+                deadline=deadline,
+            )
+            if index:
+                self._insert(issue)
+            else:
+                self._issues[issue.number] = issue
+            self._transactions.remember(key, issue.number, now)
+        return issue_id, issue
+
+    def create_issues_bulk(
+        self, rows: Iterable[Tuple[str, Any, str, str, str, str, int, Optional[float]]], *, now: Optional[float] = None
+    ) -> List[str]:
+        return [issue_id for issue_id, _ in self.ingest_issues_bulk(rows, now=now)]
+
+    def ingest_issues_bulk(
+        self, rows: Iterable[Tuple[str, Any, str, str, str, str, int, Optional[float]]], *, now: Optional[float] = None
+    ) -> List[Tuple[str, bool]]:
+        # One pass over the rows: each new issue is built and claimed under its transaction lock,
+        # then every posting key is locked once and takes its numbers as a single sorted run, and
+        # the text index is locked once for the whole batch.
+        now = time.time() if now is None else now
+        results: List[Tuple[str, bool]] = []
+        created: List[Tuple[Issue, List[str]]] = []
+        for row in rows:
+            issue_id, issue = self._register(*row, now=now)
+            results.append((issue_id, issue is not None))
+            if issue is not None:
+                created.append((issue, tokenize(f"{issue.subject} {issue.description}")))
+        if not created:
+            return results
+        by_user: Dict[str, List[int]] = {}
+        by_email: Dict[str, List[int]] = {}
+        by_type: Dict[ProductType, List[int]] = {}
+        numbers: List[int] = []
+        for issue, _ in created:
+            number = issue.number
+            numbers.append(number)
+            by_user.setdefault(issue.user_id, []).append(number)
+            by_email.setdefault(issue.user_email, []).append(number)
+            by_type.setdefault(issue.issue_type, []).append(number)
+        for postings, runs in (
+            (self._issues_by_user, by_user),
+            (self._issues_by_email, by_email),
+            (self._issues_by_type, by_type),
+            (self._issues_by_state, {IssueState.CREATED: numbers}),
+        ):
+            for key, run in runs.items():
+                self._extend_posting(postings, key, run)
+        with self._text_lock:
+            for issue, tokens in created:
+                self._text_index.add(issue.number, tokens)
+                if self._duplicates is not None:
+                    self._duplicates.track(issue.number, tokens)
+        for issue, _ in created:
+            self.events.publish(IssueEventType.CREATED, issue)
+        return results
+
+    def _insert(self, issue: Issue) -> None:
+        number = issue.number
+        self._issues[number] = issue
+        self._append_posting(self._issues_by_user, issue.user_id, number)
+        self._append_posting(self._issues_by_email, issue.user_email, number)
+        self._append_posting(self._issues_by_type, issue.issue_type, number)
+        self._append_posting(self._issues_by_state, issue.state, number)
+        tokens = tokenize(f"{issue.subject} {issue.description}")
+        with self._text_lock:
+            self._text_index.add(number, tokens)
+            if self._duplicates is not None:
+                self._duplicates.track(number, tokens)
+        self.events.publish(IssueEventType.CREATED, issue)
+
+    def _append_posting(self, postings: Dict[Any, array], key: Any, number: int) -> None:
+        with self._posting_locks.for_key(key):
+            posting = postings.get(key)
+            if posting is None:
+                posting = postings[key] = array("q")
+            # Concurrent creators and state or agent changes arrive out of order; keep postings
+            # sorted for keyset reads.
+            if posting and posting[-1] > number:
+                insort(posting, number)
+            else:
+                posting.append(number)
+
+    def _extend_posting(self, postings: Dict[Any, array], key: Any, run: List[int]) -> None:
+        # run is ascending; it is appended in one go unless a concurrent creator got past it.
+        with self._posting_locks.for_key(key):
+            posting = postings.get(key)
+            if posting is None:
+                posting = postings[key] = array("q")
+            if posting and posting[-1] > run[0]:
+                for number in run:
+                    insort(posting, number)
+            else:
+                posting.extend(run)
+
+    def _remove_posting(self, postings: Dict[Any, array], key: Any, number: int) -> None:
+        with self._posting_locks.for_key(key):
+            posting = postings.get(key)
+            if posting is None:
+                return
+            index = bisect_left(posting, number)
+            if index < len(posting) and posting[index] == number:
+                del posting[index]
+
+    def _lookup(self, issue_id: str) -> Optional[Issue]:
+        # For mutations: touching an archived issue brings it back into the hot store.
+        number = parse_id(ISSUE_PREFIX, issue_id)
+        issue = self._issues.get(number)
+        if issue is None and number is not None and self._archive is not None:
+            issue = self._archive.get(number)
+            if issue is not None:
+                self._archive.evict(number)
+                self._issues[number] = issue
+        return issue
+
+    def _fetch(self, number: int) -> Optional[Issue]:
+        # For reads: archived issues are served from the archive without being restored.
+        issue = self._issues.get(number)
+        if issue is None and self._archive is not None:
+            issue = self._archive.get(number)
+        return issue
+
+    def _fetch_many(self, numbers: Iterable[int]) -> List[Issue]:
+        issues = self._issues
+        found = [(number, issues.get(number)) for number in numbers]
+        if self._archive is not None:
+            archived = self._archive.get_many([number for number, issue in found if issue is None])
+            if archived:
+                found = [(number, issue or archived.get(number)) for number, issue in found]
+        return [issue for _, issue in found if issue is not None]
+
+    def _exists(self, number: int) -> bool:
+        return number in self._issues or (self._archive is not None and number in self._archive)
+
+    def _all_issues(self) -> List[Issue]:
+        if self._archive is None:
+            return list(self._issues.values())
+        return self._fetch_many(sorted(set(self._issues).union(self._archive.numbers())))
+
+    def _set_state(self, issue: Issue, state: IssueState) -> None:
+        if issue.state == state:
+            return
+        self._remove_posting(self._issues_by_state, issue.state, issue.number)
+        self._append_posting(self._issues_by_state, state, issue.number)
+        if IssueState.CLOSED in (issue.state, state):
+            key = (issue.transaction_id, issue.issue_type)
+            if state is IssueState.CLOSED:
+                self._transactions.closed(key, issue.number)
+            else:
+                self._transactions.reopened(key, issue.number)
+            if self._duplicates is not None:
+                # Only open issues are dedupe candidates; a reopened issue rejoins its old cluster.
+                with self._text_lock:
+                    if state is IssueState.CLOSED:
+                        self._duplicates.untrack(issue.number)
+                    else:
+                        self._duplicates.track(issue.number, tokenize(f"{issue.subject} {issue.description}"))
+        issue.state = state
+
+    def _set_agent(self, issue: Issue, agent_id: Optional[str]) -> None:
+        if issue.agent_id == agent_id:
+            return
+        if issue.agent_id is not None:
+            self._remove_posting(self._issues_by_agent, issue.agent_id, issue.number)
+        if agent_id is not None:
+            self._append_posting(self._issues_by_agent, agent_id, issue.number)
+        issue.agent_id = agent_id
+
+    def update_issue(
+        self, issue_id: str, status: Any, resolution: Optional[str] = None, *, now: Optional[float] = None
+    ) -> bool:
+        issue = self._lookup(issue_id)
         if not issue:
             return False
-        issue.state = IssueState.from_value(status)
+        previous_state = issue.state
+        self._set_state(issue, IssueState.from_value(status))
         if resolution is not None:
             issue.resolution = resolution
+        closed = issue.state is IssueState.CLOSED and previous_state is not IssueState.CLOSED
+        self.events.publish(IssueEventType.CLOSED if closed else IssueEventType.UPDATED, issue, previous_state, timestamp=now)
         return True
 
     def get_issue(self, filters: Optional[Dict[str, Any]] = None) -> List[Issue]:
         if not filters:
-            return list(self._issues.values())
+            return self._all_issues()
 
-        def matches(issue: Issue) -> bool:
-            for key, value in filters.items():
-                if key in {"userId", "user_id"} and issue.user_id != value:
-                    return False
-                if key in {"email", "userEmail", "user_email"} and issue.user_email != value:
-                    return False
-                if key in {"issueType", "type"} and issue.issue_type != ProductType.from_value(value):
-                    return False
-                if key in {"status", "state"} and issue.state != IssueState.from_value(value):
-                    return False
-            return True
+        plan = self._plan(filters)
+        if not plan:
+            return self._all_issues()
+        plan.sort(key=lambda step: len(step[0]))
+        (posting, key, _, _), residual = plan[0], [step[2] for step in plan[1:]]
+        with self._posting_locks.for_key(key):
+            driver = tuple(posting)
+        return [issue for issue in self._fetch_many(driver) if all(predicate(issue) for predicate in residual)]
 
-        return [issue for issue in self._issues.values() if matches(issue)]
+    def iter_issues(
+        self, filters: Optional[Dict[str, Any]] = None, *, cursor: Optional[int] = None, descending: bool = False
+    ) -> Iterator[Issue]:
+        # Keyset iteration in issue-number order. The cursor is the number of the last issue seen, so
+        # it stays valid while issues are created, and only one chunk of numbers is held at a time.
+        plan = self._plan(filters) if filters else []
+        if not plan:
+            numbers = self._walk_all(cursor, descending)
+            residual: List[Callable[[Issue], bool]] = []
+        else:
+            plan.sort(key=lambda step: len(step[0]))
+            (_, key, _, postings), rest = plan[0], plan[1:]
+            residual = [step[2] for step in rest]
+            numbers = self._walk_sorted(postings, key, cursor, descending)
+        for number in numbers:
+            issue = self._fetch(number)
+            if issue is not None and all(check(issue) for check in residual):
+                yield issue
+
+    def page_issues(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[int] = None,
+        limit: int = 100,
+        *,
+        descending: bool = False,
+    ) -> Tuple[List[Issue], Optional[int]]:
+        if limit < 1:
+            raise ValueError(f"limit must be positive, got {limit}")
+        iterator = self.iter_issues(filters, cursor=cursor, descending=descending)
+        page = list(islice(iterator, limit))
+        if page and next(iterator, None) is not None:
+            return page, page[-1].number
+        return page, None
+
+    def _walk_all(self, cursor: Optional[int], descending: bool) -> Iterator[int]:
+        # Issue numbers are offset + 1 + k * stride, so the number space itself is the keyset.
+        stride = self._id_stride
+        first = self._id_offset + 1
+        if descending:
+            highest = (self._sequence - 1) * stride + first
+            number = highest if cursor is None else min(highest, cursor - 1)
+            number -= (number - first) % stride
+            while number >= first:
+                yield number
+                number -= stride
+        else:
+            number = first if cursor is None or cursor < first else cursor + 1
+            number += -(number - first) % stride
+            while number <= (self._sequence - 1) * stride + first:
+                yield number
+                number += stride
+
+    def _walk_sorted(
+        self, postings: Dict[Any, array], key: Any, cursor: Optional[int], descending: bool
+    ) -> Iterator[int]:
+        last = cursor
+        while True:
+            with self._posting_locks.for_key(key):
+                posting = postings.get(key, ())
+                if descending:
+                    end = len(posting) if last is None else bisect_left(posting, last)
+                    chunk = posting[max(0, end - _CHUNK):end][::-1]
+                else:
+                    start = 0 if last is None else bisect_right(posting, last)
+                    chunk = posting[start:start + _CHUNK]
+            if not chunk:
+                return
+            yield from chunk
+            last = chunk[-1]
+
+    def _plan(self, filters: Dict[str, Any]) -> List[_PlanStep]:
+        plan: List[_PlanStep] = []
+        for key, value in filters.items():
+            if key in _USER_KEYS:
+                plan.append(
+                    (self._issues_by_user.get(value, ()), value, lambda issue, value=value: issue.user_id == value, self._issues_by_user)
+                )
+            elif key in _EMAIL_KEYS:
+                plan.append(
+                    (self._issues_by_email.get(value, ()), value, lambda issue, value=value: issue.user_email == value, self._issues_by_email)
+                )
+            elif key in _TYPE_KEYS:
+                issue_type = ProductType.from_value(value)
+                plan.append(
+                    (
+                        self._issues_by_type.get(issue_type, ()),
+                        issue_type,
+                        lambda issue, value=issue_type: issue.issue_type is value,
+                        self._issues_by_type,
+                    )
+                )
+            elif key in _STATE_KEYS:
+                state = IssueState.from_value(value)
+                plan.append(
+                    (self._issues_by_state.get(state, ()), state, lambda issue, value=state: issue.state is value, self._issues_by_state)
+                )
+            elif key in _AGENT_KEYS:
+                plan.append(
+                    (self._issues_by_agent.get(value, ()), value, lambda issue, value=value: issue.agent_id == value, self._issues_by_agent)
+                )
+        return plan
 
     def assign_agent(self, issue_id: str, agent_id: str) -> bool:
-        issue = self._issues.get(issue_id)
+        issue = self._lookup(issue_id)
         if not issue:
             return False
-        issue.state = IssueState.PENDING
-        issue.agent_id = agent_id
+        previous_state = issue.state
+        self._set_state(issue, IssueState.PENDING)
+        self._set_agent(issue, agent_id)
+        self.events.publish(IssueEventType.ASSIGNED, issue, previous_state)
         return True
 
-    def resolve_issue(self, issue_id: str, resolution: str) -> bool:
-        issue = self._issues.get(issue_id)
+    def resolve_issue(self, issue_id: str, resolution: str, *, now: Optional[float] = None) -> bool:
+        issue = self._lookup(issue_id)
         if not issue:
             return False
-        issue.state = IssueState.CLOSED
+        previous_state = issue.state
+        self._set_state(issue, IssueState.CLOSED)
         issue.resolution = resolution
+        kind = IssueEventType.UPDATED if previous_state is IssueState.CLOSED else IssueEventType.CLOSED
+        self.events.publish(kind, issue, previous_state, timestamp=now)
         return True
 
     def mark_waitlisted(self, issue_id: str) -> bool:
-        issue = self._issues.get(issue_id)
+        issue = self._lookup(issue_id)
+        if not issue:
+            return False
+        previous_state = issue.state
+        self._set_state(issue, IssueState.WAITING)
+        self.events.publish(IssueEventType.WAITLISTED, issue, previous_state)
+        return True
+
+    def release_agent(self, issue_id: str) -> bool:
+        # Takes an in-flight issue back from its agent; it waits again until rerouted.
+        issue = self._lookup(issue_id)
+        if not issue or issue.agent_id is None:
+            return False
+        previous_state = issue.state
+        self._set_agent(issue, None)
+        self._set_state(issue, IssueState.WAITING)
+        self.events.publish(IssueEventType.WAITLISTED, issue, previous_state)
+        return True
+
+    def set_priority(self, issue_id: str, priority: int) -> bool:
+        issue = self._lookup(issue_id)
         if not issue:
             return False
-        issue.state = IssueState.WAITING
+        issue.priority = priority
         return True
 
+    def record_sla_event(self, issue_id: str, kind: IssueEventType) -> Optional[IssueEvent]:
+        # SLA events leave the state untouched, so state-driven views ignore them.
+        issue = self._lookup(issue_id)
+        if not issue:
+            return None
+        return self.events.publish(kind, issue, issue.state)
+
+    def iter_issues_for_user(
+        self, user_id: str, *, cursor: Optional[int] = None, descending: bool = False
+    ) -> Iterator[Issue]:
+        for number in self._walk_sorted(self._issues_by_user, user_id, cursor, descending):
+            issue = self._fetch(number)
+            if issue is not None:
+                yield issue
+
+    def iter_issues_for_email(
+        self, email: str, *, cursor: Optional[int] = None, descending: bool = False
+    ) -> Iterator[Issue]:
+        for number in self._walk_sorted(self._issues_by_email, email, cursor, descending):
+            issue = self._fetch(number)
+            if issue is not None:
+                yield issue
+
+    def remove_issues(self, issues: Iterable[Issue]) -> List[Issue]:
+        # Cost is proportional to the removed issues plus the user/email postings they live in.
+        removed: Dict[int, Issue] = {}
+        archive = self._archive
+        for issue in issues:
+            number = issue.number
+            if self._issues.pop(number, None) is None and not (archive is not None and number in archive):
+                continue
+            removed[number] = issue
+            self._transactions.forget((issue.transaction_id, issue.issue_type), number)
+            self._remove_posting(self._issues_by_state, issue.state, number)
+            if issue.agent_id is not None:
+                self._remove_posting(self._issues_by_agent, issue.agent_id, number)
+            self.events.publish(IssueEventType.DELETED, issue, issue.state)
+        if not removed:
+            return []
+        if archive is not None:
+            archive.discard(removed)
+        with self._text_lock:
+            if self._duplicates is not None:
+                for number in removed:
+                    self._duplicates.forget(number)
+            entries = sum(len(set(tokenize(f"{issue.subject} {issue.description}"))) for issue in removed.values())
+            self._text_index.removed(entries, self._issues.__contains__)
+        for postings, keys in (
+            (self._issues_by_user, {issue.user_id for issue in removed.values()}),
+            (self._issues_by_email, {issue.user_email for issue in removed.values()}),
+        ):
+            for key in keys:
+                with self._posting_locks.for_key(key):
+                    remaining = array("q", (n for n in postings.get(key, ()) if n not in removed))
+                    if remaining:
+                        postings[key] = remaining
+                    else:
+                        postings.pop(key, None)
+        for issue in removed.values():
+            self._removed_by_type[issue.issue_type] = self._removed_by_type.get(issue.issue_type, 0) + 1
+        for issue_type in {issue.issue_type for issue in removed.values()}:
+            with self._posting_locks.for_key(issue_type):
+                posting = self._issues_by_type.get(issue_type)
+                if posting is not None and 2 * self._removed_by_type[issue_type] > len(posting):
+                    self._issues_by_type[issue_type] = array("q", (n for n in posting if self._exists(n)))
+                    self._removed_by_type[issue_type] = 0
+        return list(removed.values())
+
+    def search_issues(
+        self, query: str, *, prefix: bool = True, open_only: bool = False, limit: int = 100
+    ) -> List[Issue]:
+        # Issues whose subject or description contains every query word, newest first.
+        if limit < 1:
+            raise ValueError(f"limit must be positive, got {limit}")
+        with self._text_lock:
+            numbers = self._text_index.match(query, prefix=prefix)
+        matched: List[Issue] = []
+        for number in sorted(numbers, reverse=True):
+            issue = self._issues.get(number)
+            if issue is None or (open_only and issue.state is IssueState.CLOSED):
+                continue
+            matched.append(issue)
+            if len(matched) == limit:
+                break
+        return matched
+
+    def idempotency_stats(self) -> Dict[str, int]:
+        return self._transactions.stats()
+
+    @property
+    def detects_duplicates(self) -> bool:
+        return self._duplicates is not None
+
+    def primary_of(self, issue_id: str) -> Optional[Issue]:
+        if self._duplicates is None:
+            return None
+        with self._text_lock:
+            number = self._duplicates.primary_of(parse_id(ISSUE_PREFIX, issue_id))
+        return None if number is None else self._fetch(number)
+
+    def duplicates_of(self, issue_id: str) -> List[Issue]:
+        if self._duplicates is None:
+            return []
+        with self._text_lock:
+            numbers = self._duplicates.duplicates_of(parse_id(ISSUE_PREFIX, issue_id))
+        return self._fetch_many(numbers)
+
+    def archive_issues(self, issues: Iterable[Issue], *, rewrite: bool = True) -> int:
+        # Moves closed issues to the cold tier. Postings keep their numbers (8 bytes each), so
+        # filtered reads still find them; only the Issue objects and the keyword entries go.
+        # With rewrite=False an issue the archive already holds only leaves the hot store.
+        if self._archive is None:
+            raise ValueError("No archive is attached")
+        batch = [issue for issue in issues if issue.state is IssueState.CLOSED and self._issues.get(issue.number) is issue]
+        if not batch:
+            return 0
+        self._archive.append(batch if rewrite else [issue for issue in batch if issue.number not in self._archive])
+        for issue in batch:
+            self._issues.pop(issue.number, None)
+        with self._text_lock:
+            entries = sum(len(set(tokenize(f"{issue.subject} {issue.description}"))) for issue in batch)
+            self._text_index.removed(entries, self._issues.__contains__)
+        return len(batch)
+
     def list_issues_for_user(self, user_id: str) -> List[Issue]:
-        issue_ids = self._issues_by_user.get(user_id, [])
-        return [self._issues[iid] for iid in issue_ids if iid in self._issues]
+        with self._posting_locks.for_key(user_id):
+            numbers = tuple(self._issues_by_user.get(user_id, ()))
+        return self._fetch_many(numbers)
 
     def list_issues_for_email(self, email: str) -> List[Issue]:
-        issue_ids = self._issues_by_email.get(email, [])
-        return [self._issues[iid] for iid in issue_ids if iid in self._issues]
+        with self._posting_locks.for_key(email):
+            numbers = tuple(self._issues_by_email.get(email, ()))
+        return self._fetch_many(numbers)
 
     def get_issue_by_id(self, issue_id: str) -> Optional[Issue]:
-        return self._issues.get(issue_id)
+        number = parse_id(ISSUE_PREFIX, issue_id)
+        return None if number is None else self._fetch(number)
@@ -0,0 +1,114 @@
+import heapq
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.data_models.agent import Agent
+from src.enums import ProductType
+
+_NO_PATH = float("-inf")
+_EPSILON = 1e-9
+
+
+# Issues of one product type are interchangeable, so matching them to free agents is a
+# transportation problem with one source per type. Augmenting paths are searched over the
+# type nodes only: the edge T -> T' is the best agent matched to T' that could move to T.
+class RatingMatcher:
+    def __init__(
+        self,
+        demand: Dict[ProductType, int],
+        agents: Sequence[Agent],
+        eligible: Optional[Callable[[Agent, ProductType], bool]] = None,
+    ) -> None:
+        self._remaining = {issue_type: count for issue_type, count in demand.items() if count > 0}
+        self._types = list(self._remaining)
+        self._order = {agent.agent_id: index for index, agent in enumerate(agents)}
+        self._weights: Dict[str, Dict[ProductType, float]] = {}
+        self._assigned: Dict[str, Optional[ProductType]] = {}
+        self._free_best: Dict[ProductType, List[Tuple[float, int, str]]] = {t: [] for t in self._types}
+        self._swap_best: Dict[Tuple[ProductType, ProductType], List[Tuple[float, int, str]]] = {}
+        for agent in agents:
+            weights = {
+                issue_type: agent.ratings.get(issue_type, 0.0)
+                for issue_type in self._types
+                if issue_type in agent.supported_issue_types and (eligible is None or eligible(agent, issue_type))
+            }
+            if not weights:
+                continue
+            self._weights[agent.agent_id] = weights
+            self._assigned[agent.agent_id] = None
+            for issue_type, weight in weights.items():
+                self._free_best[issue_type].append((-weight, self._order[agent.agent_id], agent.agent_id))
+        for heap in self._free_best.values():
+            heapq.heapify(heap)
+
+    def solve(self) -> Dict[ProductType, List[str]]:
+        while self._augment():
+            pass
+        matched: Dict[ProductType, List[Tuple[float, int, str]]] = {}
+        for agent_id, issue_type in self._assigned.items():
+            if issue_type is not None:
+                entry = (-self._weights[agent_id][issue_type], self._order[agent_id], agent_id)
+                matched.setdefault(issue_type, []).append(entry)
+        return {issue_type: [agent_id for *_, agent_id in sorted(entries)] for issue_type, entries in matched.items()}
+
+    def _augment(self) -> bool:
+        sources = [issue_type for issue_type in self._types if self._remaining[issue_type] > 0]
+        if not sources:
+            return False
+        dist: Dict[ProductType, float] = {}
+        step: Dict[ProductType, Tuple[str, Optional[ProductType]]] = {}
+        for issue_type in self._types:
+            agent_id = self._peek_free(issue_type)
+            dist[issue_type] = self._weights[agent_id][issue_type] if agent_id else _NO_PATH
+            if agent_id:
+                step[issue_type] = (agent_id, None)
+        for _ in range(len(self._types)):
+            changed = False
+            for target in self._types:
+                for current in self._types:
+                    if current == target or dist[current] == _NO_PATH:
+                        continue
+                    agent_id = self._peek_swap(target, current)
+                    if not agent_id:
+                        continue
+                    weights = self._weights[agent_id]
+                    gain = weights[target] - weights[current] + dist[current]
+                    if gain > dist[target] + _EPSILON:
+                        dist[target] = gain
+                        step[target] = (agent_id, current)
+                        changed = True
+            if not changed:
+                break
+
+        source = max(sources, key=lambda issue_type: dist[issue_type])
+        if dist[source] == _NO_PATH:
+            return False
+        self._remaining[source] -= 1
+        current: Optional[ProductType] = source
+        visited = set()
+        while current is not None and current not in visited:
+            visited.add(current)
+            agent_id, previous = step[current]
+            self._assign(agent_id, current)
+            current = previous
+        return True
+
+    def _assign(self, agent_id: str, issue_type: ProductType) -> None:
+        self._assigned[agent_id] = issue_type
+        weights = self._weights[agent_id]
+        order = self._order[agent_id]
+        for other_type, weight in weights.items():
+            if other_type != issue_type:
+                heap = self._swap_best.setdefault((other_type, issue_type), [])
+                heapq.heappush(heap, (-(weight - weights[issue_type]), order, agent_id))
+
+    def _peek_free(self, issue_type: ProductType) -> Optional[str]:
+        heap = self._free_best[issue_type]
+        while heap and self._assigned[heap[0][2]] is not None:
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
+    def _peek_swap(self, target: ProductType, current: ProductType) -> Optional[str]:
+        heap = self._swap_best.get((target, current))
+        while heap and self._assigned[heap[0][2]] != current:
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
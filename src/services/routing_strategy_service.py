@@ -1,10 +1,14 @@
+import heapq
 from collections import OrderedDict
-from typing import Dict, Iterable, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from src.data_models.agent import Agent
 from src.data_models.issue import Issue
 from src.data_models.strategy import Strategy
-from src.enums import StrategyType
+from src.enums import ProductType, StrategyType
+from src.indexes.agent_availability_index import AgentAvailabilityIndex
+from src.scoring import AgentFeatureMatrix, get_scorer
+from src.services.rating_matcher import RatingMatcher
 
 
 class RoutingStrategyService:
@@ -12,23 +16,38 @@ class RoutingStrategyService:
         self._strategies: Dict[str, Strategy] = OrderedDict()
         self._sequence = 0
         self._active_strategy_id: Optional[str] = None
+        self._scoring: Optional[AgentFeatureMatrix] = None
 
     def _next_id(self) -> str:
         self._sequence += 1
         return f"S{self._sequence}"
 
-    def create_strategy(self, strategy_type: StrategyType) -> str:
+    def attach_scoring(self, matrix: AgentFeatureMatrix) -> None:
+        self._scoring = matrix
+
+    def _check_scorer(self, strategy_type: StrategyType, scorer: Optional[str]) -> None:
+        if strategy_type is not StrategyType.SCORED:
+            if scorer is not None:
+                raise ValueError(f"Only scored strategies take a scorer, got {strategy_type.value}")
+            return
+        if self._scoring is None:
+            raise ValueError("Scored strategies need scoring to be enabled")
+        get_scorer(scorer)
+
+    def create_strategy(self, strategy_type: StrategyType, *, scorer: Optional[str] = None) -> str:
+        self._check_scorer(strategy_type, scorer)
         strategy_id = self._next_id()
-        strategy = Strategy(strategy_id=strategy_id, strategy_type=strategy_type)
+        strategy = Strategy(strategy_id=strategy_id, strategy_type=strategy_type, scorer=scorer)
         self._strategies[strategy_id] = strategy
         if self._active_strategy_id is None:
             self._active_strategy_id = strategy_id
         return strategy_id
 
-    def update_strategy(self, strategy_id: str, strategy_type: StrategyType) -> bool:
+    def update_strategy(self, strategy_id: str, strategy_type: StrategyType, *, scorer: Optional[str] = None) -> bool:
         if strategy_id not in self._strategies:
             return False
-        self._strategies[strategy_id] = Strategy(strategy_id=strategy_id, strategy_type=strategy_type)
+        self._check_scorer(strategy_type, scorer)
+        self._strategies[strategy_id] = Strategy(strategy_id=strategy_id, strategy_type=strategy_type, scorer=scorer)
         return True
 
     def set_active_strategy(self, strategy_id: str) -> bool:
@@ -51,6 +70,16 @@ class RoutingStrategyService:
         if not candidates:
             return None
 
+        if strategy.strategy_type == StrategyType.SCORED:
+            return self._scoring.best(
+                issue.issue_type, get_scorer(strategy.scorer), among=[agent.agent_id for agent in candidates]
+            )
+
+        if strategy.strategy_type == StrategyType.CAPACITY:
+            issue_type = issue.issue_type
+            best = max(candidates, key=lambda agent: (agent.spare_slots(issue_type), agent.ratings.get(issue_type, 0.0)))
+            return best.agent_id
+
         if strategy.strategy_type == StrategyType.RATING:
             best_agent = None
             best_score = float("-inf")
@@ -63,5 +92,184 @@ class RoutingStrategyService:
 
         return candidates[0].agent_id
 
+    def assign_from_pool(self, issue: Issue, pool: AgentAvailabilityIndex) -> Optional[str]:
+        strategy = self.get_active_strategy()
+        if not strategy:
+            return None
+        if strategy.strategy_type == StrategyType.RATING:
+            return pool.best_rated(issue.issue_type)
+        if strategy.strategy_type == StrategyType.CAPACITY:
+            return pool.most_spare(issue.issue_type)
+        if strategy.strategy_type == StrategyType.SCORED:
+            return self._scoring.best(issue.issue_type, get_scorer(strategy.scorer))
+        return pool.first_available(issue.issue_type)
+
+    def assign_batch(
+        self,
+        issues: Sequence[Issue],
+        pool: AgentAvailabilityIndex,
+        get_agent: Callable[[str], Optional[Agent]],
+    ) -> Dict[str, str]:
+        strategy = self.get_active_strategy()
+        if not strategy or not issues:
+            return {}
+
+        queues: Dict[ProductType, List[Issue]] = {}
+        for issue in issues:
+            queues.setdefault(issue.issue_type, []).append(issue)
+        ledger = _SlotLedger(get_agent)
+
+        if strategy.strategy_type == StrategyType.RATING:
+            return self._match_by_rating(queues, pool, get_agent, ledger)
+        if strategy.strategy_type == StrategyType.CAPACITY:
+            return self._fill_by_capacity(issues, queues, pool, get_agent, ledger)
+        if strategy.strategy_type == StrategyType.SCORED:
+            return self._rank_by_score(issues, queues, self._scoring, strategy.scorer, ledger)
+
+        candidates = {issue_type: pool.available_agents(issue_type) for issue_type in queues}
+        cursors = dict.fromkeys(queues, 0)
+        assignments: Dict[str, str] = {}
+        for issue in issues:
+            issue_type = issue.issue_type
+            ordered = candidates[issue_type]
+            cursor = cursors[issue_type]
+            while cursor < len(ordered) and not ledger.spare(ordered[cursor], issue_type):
+                cursor += 1
+            cursors[issue_type] = cursor
+            if cursor < len(ordered):
+                ledger.take(ordered[cursor], issue_type)
+                assignments[issue.issue_id] = ordered[cursor]
+        return assignments
+
+    @staticmethod
+    def _match_by_rating(
+        queues: Dict[ProductType, List[Issue]],
+        pool: AgentAvailabilityIndex,
+        get_agent: Callable[[str], Optional[Agent]],
+        ledger: "_SlotLedger",
+    ) -> Dict[str, str]:
+        # Each matching round gives every agent at most one issue; agents with spare slots left
+        # take part in the next round until demand or capacity runs out.
+        candidates = {issue_type: pool.available_agents(issue_type) for issue_type in queues}
+        taken = dict.fromkeys(queues, 0)
+        assignments: Dict[str, str] = {}
+        demand = {issue_type: len(queue) for issue_type, queue in queues.items()}
+        while demand:
+            free_ids = sorted(
+                {agent_id for issue_type in demand for agent_id in candidates[issue_type] if ledger.spare(agent_id, issue_type)},
+                key=pool.arrival_order,
+            )
+            agents = [agent for agent in map(get_agent, free_ids) if agent]
+            matched = RatingMatcher(demand, agents, lambda agent, issue_type: ledger.spare(agent.agent_id, issue_type) > 0).solve()
+            if not matched:
+                break
+            for issue_type, agent_ids in matched.items():
+                queue = queues[issue_type]
+                for agent_id in agent_ids:
+                    assignments[queue[taken[issue_type]].issue_id] = agent_id
+                    taken[issue_type] += 1
+                    ledger.take(agent_id, issue_type)
+            demand = {issue_type: len(queues[issue_type]) - taken[issue_type] for issue_type in demand}
+            demand = {issue_type: count for issue_type, count in demand.items() if count}
+        return assignments
+
+    @staticmethod
+    def _fill_by_capacity(
+        issues: Sequence[Issue],
+        queues: Dict[ProductType, List[Issue]],
+        pool: AgentAvailabilityIndex,
+        get_agent: Callable[[str], Optional[Agent]],
+        ledger: "_SlotLedger",
+    ) -> Dict[str, str]:
+        heaps: Dict[ProductType, List[Tuple[int, float, int, str]]] = {}
+        for issue_type in queues:
+            heap = heaps[issue_type] = []
+            for agent_id in pool.agents_by_spare_capacity(issue_type):
+                agent = get_agent(agent_id)
+                if agent:
+                    rating = -agent.ratings.get(issue_type, 0.0)
+                    heap.append((-ledger.spare(agent_id, issue_type), rating, pool.arrival_order(agent_id), agent_id))
+            heapq.heapify(heap)
+        assignments: Dict[str, str] = {}
+        for issue in issues:
+            heap = heaps[issue.issue_type]
+            while heap:
+                negative_spare, rating, order, agent_id = heap[0]
+                spare = ledger.spare(agent_id, issue.issue_type)
+                if spare != -negative_spare:
+                    # Slots of another type used the agent's overall capacity; re-rank it.
+                    if spare:
+                        heapq.heapreplace(heap, (-spare, rating, order, agent_id))
+                    else:
+                        heapq.heappop(heap)
+                    continue
+                ledger.take(agent_id, issue.issue_type)
+                assignments[issue.issue_id] = agent_id
+                if spare > 1:
+                    heapq.heapreplace(heap, (1 - spare, rating, order, agent_id))
+                else:
+                    heapq.heappop(heap)
+                break
+        return assignments
+
+    @staticmethod
+    def _rank_by_score(
+        issues: Sequence[Issue],
+        queues: Dict[ProductType, List[Issue]],
+        matrix: AgentFeatureMatrix,
+        scorer_name: str,
+        ledger: "_SlotLedger",
+    ) -> Dict[str, str]:
+        # Scores are taken once per type for the whole batch, so a load-based scorer sees loads as
+        # of the batch start; the ledger still keeps every agent within its slots. Only the top
+        # agents for the queue length are ranked unless the ledger exhausts them.
+        scorer = get_scorer(scorer_name)
+        ranked = {issue_type: matrix.ranked(issue_type, scorer, len(queue)) for issue_type, queue in queues.items()}
+        complete = {issue_type: len(ranked[issue_type]) < len(queue) for issue_type, queue in queues.items()}
+        cursors = dict.fromkeys(queues, 0)
+        assignments: Dict[str, str] = {}
+        for issue in issues:
+            issue_type = issue.issue_type
+            ordered = ranked[issue_type]
+            cursor = cursors[issue_type]
+            while True:
+                while cursor < len(ordered) and not ledger.spare(ordered[cursor], issue_type):
+                    cursor += 1
+                if cursor < len(ordered) or complete[issue_type]:
+                    break
+                ordered = ranked[issue_type] = matrix.ranked(issue_type, scorer)
+                complete[issue_type] = True
+                cursor = 0
+            cursors[issue_type] = cursor
+            if cursor < len(ordered):
+                ledger.take(ordered[cursor], issue_type)
+                assignments[issue.issue_id] = ordered[cursor]
+        return assignments
+
     def list_strategies(self) -> Dict[str, Strategy]:
         return self._strategies.copy()
+
+
+class _SlotLedger:
+    # Tracks slots handed out during one batch, since agents only see them once the batch is applied.
+    def __init__(self, get_agent: Callable[[str], Optional[Agent]]) -> None:
+        self._get_agent = get_agent
+        self._by_type: Dict[Tuple[str, ProductType], int] = {}
+        self._total: Dict[str, int] = {}
+
+    def spare(self, agent_id: str, issue_type: ProductType) -> int:
+        agent = self._get_agent(agent_id)
+        if not agent:
+            return 0
+        used_total = self._total.get(agent_id, 0)
+        if not used_total:
+            return agent.spare_slots(issue_type)
+        spare = min(
+            agent.spare_slots(issue_type) - self._by_type.get((agent_id, issue_type), 0),
+            agent.max_concurrent - len(agent.active_issue_ids) - used_total,
+        )
+        return spare if spare > 0 else 0
+
+    def take(self, agent_id: str, issue_type: ProductType) -> None:
+        self._by_type[(agent_id, issue_type)] = self._by_type.get((agent_id, issue_type), 0) + 1
+        self._total[agent_id] = self._total.get(agent_id, 0) + 1
@@ -1,38 +1,63 @@
-from typing import Dict, Iterable, List, Optional
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
+from src.concurrency.locks import StripedLock, make_lock
+from src.data_models.ids import ISSUE_PREFIX, parse_id
 from src.data_models.user import User
 from src.data_models.issue import Issue
-from src.enums import ProductType
+from src.enums import IssueEventType, IssueState, ProductType
+from src.events.event import IssueEvent
+
+_CHUNK = 256
 
 
 class UserService:
-    def __init__(self) -> None:
+    def __init__(self, thread_safe: bool = False, *, store: Optional[Dict[int, Issue]] = None) -> None:
         self._users: Dict[str, User] = {}
         self._users_by_email: Dict[str, str] = {}
         self._sequence = 0
-        self._issues: Dict[str, Issue] = {}
+        # A read-only view of the issue store owned by IssueService.
+        self._issues: Dict[int, Issue] = {} if store is None else store
+        self._archive: Any = None
+        self._sequence_lock = make_lock(thread_safe)
+        self._email_locks = StripedLock(thread_safe)
+        self._user_locks = StripedLock(thread_safe)
+
+    def attach_archive(self, archive: Any) -> None:
+        # Issues moved to the cold tier are still listed for their users, read from the archive.
+        self._archive = archive
+
+    def _fetch(self, number: int) -> Optional[Issue]:
+        issue = self._issues.get(number)
+        if issue is None and self._archive is not None:
+            issue = self._archive.get(number)
+        return issue
 
     def _next_id(self) -> str:
-        self._sequence += 1
-        return f"U{self._sequence}"
+        with self._sequence_lock:
+            self._sequence += 1
+            return f"U{self._sequence}"
 
     def create_user(self, name: str, email: str, active_products: Iterable[str]) -> str:
-        if email in self._users_by_email:
-            return self._users_by_email[email]
-        user_id = self._next_id()
-        products = {ProductType.from_value(product) for product in active_products}
-        user = User(user_id=user_id, name=name, email=email, active_products=products)
-        self._users[user_id] = user
-        self._users_by_email[email] = user_id
-        return user_id
+        with self._email_locks.for_key(email):
+            if email in self._users_by_email:
+                return self._users_by_email[email]
+            user_id = sys.intern(self._next_id())
+            email = sys.intern(email)
+            products = {ProductType.from_value(product) for product in active_products}
+            user = User(user_id=user_id, name=name, email=email, active_products=products)
+            self._users[user_id] = user
+            self._users_by_email[email] = user_id
+            return user_id
 
     def delete_user(self, user_id: str) -> bool:
+        # Only the user record; ResolutionSystem.delete_user cascades to the user's issues first.
         user = self._users.pop(user_id, None)
         if not user:
             return False
-        self._users_by_email.pop(user.email, None)
-        for issue_id in list(user.active_issue_ids):
-            self._issues.pop(issue_id, None)
+        with self._email_locks.for_key(user.email):
+            if self._users_by_email.get(user.email) == user_id:
+                del self._users_by_email[user.email]
         return True
 
     def get_user_details(self, user_id: str) -> Optional[User]:
@@ -43,19 +68,45 @@ class UserService:
         user = self._users.get(user_id)
         if not user:
             return []
-        return [self._issues[issue_id] for issue_id in user.created_issue_ids if issue_id in self._issues]
-
-    def add_issue(self, issue: Issue) -> None:
-        self._issues[issue.issue_id] = issue
-        user = self._users.get(issue.user_id)
-        if user:
-            user.created_issue_ids.append(issue.issue_id)
-            user.active_issue_ids.add(issue.issue_id)
-
-    def close_issue(self, issue_id: str) -> None:
-        issue = self._issues.get(issue_id)
-        if not issue:
+        with self._user_locks.for_key(user_id):
+            numbers = list(user.created_issue_ids.numbers())
+        if self._archive is None:
+            return [self._issues[number] for number in numbers if number in self._issues]
+        return [issue for issue in map(self._fetch, numbers) if issue is not None]
+
+    def iter_issues(
+        self, user_identifier: str, *, cursor: Optional[int] = None, descending: bool = False
+    ) -> Iterator[Issue]:
+        # Streams the user's issues by number from the keyset cursor, one small chunk at a time.
+        user_id = self._users_by_email.get(user_identifier, user_identifier)
+        user = self._users.get(user_id)
+        if not user:
+            return
+        created = user.created_issue_ids
+        last = cursor
+        while True:
+            with self._user_locks.for_key(user_id):
+                if descending:
+                    chunk = created.numbers_before(last, _CHUNK)
+                else:
+                    chunk = created.numbers_after(last, _CHUNK)
+            if not chunk:
+                return
+            for number in chunk:
+                issue = self._fetch(number)
+                if issue is not None:
+                    yield issue
+            last = chunk[-1]
+
+    def apply_event(self, event: IssueEvent) -> None:
+        user = self._users.get(event.user_id)
+        if not user:
             return
-        user = self._users.get(issue.user_id)
-        if user:
-            user.active_issue_ids.discard(issue_id)
+        with self._user_locks.for_key(user.user_id):
+            if event.kind is IssueEventType.CREATED:
+                user.created_issue_ids.insert_number(parse_id(ISSUE_PREFIX, event.issue_id))
+                user.active_issue_ids.add(event.issue_id)
+            elif event.kind is IssueEventType.CLOSED or event.kind is IssueEventType.DELETED:
+                user.active_issue_ids.discard(event.issue_id)
+            elif event.previous_state is IssueState.CLOSED and event.state is not IssueState.CLOSED:
+                user.active_issue_ids.add(event.issue_id)
@@ -0,0 +1,8 @@
+from .shard import ShardEngine
+from .router import ShardedResolutionSystem, ShardError
+
+__all__ = [
+    "ShardEngine",
+    "ShardedResolutionSystem",
+    "ShardError",
+]
@@ -0,0 +1,524 @@
+import heapq
+import multiprocessing
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from src.data_models.ids import ISSUE_PREFIX, CompactIdList, parse_id
+from src.data_models.issue import Issue
+from src.data_models.user import User
+from src.enums import IssueState, ProductType
+from src.events import IssueEvent
+from src.scheduling import AdmissionController, AdmissionPolicy, SlaPolicy
+from src.sharding.shard import ShardResponse, shard_main
+from src.stats.lifecycle import LifecycleAggregate, LifecycleStatsView
+
+
+class ShardError(RuntimeError):
+    pass
+
+
+class ShardedResolutionSystem:
+    def __init__(self, shards: Optional[int] = None) -> None:
+        product_types = list(ProductType)
+        count = max(1, min(shards or os.cpu_count() or 1, len(product_types)))
+        self._shard_of_type: Dict[ProductType, int] = {
+            product_type: index % count for index, product_type in enumerate(product_types)
+        }
+        context = multiprocessing.get_context()
+        self._connections = []
+        self._processes = []
+        for index in range(count):
+            parent, child = context.Pipe()
+            types = [product_type for product_type, shard in self._shard_of_type.items() if shard == index]
+            process = context.Process(target=shard_main, args=(child, index, count, types), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+        self._user_ids: Dict[str, str] = {}
+        self._agent_ids: Dict[str, str] = {}
+        self._agent_types: Dict[str, Set[ProductType]] = {}
+        self._lease: Dict[str, int] = {}
+        # Agents whose types span several shards, and those of them free in the shard holding their lease.
+        self._roaming: Set[str] = set()
+        self._idle: Dict[str, int] = {}
+        self._backlog: List[Dict[ProductType, int]] = [{} for _ in range(count)]
+        # (agent, shard, type) -> backlog count when a lease move there found nothing to take.
+        self._fruitless: Dict[Tuple[str, int, ProductType], int] = {}
+        self._rebalancing = False
+        # Intake is throttled here, before any shard sees it, so a user's budget spans every type.
+        self._intake = AdmissionController()
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._connections)
+
+    def close(self) -> None:
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join(timeout=5)
+        self._connections = []
+
+    def __enter__(self) -> "ShardedResolutionSystem":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # Shard plumbing
+    def _call(self, shard: int, method: str, *args: Any, **kwargs: Any) -> Any:
+        return self._scatter({shard: (method, args, kwargs)})[shard]
+
+    def _broadcast(self, method: str, *args: Any, **kwargs: Any) -> List[Any]:
+        results = self._scatter({shard: (method, args, kwargs) for shard in range(self.shard_count)})
+        return [results[shard] for shard in range(self.shard_count)]
+
+    def _scatter(self, requests: Dict[int, Tuple[str, tuple, dict]]) -> Dict[int, Any]:
+        for shard, request in requests.items():
+            self._connections[shard].send(request)
+        results: Dict[int, Any] = {}
+        failures: List[str] = []
+        for shard in requests:
+            response: ShardResponse = self._connections[shard].recv()
+            ok, result, changes, backlog = response
+            self._absorb(shard, changes, backlog)
+            if ok:
+                results[shard] = result
+            else:
+                failures.append(result)
+        if failures:
+            raise ShardError(failures[0])
+        self._rebalance()
+        return results
+
+    def _absorb(self, shard: int, changes: Dict[str, bool], backlog: Dict[ProductType, int]) -> None:
+        self._backlog[shard] = backlog
+        for agent_id, is_free in changes.items():
+            if agent_id not in self._roaming:
+                continue
+            if is_free and self._lease.get(agent_id) == shard:
+                self._idle[agent_id] = shard
+            elif self._idle.get(agent_id) == shard:
+                del self._idle[agent_id]
+
+    def _shards_of(self, agent_id: str) -> Set[int]:
+        return {self._shard_of_type[issue_type] for issue_type in self._agent_types.get(agent_id, ())}
+
+    def _rebalance(self) -> None:
+        # An idle agent whose lease sits in a quiet shard moves to a shard with waiting work it can
+        # take. A move that found nothing is not retried until more issues are waitlisted there.
+        if self._rebalancing or not self._idle:
+            return
+        self._rebalancing = True
+        try:
+            for agent_id in list(self._idle):
+                holder = self._idle.get(agent_id)
+                if holder is None:
+                    continue
+                for issue_type in self._agent_types[agent_id]:
+                    target = self._shard_of_type[issue_type]
+                    waitlisted = self._backlog[target].get(issue_type)
+                    if target == holder or waitlisted is None:
+                        continue
+                    if self._fruitless.get((agent_id, target, issue_type), -1) >= waitlisted:
+                        continue
+                    if self._move_lease(agent_id, holder, target) is False:
+                        self._fruitless[(agent_id, target, issue_type)] = waitlisted
+                    break
+        finally:
+            self._rebalancing = False
+
+    def _move_lease(self, agent_id: str, source: int, target: int) -> Optional[bool]:
+        # None: the source shard had already put the agent to work, so nothing moved.
+        self._idle.pop(agent_id, None)
+        if not self._call(source, "release_lease", agent_id):
+            return None
+        self._lease[agent_id] = target
+        return self._call(target, "grant_lease", agent_id)
+
+    def _shard_of_issue(self, issue_id: str) -> Optional[int]:
+        number = parse_id(ISSUE_PREFIX, issue_id)
+        if number is None:
+            return None
+        return (number - 1) % self.shard_count
+
+    # User functions
+    def create_user(self, name: str, email: str, active_products: Iterable[Any]) -> str:
+        if email in self._user_ids:
+            return self._user_ids[email]
+        user_id = self._broadcast("create_user", name, email, list(active_products))[0]
+        self._user_ids[email] = user_id
+        return user_id
+
+    def _ensure_users(self, rows: Iterable[Tuple[str, Any]]) -> None:
+        missing: Dict[str, Any] = {}
+        for email, product_type in rows:
+            if email not in self._user_ids and email not in missing:
+                missing[email] = product_type
+        if not missing:
+            return
+        users = [(email, email, [product_type]) for email, product_type in missing.items()]
+        for email, user_id in zip(missing, self._broadcast("ensure_users", users)[0]):
+            self._user_ids[email] = user_id
+
+    def delete_user(self, user_id: str) -> bool:
+        deleted = any(self._broadcast("delete_user", user_id))
+        if deleted:
+            self._user_ids = {email: known for email, known in self._user_ids.items() if known != user_id}
+        return deleted
+
+    def get_user_details(self, user_id: str) -> Optional[User]:
+        parts = [user for user in self._broadcast("get_user_details", user_id) if user is not None]
+        if not parts:
+            return None
+        user = parts[0]
+        numbers = sorted(number for part in parts for number in part.created_issue_ids.numbers())
+        created = CompactIdList(ISSUE_PREFIX)
+        for number in numbers:
+            created.append_number(number)
+        user.created_issue_ids = created
+        user.active_issue_ids = set().union(*(part.active_issue_ids for part in parts))
+        return user
+
+    # Agent functions
+    def create_agent(self, agent_email: str, agent_name: str, issue_types: Iterable[Any]) -> str:
+        if agent_email in self._agent_ids:
+            return self._agent_ids[agent_email]
+        supported = {ProductType.from_value(issue_type) for issue_type in issue_types}
+        home = min((self._shard_of_type[issue_type] for issue_type in supported), default=0)
+        requests = {
+            shard: (
+                "add_agent",
+                (agent_email, agent_name, [t for t in supported if self._shard_of_type[t] == shard], shard != home),
+                {},
+            )
+            for shard in range(self.shard_count)
+        }
+        agent_ids = set(self._scatter(requests).values())
+        if len(agent_ids) != 1:
+            raise ShardError(f"Shards disagree on the agent id: {sorted(agent_ids)}")
+        agent_id = agent_ids.pop()
+        self._agent_ids[agent_email] = agent_id
+        self._agent_types[agent_id] = supported
+        self._lease[agent_id] = home
+        if len(self._shards_of(agent_id)) > 1:
+            self._roaming.add(agent_id)
+            self._idle[agent_id] = home
+            self._rebalance()
+        return agent_id
+
+    def update_agent(
+        self,
+        agent_id: str,
+        *,
+        issue_types: Optional[Iterable[Any]] = None,
+        ratings: Optional[Dict[Any, float]] = None,
+        capacity: Optional[Dict[Any, int]] = None,
+        max_concurrent: Optional[int] = None,
+    ) -> bool:
+        if agent_id not in self._agent_types:
+            return False
+        slots = {"capacity": capacity, "max_concurrent": max_concurrent}
+        if issue_types is None:
+            return all(self._broadcast("update_agent", agent_id, ratings=ratings, **slots))
+        supported = {ProductType.from_value(issue_type) for issue_type in issue_types}
+        self._agent_types[agent_id] = supported
+        requests = {
+            shard: ("update_agent", (agent_id,), {
+                "issue_types": [t for t in supported if self._shard_of_type[t] == shard],
+                "ratings": ratings,
+                **slots,
+            })
+            for shard in range(self.shard_count)
+        }
+        updated = all(self._scatter(requests).values())
+        holder = self._lease[agent_id]
+        shards = self._shards_of(agent_id)
+        if len(shards) > 1:
+            self._roaming.add(agent_id)
+        else:
+            self._roaming.discard(agent_id)
+            self._idle.pop(agent_id, None)
+        if shards and holder not in shards:
+            self._move_lease(agent_id, holder, min(shards))
+        return updated
+
+    # Strategy functions
+    def set_active_strategy(self, strategy_id: str) -> bool:
+        return all(self._broadcast("set_active_strategy", strategy_id))
+
+    def enable_scoring(self) -> None:
+        self._broadcast("enable_scoring")
+
+    def create_scored_strategy(self, scorer: str) -> str:
+        # Strategies are created in the same order everywhere, so every shard hands out the same ID.
+        return self._broadcast("create_scored_strategy", scorer)[0]
+
+    # SLA functions
+    def set_sla_policy(
+        self,
+        issue_type: Any,
+        *,
+        priority: int = 0,
+        resolve_within: Optional[float] = None,
+        at_risk_fraction: float = 0.8,
+        escalation: int = 10,
+    ) -> SlaPolicy:
+        product_type = ProductType.from_value(issue_type)
+        return self._call(
+            self._shard_of_type[product_type],
+            "set_sla_policy",
+            product_type,
+            priority=priority,
+            resolve_within=resolve_within,
+            at_risk_fraction=at_risk_fraction,
+            escalation=escalation,
+        )
+
+    # Admission functions
+    def set_admission_policy(
+        self,
+        issue_type: Any,
+        *,
+        max_waiting: Optional[int] = None,
+        max_per_agent: Optional[int] = None,
+        overflow: str = "defer",
+        retry_after: float = 30.0,
+        fallback_agents: Iterable[str] = (),
+    ) -> AdmissionPolicy:
+        product_type = ProductType.from_value(issue_type)
+        return self._call(
+            self._shard_of_type[product_type],
+            "set_admission_policy",
+            product_type,
+            max_waiting=max_waiting,
+            max_per_agent=max_per_agent,
+            overflow=overflow,
+            retry_after=retry_after,
+            fallback_agents=list(fallback_agents),
+        )
+
+    def deactivate_agent(self, agent_id: str, *, now: Optional[float] = None) -> bool:
+        if agent_id not in self._agent_types:
+            return False
+        # Every shard reroutes the issues it holds for the agent against its own pool.
+        now = time.time() if now is None else now
+        return any(self._broadcast("deactivate_agent", agent_id, now=now))
+
+    def deactivate_agents_bulk(self, agent_ids: Iterable[str], *, now: Optional[float] = None) -> Dict[str, str]:
+        agent_ids = [agent_id for agent_id in agent_ids if agent_id in self._agent_types]
+        now = time.time() if now is None else now
+        moves: Dict[str, str] = {}
+        for part in self._broadcast("deactivate_agents_bulk", agent_ids, now=now):
+            moves.update(part)
+        return moves
+
+    def reactivate_agent(self, agent_id: str) -> bool:
+        if agent_id not in self._agent_types:
+            return False
+        return any(self._broadcast("reactivate_agent", agent_id))
+
+    def set_agent_waitlist_limit(self, agent_id: str, limit: Optional[int]) -> bool:
+        return any(self._broadcast("set_agent_waitlist_limit", agent_id, limit))
+
+    def set_rate_limit(self, rate: Optional[float], burst: int = 10) -> None:
+        self._intake.set_rate_limit(rate, burst)
+
+    def admission_stats(self) -> Dict[str, int]:
+        totals = self._intake.stats()
+        for part in self._broadcast("admission_stats"):
+            for name, value in part.items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def tick(self, now: Optional[float] = None) -> List[IssueEvent]:
+        # One clock reading for every shard so their timers fire against the same instant.
+        now = time.time() if now is None else now
+        events = [event for part in self._broadcast("tick", now) for event in part]
+        events.sort(key=lambda event: event.timestamp)
+        return events
+
+    # Issue functions
+    def create_issue(
+        self,
+        transaction_id: str,
+        issue_type: Any,
+        subject: str,
+        description: str,
+        email: str,
+        *,
+        priority: Optional[int] = None,
+    ) -> str:
+        product_type = ProductType.from_value(issue_type)
+        self._intake.throttle({email: 1}, time.time())
+        self._ensure_users([(email, product_type)])
+        return self._call(
+            self._shard_of_type[product_type],
+            "create_issue",
+            transaction_id,
+            product_type,
+            subject,
+            description,
+            email,
+            priority=priority,
+        )
+
+    def create_issues_bulk(self, issues: Iterable[Tuple[str, Any, str, str, str]]) -> List[str]:
+        rows = [
+            (transaction_id, ProductType.from_value(issue_type), subject, description, email)
+            for transaction_id, issue_type, subject, description, email in issues
+        ]
+        self._intake.throttle(Counter(email for *_, email in rows), time.time())
+        self._ensure_users((email, product_type) for _, product_type, _, _, email in rows)
+        by_shard: Dict[int, List[Tuple[str, ProductType, str, str, str]]] = {}
+        for row in rows:
+            by_shard.setdefault(self._shard_of_type[row[1]], []).append(row)
+        results = self._scatter({shard: ("create_issues_bulk", (shard_rows,), {}) for shard, shard_rows in by_shard.items()})
+        cursors = {shard: iter(issue_ids) for shard, issue_ids in results.items()}
+        return [next(cursors[self._shard_of_type[row[1]]]) for row in rows]
+
+    def assign_issue(self, issue_id: str, *, now: Optional[float] = None) -> str:
+        shard = self._shard_of_issue(issue_id)
+        if shard is None:
+            return f"Issue {issue_id} not found"
+        return self._call(shard, "assign_issue", issue_id, now=now)
+
+    def assign_issues_bulk(self, issue_ids: Iterable[str], *, now: Optional[float] = None) -> Dict[str, str]:
+        results: Dict[str, str] = {}
+        by_shard: Dict[int, List[str]] = {}
+        for issue_id in issue_ids:
+            shard = self._shard_of_issue(issue_id)
+            if shard is None:
+                results[issue_id] = f"Issue {issue_id} not found"
+            else:
+                results[issue_id] = ""
+                by_shard.setdefault(shard, []).append(issue_id)
+        for shard_results in self._scatter({shard: ("assign_issues_bulk", (ids,), {"now": now}) for shard, ids in by_shard.items()}).values():
+            results.update(shard_results)
+        return results
+
+    def update_issue(
+        self, issue_id: str, status: Any, resolution: Optional[str] = None, *, now: Optional[float] = None
+    ) -> bool:
+        shard = self._shard_of_issue(issue_id)
+        return shard is not None and self._call(shard, "update_issue", issue_id, status, resolution, now=now)
+
+    def resolve_issue(self, issue_id: str, resolution: str, *, now: Optional[float] = None) -> bool:
+        shard = self._shard_of_issue(issue_id)
+        return shard is not None and self._call(shard, "resolve_issue", issue_id, resolution, now=now)
+
+    def get_issues(self, filters: Optional[Dict[str, Any]] = None) -> List[Issue]:
+        shards: Sequence[int] = range(self.shard_count)
+        for key in ("issueType", "type"):
+            if filters and key in filters:
+                shards = [self._shard_of_type[ProductType.from_value(filters[key])]]
+        results = self._scatter({shard: ("get_issues", (filters,), {}) for shard in shards})
+        return list(heapq.merge(*results.values(), key=lambda issue: issue.number))
+
+    def search_issues(
+        self, query: str, *, prefix: bool = True, open_only: bool = False, limit: int = 100
+    ) -> List[Issue]:
+        # Each shard returns its newest matches; the global newest are among them.
+        parts = self._broadcast("search_issues", query, prefix=prefix, open_only=open_only, limit=limit)
+        return list(heapq.merge(*parts, key=lambda issue: issue.number, reverse=True))[:limit]
+
+    def page_issues(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[int] = None,
+        limit: int = 100,
+        *,
+        descending: bool = False,
+    ) -> Tuple[List[Issue], Optional[int]]:
+        # Issue numbers are globally unique, so each shard's next page past the same cursor merges
+        # into the global next page.
+        shards: Sequence[int] = range(self.shard_count)
+        for key in ("issueType", "type"):
+            if filters and key in filters:
+                shards = [self._shard_of_type[ProductType.from_value(filters[key])]]
+        results = self._scatter(
+            {shard: ("page_issues", (filters, cursor, limit), {"descending": descending}) for shard in shards}
+        )
+        merged = list(
+            heapq.merge(*(page for page, _ in results.values()), key=lambda issue: issue.number, reverse=descending)
+        )
+        page = merged[:limit]
+        more = len(merged) > limit or any(next_cursor is not None for _, next_cursor in results.values())
+        return page, page[-1].number if more and page else None
+
+    def view_agents_work_history(self) -> Dict[str, List[str]]:
+        histories = self._broadcast("view_agents_work_history")
+        merged: Dict[str, List[str]] = {}
+        for agent_id in histories[0]:
+            parts = [history.get(agent_id, []) for history in histories]
+            # Each shard keeps its own resolution order; interleave by issue number without reordering it.
+            merged[agent_id] = list(heapq.merge(*parts, key=lambda issue_id: parse_id(ISSUE_PREFIX, issue_id)))
+        return merged
+
+    def agent_work_history(
+        self, agent_id: str, cursor: Optional[int] = None, limit: int = 100
+    ) -> Tuple[List[str], Optional[int]]:
+        # The first n merged entries only ever come from the first n entries of each shard.
+        start = cursor or 0
+        end = start + limit
+        parts = self._broadcast("agent_work_history", agent_id, 0, end)
+        merged = list(heapq.merge(*(page for page, _ in parts), key=lambda issue_id: parse_id(ISSUE_PREFIX, issue_id)))
+        more = len(merged) > end or any(next_cursor is not None for _, next_cursor in parts)
+        return merged[start:end], end if more else None
+
+    def agent_statistics(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        if agent_id not in self._agent_types:
+            return None
+        parts = self._scatter(
+            {shard: ("agent_statistics_part", (agent_id,), {}) for shard in self._shards_of(agent_id)}
+        ).values()
+        merged: Optional[LifecycleAggregate] = None
+        for aggregate, _, _ in parts:
+            if aggregate is None:
+                continue
+            if merged is None:
+                merged = aggregate
+            else:
+                merged.merge(aggregate)
+        statistics = (merged or LifecycleStatsView().empty()).to_dict()
+        statistics["backlog"] = sum(backlog for _, backlog, _ in parts)
+        statistics["occupied"] = any(busy for _, _, busy in parts)
+        return statistics
+
+    def product_statistics(self, issue_type: Any) -> Dict[str, Any]:
+        product_type = ProductType.from_value(issue_type)
+        return self._call(self._shard_of_type[product_type], "product_statistics", product_type)
+
+    def count_issues_by_state(self) -> Dict[IssueState, int]:
+        counts = {state: 0 for state in IssueState}
+        for part in self._broadcast("count_issues_by_state"):
+            for state, count in part.items():
+                counts[state] += count
+        return counts
+
+    def idempotency_stats(self) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for part in self._broadcast("idempotency_stats"):
+            for name, value in part.items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
+
+    @property
+    def pending_issues(self) -> List[str]:
+        return self._merge_ids(self._broadcast("pending_issues"))
+
+    @property
+    def resolved_issues(self) -> List[str]:
+        return self._merge_ids(self._broadcast("resolved_issues"))
+
+    @staticmethod
+    def _merge_ids(parts: List[List[str]]) -> List[str]:
+        return list(heapq.merge(*parts, key=lambda issue_id: parse_id(ISSUE_PREFIX, issue_id)))
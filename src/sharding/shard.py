@@ -0,0 +1,119 @@
+import traceback
+from multiprocessing.connection import Connection
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from src.data_models.agent import Agent
+from src.data_models.issue import Issue
+from src.enums import ProductType
+from src.resolution_system import ResolutionSystem
+from src.services import IssueService
+from src.stats.lifecycle import LifecycleAggregate
+
+# Response: (ok, result or error text, {agent_id: is_free} for agents that changed,
+#            {backlogged type: issues waitlisted for it so far})
+ShardResponse = Tuple[bool, Any, Dict[str, bool], Dict[ProductType, int]]
+
+
+class _ChangeWatcher:
+    def __init__(self) -> None:
+        self.changed: Set[str] = set()
+
+    def agent_changed(self, agent: Agent) -> None:
+        self.changed.add(agent.agent_id)
+
+
+# Every agent exists in every shard (creation is broadcast in one order, so IDs agree) but is
+# "parked" -- paused with no active issue -- everywhere except the shard holding its lease.
+# An agent can therefore only be picked, and only be busy, in one shard at a time.
+class ShardEngine(ResolutionSystem):
+    def __init__(self, shard_index: int, shard_count: int, product_types: Sequence[ProductType]) -> None:
+        super().__init__()
+        self.issue_service = IssueService(id_offset=shard_index, id_stride=shard_count, store=self.issue_service.store)
+        self._wire_events()
+        self.product_types = set(product_types)
+        self._watcher = _ChangeWatcher()
+        self._waitlisted: Dict[ProductType, int] = {product_type: 0 for product_type in self.product_types}
+
+    def add_agent(self, agent_email: str, agent_name: str, issue_types: Iterable[Any], parked: bool) -> str:
+        agent_id = self.agent_service.add_agent(agent_email, agent_name, issue_types)
+        agent = self.agent_service.get_agent(agent_id)
+        if self._watcher not in agent.observers:
+            agent.observers.append(self._watcher)
+            if parked:
+                agent.paused = True
+                agent.notify_observers()
+        return agent_id
+
+    def ensure_users(self, users: List[Tuple[str, str, List[Any]]]) -> List[str]:
+        return [self.user_service.create_user(name, email, products) for name, email, products in users]
+
+    def _waitlist_issue(self, issue: Issue, preferred: Optional[Agent] = None, *, now: Optional[float] = None) -> str:
+        self._waitlisted[issue.issue_type] = self._waitlisted.get(issue.issue_type, 0) + 1
+        return super()._waitlist_issue(issue, preferred, now=now)
+
+    def _reroute(self, issue: Issue, enqueued_at: float) -> str:
+        self._waitlisted[issue.issue_type] = self._waitlisted.get(issue.issue_type, 0) + 1
+        return super()._reroute(issue, enqueued_at)
+
+    def release_lease(self, agent_id: str) -> bool:
+        agent = self.agent_service.get_agent(agent_id)
+        if not agent or agent.paused or not agent.is_idle:
+            return False
+        agent.paused = True
+        agent.notify_observers()
+        return True
+
+    def grant_lease(self, agent_id: str) -> bool:
+        agent = self.agent_service.get_agent(agent_id)
+        if not agent:
+            return False
+        if agent.is_idle:
+            agent.paused = False
+            agent.notify_observers()
+            self._assign_next_from_waitlist(agent)
+        return not agent.is_idle
+
+    def drain_changes(self) -> Dict[str, bool]:
+        changes: Dict[str, bool] = {}
+        for agent_id in self._watcher.changed:
+            agent = self.agent_service.get_agent(agent_id)
+            changes[agent_id] = not agent.paused and not agent.offline and agent.is_idle
+        self._watcher.changed.clear()
+        return changes
+
+    def agent_statistics_part(self, agent_id: str) -> Tuple[Optional[LifecycleAggregate], int, bool]:
+        agent = self.agent_service.get_agent(agent_id)
+        busy = bool(agent and not agent.is_idle)
+        return self.lifecycle_stats.agent(agent_id), self.agent_service.waitlist_load.backlog_of(agent_id), busy
+
+    def backlog(self) -> Dict[ProductType, int]:
+        load_index = self.agent_service.waitlist_load
+        return {
+            issue_type: count
+            for issue_type, count in self._waitlisted.items()
+            if load_index.most_backlogged(issue_type)
+        }
+
+
+_PROPERTIES = {"pending_issues", "resolved_issues"}
+
+
+def shard_main(connection: Connection, shard_index: int, shard_count: int, product_types: List[ProductType]) -> None:
+    engine = ShardEngine(shard_index, shard_count, product_types)
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        method, args, kwargs = request
+        try:
+            if method in _PROPERTIES:
+                result = getattr(engine, method)
+            else:
+                result = getattr(engine, method)(*args, **kwargs)
+            response: ShardResponse = (True, result, engine.drain_changes(), engine.backlog())
+        except Exception:
+            response = (False, traceback.format_exc(), engine.drain_changes(), engine.backlog())
+        connection.send(response)
@@ -0,0 +1,12 @@
+from .sketch import QuantileSketch
+from .summary import DEFAULT_QUANTILES, Ewma, StreamSummary
+from .lifecycle import LifecycleAggregate, LifecycleStatsView
+
+__all__ = [
+    "QuantileSketch",
+    "DEFAULT_QUANTILES",
+    "Ewma",
+    "StreamSummary",
+    "LifecycleAggregate",
+    "LifecycleStatsView",
+]
@@ -0,0 +1,106 @@
+from typing import Any, Dict, Optional
+
+from src.data_models.ids import ISSUE_PREFIX, parse_id
+from src.enums import IssueEventType, IssueState, ProductType
+from src.events.event import IssueEvent
+from src.stats.summary import StreamSummary
+
+
+class LifecycleAggregate:
+    __slots__ = ("created", "assigned", "resolved", "time_to_assign", "handle_time", "time_to_resolve")
+
+    def __init__(self, alpha: float, relative_accuracy: float) -> None:
+        self.created = 0
+        self.assigned = 0
+        self.resolved = 0
+        # created -> first assignment, assignment -> close, created -> close
+        self.time_to_assign = StreamSummary(alpha, relative_accuracy)
+        self.handle_time = StreamSummary(alpha, relative_accuracy)
+        self.time_to_resolve = StreamSummary(alpha, relative_accuracy)
+
+    def merge(self, other: "LifecycleAggregate") -> None:
+        self.created += other.created
+        self.assigned += other.assigned
+        self.resolved += other.resolved
+        self.time_to_assign.merge(other.time_to_assign)
+        self.handle_time.merge(other.handle_time)
+        self.time_to_resolve.merge(other.time_to_resolve)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "created": self.created,
+            "assigned": self.assigned,
+            "resolved": self.resolved,
+            "time_to_assign": self.time_to_assign.to_dict(),
+            "handle_time": self.handle_time.to_dict(),
+            "time_to_resolve": self.time_to_resolve.to_dict(),
+        }
+
+
+class LifecycleStatsView:
+    def __init__(self, alpha: float = 0.1, relative_accuracy: float = 0.01) -> None:
+        self._alpha = alpha
+        self._relative_accuracy = relative_accuracy
+        # Timestamps are kept only while an issue is open, so memory follows the open set.
+        self._created_at: Dict[int, float] = {}
+        self._assigned_at: Dict[int, float] = {}
+        self._agents: Dict[str, LifecycleAggregate] = {}
+        self._products: Dict[ProductType, LifecycleAggregate] = {}
+
+    def _aggregate(self, aggregates: Dict[Any, LifecycleAggregate], key: Any) -> LifecycleAggregate:
+        aggregate = aggregates.get(key)
+        if aggregate is None:
+            aggregate = aggregates[key] = LifecycleAggregate(self._alpha, self._relative_accuracy)
+        return aggregate
+
+    def apply(self, event: IssueEvent) -> None:
+        kind = event.kind
+        if kind is IssueEventType.CREATED:
+            self._created_at[parse_id(ISSUE_PREFIX, event.issue_id)] = event.timestamp
+            self._aggregate(self._products, event.issue_type).created += 1
+        elif kind is IssueEventType.ASSIGNED:
+            number = parse_id(ISSUE_PREFIX, event.issue_id)
+            product = self._aggregate(self._products, event.issue_type)
+            agent = self._aggregate(self._agents, event.agent_id)
+            product.assigned += 1
+            agent.assigned += 1
+            if number not in self._assigned_at:
+                created_at = self._created_at.get(number)
+                if created_at is not None:
+                    wait = event.timestamp - created_at
+                    product.time_to_assign.add(wait)
+                    agent.time_to_assign.add(wait)
+            self._assigned_at[number] = event.timestamp
+        elif kind is IssueEventType.CLOSED:
+            number = parse_id(ISSUE_PREFIX, event.issue_id)
+            created_at = self._created_at.pop(number, None)
+            assigned_at = self._assigned_at.pop(number, None)
+            product = self._aggregate(self._products, event.issue_type)
+            product.resolved += 1
+            if created_at is not None:
+                product.time_to_resolve.add(event.timestamp - created_at)
+            if event.agent_id is None:
+                return
+            agent = self._aggregate(self._agents, event.agent_id)
+            agent.resolved += 1
+            if assigned_at is not None:
+                product.handle_time.add(event.timestamp - assigned_at)
+                agent.handle_time.add(event.timestamp - assigned_at)
+            if created_at is not None:
+                agent.time_to_resolve.add(event.timestamp - created_at)
+        elif kind is IssueEventType.DELETED:
+            number = parse_id(ISSUE_PREFIX, event.issue_id)
+            self._created_at.pop(number, None)
+            self._assigned_at.pop(number, None)
+        elif kind is IssueEventType.UPDATED and event.previous_state is IssueState.CLOSED:
+            # A reopened issue starts a fresh lifecycle from the moment it was reopened.
+            self._created_at[parse_id(ISSUE_PREFIX, event.issue_id)] = event.timestamp
+
+    def agent(self, agent_id: str) -> Optional[LifecycleAggregate]:
+        return self._agents.get(agent_id)
+
+    def product(self, issue_type: Any) -> Optional[LifecycleAggregate]:
+        return self._products.get(ProductType.from_value(issue_type))
+
+    def empty(self) -> LifecycleAggregate:
+        return LifecycleAggregate(self._alpha, self._relative_accuracy)
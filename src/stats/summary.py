@@ -0,0 +1,67 @@
+import math
+from typing import Dict, Optional, Sequence
+
+from src.stats.sketch import QuantileSketch
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class Ewma:
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, alpha: float = 0.1) -> None:
+        if not 0 < alpha <= 1:
+            raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+        self.alpha = alpha
+        self.value: Optional[float] = None
+
+    def add(self, sample: float) -> None:
+        self.value = sample if self.value is None else self.value + self.alpha * (sample - self.value)
+
+
+class StreamSummary:
+    __slots__ = ("count", "total", "minimum", "maximum", "ewma", "sketch")
+
+    def __init__(self, alpha: float = 0.1, relative_accuracy: float = 0.01) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.ewma = Ewma(alpha)
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def add(self, sample: float) -> None:
+        self.count += 1
+        self.total += sample
+        if sample < self.minimum:
+            self.minimum = sample
+        if sample > self.maximum:
+            self.maximum = sample
+        self.ewma.add(sample)
+        self.sketch.add(sample)
+
+    def merge(self, other: "StreamSummary") -> None:
+        # The EWMA is order dependent; after a merge keep whichever side saw the most samples.
+        if other.count > self.count:
+            self.ewma.value = other.ewma.value
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def to_dict(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, Optional[float]]:
+        summary: Dict[str, Optional[float]] = {
+            "count": self.count,
+            "mean": self.mean,
+            "ewma": self.ewma.value,
+            "min": self.minimum if self.count else None,
+            "max": self.maximum if self.count else None,
+        }
+        for q in quantiles:
+            summary[f"p{q * 100:g}"] = self.sketch.quantile(q)
+        return summary
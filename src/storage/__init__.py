@@ -0,0 +1,8 @@
+from .archive import ArchiveQueue, IssueArchive
+from .history import HistoryStore
+
+__all__ = [
+    "IssueArchive",
+    "ArchiveQueue",
+    "HistoryStore",
+]
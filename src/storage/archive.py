@@ -0,0 +1,360 @@
+import mmap
+import os
+from collections import deque
+import pickle
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from src.concurrency.locks import make_lock
+from src.data_models.ids import ISSUE_PREFIX, parse_id
+from src.data_models.issue import Issue
+from src.enums import IssueEventType, IssueState, ProductType
+from src.events.event import IssueEvent
+
+_SEGMENT = "segment-{:06d}.bin"
+_BLOCKS = "blocks.bin"
+_INDEX = "index.bin"
+# Segment block: compressed length, crc32 of the compressed bytes.
+_BLOCK_HEADER = struct.Struct("<II")
+# blocks.bin record: segment, offset of the block header, compressed length.
+_BLOCK_RECORD = struct.Struct("<iQI")
+# index.bin record: issue number, block (-1 marks a deleted issue).
+_INDEX_RECORD = struct.Struct("<qq")
+_DELETED = -1
+
+
+def _encode(issue: Issue) -> tuple:
+    return (
+        issue.number,
+        issue.transaction_id,
+        issue.issue_type.value,
+        issue.subject,
+        issue.description,
+        issue.state.value,
+        issue.user_id,
+        issue.user_email,
+        issue.agent_id,
+        issue.resolution,
+        issue.priority,
+        issue.deadline,
+    )
+
+
+def _decode(row: tuple) -> Issue:
+    number, transaction_id, issue_type, subject, description, state, user_id, user_email, agent_id, resolution, priority, deadline = row
+    return Issue(
+        issue_id=f"{ISSUE_PREFIX}{number}",
+        transaction_id=transaction_id,
+        issue_type=ProductType(issue_type),
+        subject=subject,
+        description=description,
+        state=IssueState(state),
+        user_id=user_id,
+        user_email=user_email,
+        agent_id=agent_id,
+        resolution=resolution,
+        priority=priority,
+        deadline=deadline,
+    )
+
+
+class IssueArchive:
+    # Cold tier for closed issues: append-only segment files of compressed blocks, read through
+    # mmap. blocks.bin and index.bin are append-only journals of where each block lives and which
+    # block holds each issue; in memory the issue -> block index is two sorted arrays plus a small
+    # dict of recent changes, so an archived issue costs 16 bytes instead of a live object.
+    def __init__(
+        self,
+        directory: str,
+        *,
+        segment_bytes: int = 64 << 20,
+        block_size: int = 256,
+        cache_size: int = 4_096,
+        thread_safe: bool = False,
+    ) -> None:
+        if block_size < 1:
+            raise ValueError(f"block_size must be positive, got {block_size}")
+        if cache_size < 0:
+            raise ValueError(f"cache_size must not be negative, got {cache_size}")
+        self._directory = directory
+        self._segment_bytes = segment_bytes
+        self._block_size = block_size
+        self._cache_size = cache_size
+        self._thread_safe = thread_safe
+        self._open()
+
+    def _open(self) -> None:
+        os.makedirs(self._directory, exist_ok=True)
+        self._lock = make_lock(self._thread_safe)
+        self._block_segments = array("l")
+        self._block_offsets = array("q")
+        self._block_lengths = array("q")
+        self._numbers = array("q")
+        self._number_blocks = array("q")
+        self._recent: Dict[int, int] = {}
+        self._cache: "OrderedDict[int, Issue]" = OrderedDict()
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._stats = {"hits": 0, "misses": 0, "blocks_read": 0}
+        for segment, offset, length in self._read_journal(_BLOCKS, _BLOCK_RECORD):
+            self._block_segments.append(segment)
+            self._block_offsets.append(offset)
+            self._block_lengths.append(length)
+        for number, block in self._read_journal(_INDEX, _INDEX_RECORD):
+            if block < len(self._block_segments):
+                self._recent[number] = block
+        self._compact()
+        self._segment = len(self._segment_paths()) or 1
+        self._writer = open(self._path(_SEGMENT.format(self._segment)), "ab")
+        self._blocks_journal = open(self._path(_BLOCKS), "ab")
+        self._index_journal = open(self._path(_INDEX), "ab")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Snapshots keep only the location; the journals on disk are the archive's own state.
+        return {
+            "directory": self._directory,
+            "segment_bytes": self._segment_bytes,
+            "block_size": self._block_size,
+            "cache_size": self._cache_size,
+            "thread_safe": self._thread_safe,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._directory = state["directory"]
+        self._segment_bytes = state["segment_bytes"]
+        self._block_size = state["block_size"]
+        self._cache_size = state["cache_size"]
+        self._thread_safe = state["thread_safe"]
+        self._open()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self._directory, name)
+
+    def _segment_paths(self) -> List[str]:
+        return sorted(name for name in os.listdir(self._directory) if name.startswith("segment-"))
+
+    def _read_journal(self, name: str, record: struct.Struct) -> Iterator[Tuple[int, ...]]:
+        path = self._path(name)
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as handle:
+            data = handle.read()
+        whole = len(data) - len(data) % record.size
+        if whole != len(data):
+            # A torn final record from a crash is dropped.
+            with open(path, "r+b") as handle:
+                handle.truncate(whole)
+        yield from record.iter_unpack(data[:whole])
+
+    def close(self) -> None:
+        with self._lock:
+            for handle in (self._writer, self._blocks_journal, self._index_journal):
+                handle.close()
+            for view in self._maps.values():
+                view.close()
+            self._maps.clear()
+
+    # Index
+    def _block_of(self, number: int) -> Optional[int]:
+        block = self._recent.get(number)
+        if block is None:
+            position = bisect_left(self._numbers, number)
+            if position == len(self._numbers) or self._numbers[position] != number:
+                return None
+            block = self._number_blocks[position]
+        return None if block == _DELETED else block
+
+    def _set_block(self, number: int, block: int) -> None:
+        self._recent[number] = block
+        if len(self._recent) > max(4_096, len(self._numbers) >> 3):
+            self._compact()
+
+    def _compact(self) -> None:
+        merged = dict(zip(self._numbers, self._number_blocks))
+        merged.update(self._recent)
+        numbers = sorted(number for number, block in merged.items() if block != _DELETED)
+        self._numbers = array("q", numbers)
+        self._number_blocks = array("q", (merged[number] for number in numbers))
+        self._recent = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            live = len(self._numbers)
+            for number, block in self._recent.items():
+                position = bisect_left(self._numbers, number)
+                indexed = position < len(self._numbers) and self._numbers[position] == number
+                live += (block != _DELETED) - indexed
+            return live
+
+    def __contains__(self, number: object) -> bool:
+        with self._lock:
+            return isinstance(number, int) and self._block_of(number) is not None
+
+    def numbers(self) -> List[int]:
+        with self._lock:
+            self._compact()
+            return list(self._numbers)
+
+    # Writes
+    def append(self, issues: Sequence[Issue]) -> int:
+        with self._lock:
+            # An issue whose archived copy is unchanged is not written again, so replaying an archive
+            # pass leaves the segments as they were; a restored issue that changed gets a new copy.
+            held = [issue.number for issue in issues if self._block_of(issue.number) is not None]
+            if held:
+                stored = self.get_many(held)
+                issues = [
+                    issue for issue in issues if issue.number not in stored or _encode(stored[issue.number]) != _encode(issue)
+                ]
+            if not issues:
+                return 0
+            for start in range(0, len(issues), self._block_size):
+                chunk = issues[start:start + self._block_size]
+                payload = zlib.compress(pickle.dumps([_encode(issue) for issue in chunk], pickle.HIGHEST_PROTOCOL), 6)
+                if self._writer.tell() and self._writer.tell() + len(payload) > self._segment_bytes:
+                    self._writer.close()
+                    self._unmap(self._segment)
+                    self._segment += 1
+                    self._writer = open(self._path(_SEGMENT.format(self._segment)), "ab")
+                offset = self._writer.tell()
+                self._writer.write(_BLOCK_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+                block = len(self._block_segments)
+                self._block_segments.append(self._segment)
+                self._block_offsets.append(offset)
+                self._block_lengths.append(len(payload))
+                self._blocks_journal.write(_BLOCK_RECORD.pack(self._segment, offset, len(payload)))
+                for issue in chunk:
+                    self._set_block(issue.number, block)
+                    self._cache.pop(issue.number, None)
+                self._index_journal.write(b"".join(_INDEX_RECORD.pack(issue.number, block) for issue in chunk))
+            # The segment reaches disk before the journals that point into it.
+            for handle in (self._writer, self._blocks_journal, self._index_journal):
+                handle.flush()
+                os.fsync(handle.fileno())
+            # A mapping of the active segment predates this batch.
+            self._unmap(self._segment)
+            return len(issues)
+
+    def _unmap(self, segment: int) -> None:
+        view = self._maps.pop(segment, None)
+        if view is not None:
+            view.close()
+
+    def discard(self, numbers: Iterable[int]) -> int:
+        with self._lock:
+            removed = [number for number in numbers if self._block_of(number) is not None]
+            for number in removed:
+                self._set_block(number, _DELETED)
+                self._cache.pop(number, None)
+            if removed:
+                self._index_journal.write(b"".join(_INDEX_RECORD.pack(number, _DELETED) for number in removed))
+                self._index_journal.flush()
+            return len(removed)
+
+    def evict(self, number: int) -> None:
+        # Drops a cached copy once the issue is live in the hot tier again.
+        with self._lock:
+            self._cache.pop(number, None)
+
+    # Reads
+    def get(self, number: int) -> Optional[Issue]:
+        return self.get_many([number]).get(number)
+
+    def get_many(self, numbers: Iterable[int]) -> Dict[int, Issue]:
+        # Each block is decompressed once however many of the requested issues it holds.
+        found: Dict[int, Issue] = {}
+        wanted: Dict[int, List[int]] = {}
+        with self._lock:
+            for number in numbers:
+                issue = self._cache.get(number)
+                if issue is not None:
+                    self._cache.move_to_end(number)
+                    self._stats["hits"] += 1
+                    found[number] = issue
+                    continue
+                block = self._block_of(number)
+                if block is not None:
+                    self._stats["misses"] += 1
+                    wanted.setdefault(block, []).append(number)
+            for block, block_numbers in wanted.items():
+                decoded: Dict[int, Issue] = {}
+                for row in self._read_block(block):
+                    number = row[0]
+                    # Rows superseded by a later copy, or deleted since, are skipped.
+                    if self._block_of(number) == block:
+                        decoded[number] = self._cache.get(number) or _decode(row)
+                # The whole block is cached, so a scan in archive order decodes each block once.
+                for number, issue in decoded.items():
+                    self._remember(number, issue)
+                for number in block_numbers:
+                    found[number] = decoded[number]
+        return found
+
+    def _remember(self, number: int, issue: Issue) -> None:
+        if not self._cache_size:
+            return
+        self._cache[number] = issue
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _read_block(self, block: int) -> List[tuple]:
+        segment = self._block_segments[block]
+        view = self._maps.get(segment)
+        if view is None:
+            if segment == self._segment:
+                self._writer.flush()
+            with open(self._path(_SEGMENT.format(segment)), "rb") as handle:
+                view = self._maps[segment] = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        offset = self._block_offsets[block]
+        length, checksum = _BLOCK_HEADER.unpack_from(view, offset)
+        start = offset + _BLOCK_HEADER.size
+        payload = view[start:start + length]
+        if zlib.crc32(payload) != checksum:
+            raise ValueError(f"Archive block {block} in segment {segment} is corrupt")
+        self._stats["blocks_read"] += 1
+        return pickle.loads(zlib.decompress(payload))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            disk = sum(os.path.getsize(self._path(name)) for name in self._segment_paths())
+            return {**self._stats, "cached": len(self._cache), "blocks": len(self._block_segments), "segment_bytes": disk}
+
+
+class ArchiveQueue:
+    # Closed issues in closing order, so each archive pass only visits the ones old enough to move.
+    def __init__(self, min_age: float) -> None:
+        if min_age < 0:
+            raise ValueError(f"min_age must not be negative, got {min_age}")
+        self.min_age = min_age
+        self._queue: Deque[Tuple[float, int]] = deque()
+        # Latest close time per queued issue; older queue entries of a reopened issue are stale.
+        self._closed_at: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._closed_at)
+
+    def push(self, number: int, closed_at: float) -> None:
+        self._closed_at[number] = closed_at
+        self._queue.append((closed_at, number))
+
+    def apply(self, event: IssueEvent) -> None:
+        number = parse_id(ISSUE_PREFIX, event.issue_id)
+        if event.kind is IssueEventType.CLOSED:
+            self.push(number, event.timestamp)
+        elif event.kind is IssueEventType.DELETED or event.state is not IssueState.CLOSED:
+            self._closed_at.pop(number, None)
+        elif number not in self._closed_at:
+            # A closed issue that is not queued was archived; touching it restored it, so it ages again.
+            self.push(number, event.timestamp)
+
+    def due(self, now: float) -> Iterator[int]:
+        cutoff = now - self.min_age
+        queue = self._queue
+        while queue and queue[0][0] <= cutoff:
+            closed_at, number = queue.popleft()
+            if self._closed_at.get(number) == closed_at:
+                del self._closed_at[number]
+                yield number
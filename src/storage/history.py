@@ -0,0 +1,100 @@
+import tempfile
+from array import array
+from typing import Any, Dict, Hashable
+
+from src.concurrency.locks import make_lock
+
+_ITEM = array("q").itemsize
+
+
+class HistoryStore:
+    # Append-only per-key lists of issue numbers that live on disk a page at a time. Only each
+    # key's unfilled last page stays in memory, plus the file offset of every full page (8 bytes
+    # per page_size numbers); full pages go to one anonymous temporary file, read back on demand.
+    def __init__(self, page_size: int = 512, thread_safe: bool = False) -> None:
+        if page_size < 1:
+            raise ValueError(f"page_size must be positive, got {page_size}")
+        self._page_size = page_size
+        self._thread_safe = thread_safe
+        self._open()
+
+    def _open(self) -> None:
+        self._lock = make_lock(self._thread_safe)
+        self._file = tempfile.TemporaryFile()
+        self._end = 0
+        self._pages: Dict[Hashable, array] = {}
+        self._tails: Dict[Hashable, array] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Snapshots carry the numbers themselves; the temporary file does not outlive the process.
+        with self._lock:
+            return {
+                "page_size": self._page_size,
+                "thread_safe": self._thread_safe,
+                "numbers": {key: self._read(key, 0, self._count(key)).tobytes() for key in self._tails},
+            }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._page_size = state["page_size"]
+        self._thread_safe = state["thread_safe"]
+        self._open()
+        for key, data in state["numbers"].items():
+            numbers = array("q")
+            numbers.frombytes(data)
+            self.extend(key, numbers)
+
+    def append(self, key: Hashable, number: int) -> None:
+        with self._lock:
+            tail = self._tails.get(key)
+            if tail is None:
+                tail = self._tails[key] = array("q")
+                self._pages[key] = array("q")
+            tail.append(number)
+            if len(tail) == self._page_size:
+                self._spill(key, tail)
+
+    def extend(self, key: Hashable, numbers: array) -> None:
+        for number in numbers:
+            self.append(key, number)
+
+    def _spill(self, key: Hashable, tail: array) -> None:
+        self._file.seek(self._end)
+        self._file.write(tail.tobytes())
+        self._pages[key].append(self._end)
+        self._end += len(tail) * _ITEM
+        del tail[:]
+
+    def _count(self, key: Hashable) -> int:
+        tail = self._tails.get(key)
+        return 0 if tail is None else len(self._pages[key]) * self._page_size + len(tail)
+
+    def count(self, key: Hashable) -> int:
+        with self._lock:
+            return self._count(key)
+
+    def _read(self, key: Hashable, start: int, stop: int) -> array:
+        numbers = array("q")
+        pages = self._pages.get(key)
+        if pages is None:
+            return numbers
+        size = self._page_size
+        stop = min(stop, self._count(key))
+        position = start
+        while position < stop:
+            page, offset = divmod(position, size)
+            take = min(size - offset, stop - position)
+            if page < len(pages):
+                self._file.seek(pages[page] + offset * _ITEM)
+                numbers.frombytes(self._file.read(take * _ITEM))
+            else:
+                numbers.extend(self._tails[key][offset:offset + take])
+            position += take
+        return numbers
+
+    def read(self, key: Hashable, start: int, stop: int) -> array:
+        with self._lock:
+            return self._read(key, start, stop)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()